@@ -0,0 +1,271 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from fastapi import Response
+
+from .responses import JSON_MEDIA_TYPE, render_json
+
+# 응답 캐시 설정
+# memory: 프로세스 내 LRU (기본), redis: 여러 워커/파드가 공유, none: 캐시 사용 안 함
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_REDIS_CONNECT_TIMEOUT = float(os.getenv("RESPONSE_CACHE_REDIS_CONNECT_TIMEOUT", "2"))
+RESPONSE_CACHE_KEY_PREFIX = os.getenv("RESPONSE_CACHE_KEY_PREFIX", "alcha:response")
+
+
+def vehicle_tag(vehicle_id: str) -> str:
+    return f"vehicle:{vehicle_id}"
+
+
+def table_tag(table: str) -> str:
+    return f"table:{table}"
+
+
+class MemoryCacheBackend:
+    """TTL이 있는 프로세스 내 LRU 캐시 (태그별 키 인덱스 유지)"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        # sync 라우트는 스레드풀에서 동시에 실행되므로 잠금 필요
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int, tags: Sequence[str]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """여러 워커/파드가 공유하는 Redis 캐시 (태그마다 키 집합을 SET으로 유지)"""
+
+    name = "redis"
+
+    def __init__(self, url: str = RESPONSE_CACHE_REDIS_URL, prefix: str = RESPONSE_CACHE_KEY_PREFIX):
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_connect_timeout=RESPONSE_CACHE_REDIS_CONNECT_TIMEOUT)
+        # from_url은 실제로 연결하지 않으므로 여기서 ping해 Redis에 닿지 않으면 예외를 내고
+        # _create_backend가 메모리 캐시로 대체하게 함 (기동 이후 장애는 ResponseCache가 DB 조회로 대체)
+        self._client.ping()
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: Any, ttl: int, tags: Sequence[str]) -> None:
+        pipe = self._client.pipeline()
+        pipe.set(key, value, ex=ttl)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            # 태그 집합은 가장 오래 사는 항목보다 조금 더 길게 유지
+            pipe.expire(tag_key, ttl * 2)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        keys = set()
+        for tag_key in tag_keys:
+            keys |= self._client.smembers(tag_key)
+        if keys:
+            self._client.delete(*keys)
+        if tag_keys:
+            self._client.delete(*tag_keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(f"{self._prefix}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self) -> int:
+        return sum(1 for key in self._client.scan_iter(f"{self._prefix}:*") if b":tag:" not in key)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}:tag:{tag}"
+
+
+class ResponseCache:
+    """라우트 응답 캐시: 라우트 이름과 파라미터를 키로, 차량/테이블 태그로 무효화"""
+
+    def __init__(self, backend=None, prefix: str = RESPONSE_CACHE_KEY_PREFIX):
+        self.backend = backend
+        self._prefix = prefix
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def make_key(self, route: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        return f"{self._prefix}:{route}:{digest}"
+
+    def get(self, route: str, key: str) -> Optional[Any]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            # 캐시 장애는 DB 조회로 대체
+            print(f"Response cache get failed: {e}")
+            value = None
+        self._count(route, "hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: Any, ttl: int, tags: Sequence[str]) -> None:
+        try:
+            self.backend.set(key, value, ttl, tags)
+        except Exception as e:
+            print(f"Response cache set failed: {e}")
+
+    def invalidate(self, vehicle_id: Optional[str] = None, table: Optional[str] = None) -> int:
+        """차량 또는 테이블에 연결된 캐시 항목 삭제 (둘 다 없으면 전체 삭제), 삭제한 항목 수 반환"""
+        if not self.enabled:
+            return 0
+        tags = []
+        if vehicle_id:
+            tags.append(vehicle_tag(vehicle_id))
+        if table:
+            tags.append(table_tag(table))
+        if not tags:
+            size = self.backend.size()
+            self.backend.clear()
+            return size
+        return self.backend.invalidate(tags)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            routes = {route: dict(counts) for route, counts in self._stats.items()}
+        hits = sum(counts["hits"] for counts in routes.values())
+        misses = sum(counts["misses"] for counts in routes.values())
+        try:
+            size = self.backend.size() if self.enabled else 0
+        except Exception:
+            size = None
+        return {
+            "backend": self.backend.name if self.enabled else "none",
+            "entries": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "routes": routes,
+        }
+
+    def _count(self, route: str, field: str) -> None:
+        with self._stats_lock:
+            counts = self._stats.setdefault(route, {"hits": 0, "misses": 0})
+            counts[field] += 1
+
+
+def _create_backend():
+    if RESPONSE_CACHE_BACKEND == "none":
+        return None
+    if RESPONSE_CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend()
+        except Exception as e:
+            print(f"Failed to create redis response cache, falling back to memory: {e}")
+    return MemoryCacheBackend()
+
+
+response_cache = ResponseCache(_create_backend())
+
+
+def cached_response(route: str, ttl: int, tables: Sequence[str]) -> Callable:
+    """라우트 핸들러 응답을 JSON 본문 그대로 ttl초 동안 캐시하는 데코레이터
+
+    키는 라우트 이름과 db를 제외한 핸들러 인자, 그리고 의존성(conditional_get)이 설정한
+    ETag로 만든다. 데이터가 바뀌어 ETag가 달라지면 다른 키가 되므로 이전 버전 본문을
+    새 ETag로 내보내지 않는다 (ETag가 없는 라우트는 ttl 동안 이전 본문 유지). 원본 테이블과
+    vehicle_id 인자를 태그로 달아 배치 적재 후 invalidate()로 지울 수 있게 한다.
+    핸들러 결과는 render_json으로 한 번만 직렬화해 Response로 돌려주므로
+    FastAPI의 응답 검증/인코딩을 거치지 않고, 캐시 적중 시에는 직렬화 자체가 없다.
+    HTTPException 등 예외는 캐시하지 않는다.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(sub_response: Response, **kwargs):
+            params = {name: value for name, value in kwargs.items() if name != "db"}
+            etag = sub_response.headers.get("etag")
+            key = response_cache.make_key(route, {**params, "_etag": etag}) if response_cache.enabled else None
+            body = response_cache.get(route, key) if key else None
+
+            if body is None:
+                body = render_json(func(**kwargs))
+                if key:
+                    tags = [table_tag(table) for table in tables]
+                    if params.get("vehicle_id"):
+                        tags.append(vehicle_tag(params["vehicle_id"]))
+                    response_cache.set(key, body, ttl, tags)
+
+            # 의존성에서 설정한 헤더(ETag 등)를 직접 만든 응답에 옮김
+            response = Response(content=body, media_type=JSON_MEDIA_TYPE)
+            response.headers.update(sub_response.headers)
+            return response
+
+        # FastAPI가 요청별 임시 Response를 주입하도록 시그니처에 추가
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("sub_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+        return wrapper
+
+    return decorator
@@ -0,0 +1,126 @@
+import functools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+
+from .responses import JSON_MEDIA_TYPE, json_response
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow 응답은 선택 기능 (pyarrow가 없으면 406)
+    pa = None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# 열 단위 응답을 지원하는 원본 시계열 엔드포인트의 format 설명
+COLUMNAR_FORMAT_DESCRIPTION = (
+    "json(기본), ndjson, columns(컬럼별 병렬 배열 JSON, timestamp는 epoch 밀리초) "
+    "또는 arrow(Apache Arrow IPC 스트림). Accept: application/vnd.apache.arrow.stream이면 arrow"
+)
+
+
+def parse_accept(accept: str) -> List[Tuple[str, str, float]]:
+    """Accept 헤더를 (type, subtype, q) 목록으로 변환 (q가 잘못되면 0으로 취급)"""
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = item.split(";")
+        media_type, _, subtype = media_range.strip().lower().partition("/")
+        if not media_type or not subtype:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = 0.0
+        ranges.append((media_type, subtype.strip(), q))
+    return ranges
+
+
+def accept_quality(ranges: List[Tuple[str, str, float]], media_type: str, explicit: bool = False) -> float:
+    """media_type에 가장 구체적으로 맞는 범위의 q 값 (맞는 범위가 없으면 0)
+
+    explicit이면 type/subtype이 정확히 같은 범위만 본다 (*/*로 Arrow를 고르지 않도록).
+    """
+    main_type, _, subtype = media_type.partition("/")
+    best, quality = -1, 0.0
+    for range_type, range_subtype, q in ranges:
+        if (range_type, range_subtype) == (main_type, subtype):
+            specificity = 2
+        elif explicit:
+            continue
+        elif range_type == main_type and range_subtype == "*":
+            specificity = 1
+        elif (range_type, range_subtype) == ("*", "*"):
+            specificity = 0
+        else:
+            continue
+        if specificity > best:
+            best, quality = specificity, q
+    return quality
+
+
+def negotiate_format(format: str, accept: Optional[str], downsampled: bool = False) -> str:
+    """format 파라미터가 기본값(json)이면 Accept 헤더로 Arrow 요청 여부 판단
+
+    Accept에 Arrow가 명시되어 있고(q > 0) q 값이 JSON보다 작지 않으면 arrow를 고른다.
+    Arrow를 줄 수 없는 경우(pyarrow 없음, 다운샘플링 응답)에는 JSON도 받을 수 있으면 JSON,
+    아니면 406. 라우트의 try 블록 밖에서 호출하고, 라우트에는 vary_on_accept를 붙인다.
+    """
+    if format == "json" and accept:
+        ranges = parse_accept(accept)
+        arrow_quality = accept_quality(ranges, ARROW_STREAM_MEDIA_TYPE, explicit=True)
+        json_quality = accept_quality(ranges, JSON_MEDIA_TYPE)
+        if arrow_quality > 0 and arrow_quality >= json_quality:
+            if pa is not None and not downsampled:
+                return "arrow"
+            if json_quality == 0:
+                reason = "bucket/max_points/lttb responses" if downsampled else "this server (pyarrow is not installed)"
+                raise HTTPException(
+                    status_code=406, detail=f"Arrow format is not available for {reason}", headers={"Vary": "Accept"}
+                )
+    if format == "arrow" and pa is None:
+        raise HTTPException(status_code=406, detail="Arrow format is not available (pyarrow is not installed)")
+    return format
+
+
+def vary_on_accept(endpoint: Callable) -> Callable:
+    """Accept로 응답 형식이 달라지는 async 라우트의 응답(HTTPException 포함)에 Vary: Accept 추가"""
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            result = await endpoint(*args, **kwargs)
+        except HTTPException as e:
+            e.headers = {**(e.headers or {}), "Vary": "Accept"}
+            raise
+        response = result if isinstance(result, Response) else json_response(result)
+        response.headers.add_vary_header("Accept")
+        return response
+
+    return wrapper
+
+
+def columnar_json_response(vehicle_id: str, columns: Dict[str, List[Any]]) -> Response:
+    """{"vehicle_id", "count", "timestamp_unit", "columns": {컬럼: [값, ...]}} 형태의 JSON 응답"""
+    return json_response({
+        "vehicle_id": vehicle_id,
+        "count": len(columns["timestamp"]),
+        "timestamp_unit": "ms",
+        "columns": columns,
+    })
+
+
+def arrow_response(vehicle_id: str, columns: Dict[str, List[Any]]) -> Response:
+    """Apache Arrow IPC 스트림 응답 (레코드 배치 하나, vehicle_id는 스키마 메타데이터)"""
+    arrays = {
+        name: pa.array(values, type=pa.timestamp("ms", tz="UTC")) if name == "timestamp" else pa.array(values)
+        for name, values in columns.items()
+    }
+    batch = pa.RecordBatch.from_pydict(arrays, metadata={"vehicle_id": vehicle_id})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_STREAM_MEDIA_TYPE)
@@ -0,0 +1,302 @@
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # br 인코딩은 선택 기능 (없으면 협상 대상에서 제외)
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd 인코딩은 선택 기능
+    zstandard = None
+
+# 응답 압축 설정
+# 서버 선호 순서 (쉼표 구분, 비우면 압축 사용 안 함). 클라이언트 q 값이 같으면 앞에 있는 인코딩 사용
+COMPRESSION_ENCODINGS = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+# 이 크기(바이트) 미만 본문은 압축하지 않음 (작은 JSON은 헤더/CPU 비용이 이득보다 큼)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# 이 크기 이상의 한 번에 보내는 본문은 이벤트 루프를 막지 않도록 스레드풀에서 압축
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", "262144"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+# 압축 대상 Content-Type (이미 압축된 이미지/바이너리는 제외)
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/vnd.apache.arrow.stream",
+    "text/",
+)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> Dict[str, Any]:
+    """설치된 라이브러리로 만들 수 있는 인코딩 이름 -> 인코더 생성 함수"""
+    encoders = {"gzip": lambda: _GzipEncoder(COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        encoders["br"] = lambda: _BrotliEncoder(COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        encoders["zstd"] = lambda: _ZstdEncoder(COMPRESSION_ZSTD_LEVEL)
+    return encoders
+
+
+def _configured_encodings() -> Tuple[List[str], List[str]]:
+    """설정된 인코딩을 (사용 가능, 라이브러리가 없어 건너뛴 것)으로 나눔"""
+    available = available_encodings()
+    encodings, unavailable = [], []
+    for name in (name.strip().lower() for name in COMPRESSION_ENCODINGS.split(",")):
+        if not name:
+            continue
+        (encodings if name in available else unavailable).append(name)
+    return encodings, unavailable
+
+
+# 실제로 협상에 쓰는 인코딩 (설정 순서 중 설치된 것만)
+# 건너뛴 인코딩은 import 시점이 아니라 lifespan 시작 로그와 /admin/compression에서 알린다
+ENABLED_ENCODINGS, UNAVAILABLE_ENCODINGS = _configured_encodings()
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Accept-Encoding과 서버 선호 순서로 응답 인코딩 결정 (없으면 None = identity)
+
+    q 값이 큰 인코딩을 먼저 고르고, 같으면 encodings 순서를 따른다. q=0은 거부, *는 나머지 전부.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    candidates = []
+    for order, name in enumerate(encodings):
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > 0:
+            candidates.append((-q, order, name))
+    return min(candidates)[2] if candidates else None
+
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return any(media_type.startswith(prefix) for prefix in COMPRESSIBLE_MEDIA_TYPES)
+
+
+def _route_name(scope: Scope) -> str:
+    # 라우터가 매칭한 라우트를 scope에 기록하므로 응답 시작 시점에는 경로 템플릿을 알 수 있음
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope.get('method', 'GET')} {path}"
+
+
+class CompressionStats:
+    """라우트/인코딩별 응답 수, 압축 전 바이트, 전송 바이트, 압축 CPU 시간 누적"""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, encoding: str, identity_bytes: int, wire_bytes: int, cpu_seconds: float) -> None:
+        with self._lock:
+            counts = self._routes.setdefault(route, {}).setdefault(
+                encoding, {"responses": 0, "identity_bytes": 0, "wire_bytes": 0, "cpu_seconds": 0.0}
+            )
+            counts["responses"] += 1
+            counts["identity_bytes"] += identity_bytes
+            counts["wire_bytes"] += wire_bytes
+            counts["cpu_seconds"] += cpu_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {
+                route: {encoding: dict(counts) for encoding, counts in encodings.items()}
+                for route, encodings in self._routes.items()
+            }
+        for encodings in routes.values():
+            for counts in encodings.values():
+                counts["ratio"] = (
+                    round(counts["identity_bytes"] / counts["wire_bytes"], 2) if counts["wire_bytes"] else None
+                )
+                counts["cpu_ms_per_response"] = round(counts.pop("cpu_seconds") * 1000 / counts["responses"], 3)
+        return {
+            "encodings": ENABLED_ENCODINGS,
+            "unavailable_encodings": UNAVAILABLE_ENCODINGS,
+            "min_size": COMPRESSION_MIN_SIZE,
+            "routes": routes,
+        }
+
+
+compression_stats = CompressionStats()
+
+
+def _compress_all(encoder, body: bytes) -> Tuple[bytes, float]:
+    started = time.thread_time()
+    data = encoder.compress(body) + encoder.finish()
+    return data, time.thread_time() - started
+
+
+class CompressionMiddleware:
+    """Accept-Encoding에 따라 zstd/br/gzip으로 응답 본문을 압축하는 ASGI 미들웨어
+
+    - 본문이 min_size 바이트 이상일 때만 압축. 스트리밍 응답은 min_size만큼 모일 때까지 헤더 전송을 미룬다.
+    - 한 번에 보내는 본문은 Content-Length를 압축 후 크기로 바꾸고, 스트리밍 응답은 조각마다
+      flush해 NDJSON 줄이 버퍼에 묶이지 않고 바로 클라이언트에 전달되게 한다 (Content-Length 제거).
+    - 압축 여부와 관계없이 압축 대상 타입이면 Vary: Accept-Encoding을 붙이고, 강한 ETag는 약한 ETag로 바꾼다.
+    - 라우트/인코딩별 전송 바이트와 압축 CPU 시간을 compression_stats에 누적한다.
+    """
+
+    def __init__(self, app: ASGIApp, encodings: Optional[Sequence[str]] = None, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.encodings = list(encodings) if encodings is not None else ENABLED_ENCODINGS
+        self.min_size = min_size
+        self._encoders = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressionResponder(scope, send, encoding, self._encoders.get(encoding), self.min_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, scope: Scope, send: Send, encoding: Optional[str], encoder_factory, min_size: int):
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.min_size = min_size
+        self.start_message: Optional[Message] = None
+        self.buffer = bytearray()
+        self.started = False
+        self.encoder = None
+        self.identity_bytes = 0
+        self.wire_bytes = 0
+        self.cpu_seconds = 0.0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.identity_bytes += len(body)
+
+        if self.started:
+            await self._send_body(self._encode(body, more_body) if self.encoder else body, more_body)
+            return
+
+        self.buffer += body
+        if more_body and len(self.buffer) < self.min_size:
+            return
+        body, self.buffer = bytes(self.buffer), bytearray()
+
+        headers = MutableHeaders(scope=self.start_message)
+        compressible = _is_compressible(headers)
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        if compressible and self.encoder_factory is not None and len(body) >= self.min_size and self.start_message["status"] not in (204, 304):
+            self.encoder = self.encoder_factory()
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if more_body:
+                del headers["Content-Length"]
+                body = self._encode(body, more_body)
+            else:
+                if len(body) >= COMPRESSION_THREAD_MIN_SIZE:
+                    body, cpu_seconds = await anyio.to_thread.run_sync(_compress_all, self.encoder, body)
+                else:
+                    body, cpu_seconds = _compress_all(self.encoder, body)
+                self.cpu_seconds += cpu_seconds
+                headers["Content-Length"] = str(len(body))
+
+        self.started = True
+        await self._send(self.start_message)
+        await self._send_body(body, more_body)
+
+    def _encode(self, body: bytes, more_body: bool) -> bytes:
+        started = time.thread_time()
+        data = self.encoder.compress(body) + (self.encoder.flush() if more_body else self.encoder.finish())
+        self.cpu_seconds += time.thread_time() - started
+        return data
+
+    async def _send_body(self, body: bytes, more_body: bool) -> None:
+        self.wire_bytes += len(body)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+        if not more_body:
+            compression_stats.record(
+                _route_name(self.scope),
+                self.encoding if self.encoder else "identity",
+                self.identity_bytes,
+                self.wire_bytes,
+                self.cpu_seconds,
+            )
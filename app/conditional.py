@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .db import async_db_endpoint, get_db, has_column
+
+
+def _http_date(value: datetime) -> str:
+    # created_at/updated_at은 UTC 기준 naive datetime으로 저장됨
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match는 약한 비교: W/ 접두사를 무시하고 비교
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_get(model, date_column: str) -> Callable:
+    """차량별 행 수/최신 날짜/최신 updated_at으로 ETag, Last-Modified를 계산하는 라우트 의존성
+
+    COUNT/MAX 집계 한 번으로 검증자를 만들고 (행 자체는 읽지 않음), 요청의
+    If-None-Match 또는 If-Modified-Since와 일치하면 본문 없이 304를 돌려준다.
+    일치하지 않으면 검증자를 응답 헤더에 실어 핸들러를 그대로 실행한다.
+    updated_at은 행을 제자리에서 다시 계산해도 바뀌므로 재계산 후에도 304가 나가지 않는다.
+    cached_response는 이 ETag를 캐시 키에 넣어 검증자와 본문이 같은 버전을 가리키게 한다.
+    updated_at 마이그레이션이 적용되지 않은 DB에서는 created_at으로 대체한다 (재계산은 감지하지 못함).
+    해당 차량의 행이 없으면 검증자 없이 통과시켜 404/빈 응답은 핸들러가 결정한다.
+    """
+    date_attr = getattr(model, date_column)
+
+    def dependency(
+        vehicle_id: str,
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+    ) -> None:
+        if has_column(db, model.__tablename__, "updated_at"):
+            changed_attr = model.updated_at
+        else:
+            changed_attr = model.created_at
+        count, latest_date, last_updated = (
+            db.query(func.count(), func.max(date_attr), func.max(changed_attr))
+            .filter(model.vehicle_id == vehicle_id)
+            .one()
+        )
+        if not count:
+            return
+
+        version = f"{model.__tablename__}|{vehicle_id}|{count}|{latest_date}|{last_updated}"
+        etag = 'W/"' + hashlib.sha1(version.encode("utf-8")).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_updated is not None:
+            headers["Last-Modified"] = _http_date(last_updated)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, etag)
+        elif last_updated is not None and "if-modified-since" in request.headers:
+            since = _parse_http_date(request.headers["if-modified-since"])
+            # HTTP 날짜는 초 단위이므로 마이크로초를 버리고 비교
+            modified = _parse_http_date(headers["Last-Modified"])
+            not_modified = since is not None and modified <= since
+        else:
+            not_modified = False
+
+        if not_modified:
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return async_db_endpoint(dependency)
@@ -7,12 +7,38 @@ mysql_db = os.getenv("MYSQL_DATABASE", "alcha")
 mysql_user = os.getenv("MYSQL_USER", "alcha_user")
 mysql_password = os.getenv("MYSQL_PASSWORD", "alcha_password")
 
-DATABASE_URL = f"mysql+pymysql://{mysql_user}:{mysql_password}@{mysql_host}:{mysql_port}/{mysql_db}"
+# 배포 환경(deployment.yaml, docker run)에서는 DATABASE_URL을 직접 넘김
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"mysql+pymysql://{mysql_user}:{mysql_password}@{mysql_host}:{mysql_port}/{mysql_db}",
+)
 
 class Settings:
     database_url: str = DATABASE_URL
     env: str = os.getenv("ENV", "local")
 
-settings = Settings()
+    # MySQL 커넥션 풀 설정 (SQLAlchemy QueuePool)
+    # 동시에 DB를 쓰는 sync 라우트 수의 상한은 threadpool_size이므로 pool_size + max_overflow를 그에 맞춤
+    db_pool_size: int = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("MYSQL_MAX_OVERFLOW", "30"))
+    # 커넥션 대여 대기 최대 시간 (초)
+    db_pool_timeout: float = float(os.getenv("MYSQL_POOL_TIMEOUT", "10"))
+    # 이 시간(초)보다 오래된 커넥션은 재연결 (MySQL wait_timeout, 프록시 유휴 종료 대비)
+    db_pool_recycle: int = int(os.getenv("MYSQL_POOL_RECYCLE", "1800"))
+    # 대여 전 연결 확인: always(매번 ping) | idle(db_pre_ping_interval 이상 유휴였을 때만) | off
+    db_pre_ping: str = os.getenv("MYSQL_PRE_PING", "idle").lower()
+    db_pre_ping_interval: float = float(os.getenv("MYSQL_PRE_PING_INTERVAL", "30"))
+    # SELECT 실행 시간 상한 (밀리초, MySQL max_execution_time). 0이면 제한 없음
+    db_statement_timeout_ms: int = int(os.getenv("MYSQL_STATEMENT_TIMEOUT_MS", "10000"))
+
+    # vehicles 라우트를 AsyncSession(aiomysql)으로 실행: DB I/O를 스레드풀 대신 이벤트 루프에서 대기
+    db_async_mode: bool = os.getenv("MYSQL_ASYNC_MODE", "false").lower() in ("1", "true", "yes")
+    async_database_url: str = os.getenv("ASYNC_DATABASE_URL", DATABASE_URL.replace("+pymysql", "+aiomysql", 1))
 
+    # sync 라우트를 실행하는 AnyIO 스레드풀 크기 (기본 40)
+    threadpool_size: int = int(os.getenv("THREADPOOL_SIZE", "40"))
 
+    # /api/admin/* 호출에 필요한 토큰 (X-Admin-Token 또는 Authorization: Bearer). 비우면 관리 API 사용 안 함
+    admin_api_token: str = os.getenv("ADMIN_API_TOKEN", "")
+
+settings = Settings()
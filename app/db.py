@@ -1,13 +1,197 @@
-from sqlalchemy import create_engine
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from .config import settings
+from .metrics import record_query
+
+
+class InstrumentedQueuePool(QueuePool):
+    """대여 대기 시간, 대기열 깊이, 타임아웃을 집계하는 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._waiting = 0
+        self._peak_waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self.pre_ping_failures = 0
+        self.invalidations = 0
+
+    def _do_get(self):
+        with self._metrics_lock:
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+        started = time.monotonic()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            with self._metrics_lock:
+                self._waiting -= 1
+        waited = time.monotonic() - started
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "waiting": self._waiting,
+                "peak_waiting": self._peak_waiting,
+                "checkouts": self._checkouts,
+                "checkout_timeouts": self._timeouts,
+                "avg_checkout_wait_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_checkout_wait_ms": round(self._wait_max * 1000, 3),
+                "pre_ping_failures": self.pre_ping_failures,
+                "invalidations": self.invalidations,
+            }
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pre_ping == "always",
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+if engine.dialect.name == "mysql" and settings.db_statement_timeout_ms > 0:
+    @event.listens_for(engine, "connect")
+    def _set_statement_timeout(dbapi_connection, connection_record):
+        # MySQL은 SELECT에만 적용됨
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET SESSION max_execution_time = {int(settings.db_statement_timeout_ms)}")
+        finally:
+            cursor.close()
+
+
+if settings.db_pre_ping == "idle":
+    @event.listens_for(engine, "checkin")
+    def _record_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+        """db_pre_ping_interval 이상 유휴였던 커넥션만 대여 전에 SELECT 1로 확인
+
+        매 대여마다 ping하는 pool_pre_ping과 달리 바쁜 풀에서는 왕복이 추가되지 않는다.
+        실패하면 DisconnectionError로 풀이 새 커넥션을 다시 대여한다.
+        """
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pre_ping_interval:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            engine.pool.pre_ping_failures += 1
+            raise exc.DisconnectionError() from e
+
+
+@event.listens_for(engine, "invalidate")
+def _count_invalidation(dbapi_connection, connection_record, exception):
+    engine.pool.invalidations += 1
+
+
+def instrument_queries(sync_engine) -> None:
+    """쿼리마다 실행 시간과 읽은 행 수를 metrics에 기록하는 이벤트 리스너 등록
+
+    결과를 돌려주는 문장(SELECT)은 PyMySQL/aiomysql이 결과를 모두 받아 두므로 rowcount가 읽은 행 수다.
+    AsyncEngine은 sync_engine에 등록한다.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started_at", None)
+        if started is None:
+            return
+        rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+        record_query("mysql", time.perf_counter() - started, rows)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _record_failed_query(exception_context):
+        conn = exception_context.connection
+        started = conn.info.pop("query_started_at", None) if conn is not None else None
+        if started is not None:
+            record_query("mysql", time.perf_counter() - started)
+
+
+instrument_queries(engine)
+
+
+def get_db_pool_stats() -> Dict[str, Any]:
+    """MySQL 커넥션 풀 지표 반환"""
+    return {
+        "pre_ping": settings.db_pre_ping,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "threadpool_size": settings.threadpool_size,
+        **engine.pool.metrics(),
+    }
+
+
+_column_cache: Dict[tuple, bool] = {}
+_column_cache_lock = threading.Lock()
+
+
+def has_column(db, table: str, column: str) -> bool:
+    """테이블에 컬럼이 있는지 확인 (프로세스당 한 번만 조회해 캐시)
+
+    마이그레이션(sql/add_updated_at_columns.sql)이 적용되지 않은 기존 DB에서도
+    검증자가 500 대신 다른 컬럼으로 대체할 수 있도록 사용한다.
+    컬럼이 없으면 처음 한 번 경고를 출력한다.
+    """
+    key = (table, column)
+    with _column_cache_lock:
+        if key in _column_cache:
+            return _column_cache[key]
+    try:
+        found = any(c["name"] == column for c in sa_inspect(db.connection()).get_columns(table))
+    except Exception as e:
+        print(f"⚠️ {table}.{column} 컬럼 확인 실패, 없는 것으로 처리: {e}")
+        return False
+    with _column_cache_lock:
+        if key not in _column_cache and not found:
+            print(f"⚠️ {table}.{column} 컬럼이 없습니다. sql/add_updated_at_columns.sql을 적용한 뒤 재시작하세요 (README 참고)")
+        _column_cache[key] = found
+    return found
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -16,3 +200,75 @@ def get_db():
         db.close()
 
 
+# 비동기 모드 엔진 (MYSQL_ASYNC_MODE일 때 첫 사용 시 생성, aiomysql 필요)
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        connect_args = {}
+        if settings.db_statement_timeout_ms > 0 and "mysql" in settings.async_database_url:
+            connect_args["init_command"] = f"SET SESSION max_execution_time = {int(settings.db_statement_timeout_ms)}"
+        _async_engine = create_async_engine(
+            settings.async_database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pre_ping != "off",
+            connect_args=connect_args,
+        )
+        instrument_queries(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+async def close_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+
+
+def get_async_db_pool_stats() -> Dict[str, Any]:
+    if _async_engine is None:
+        return {"initialized": False}
+    pool = _async_engine.pool
+    return {
+        "initialized": True,
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def async_db_endpoint(func: Callable) -> Callable:
+    """MYSQL_ASYNC_MODE이면 sync 핸들러를 AsyncSession.run_sync로 실행하는 async 엔드포인트로 변환
+
+    run_sync는 핸들러를 greenlet 안에서 실행하고 DB I/O마다 이벤트 루프로 돌아오므로
+    스레드풀 스레드를 점유하지 않는다. 핸들러 코드(쿼리와 응답 구성)는 두 모드가 공유한다.
+    sync 모드에서는 핸들러를 그대로 돌려준다.
+    """
+    if not settings.db_async_mode:
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(db: AsyncSession, **kwargs):
+        return await db.run_sync(lambda session: func(db=session, **kwargs))
+
+    signature = inspect.signature(func)
+    wrapper.__signature__ = signature.replace(parameters=[
+        param.replace(annotation=AsyncSession, default=Depends(get_async_db)) if param.name == "db" else param
+        for param in signature.parameters.values()
+    ])
+    return wrapper
@@ -0,0 +1,71 @@
+import re
+from datetime import timedelta
+
+import numpy as np
+
+_BUCKET_PATTERN = re.compile(r"^\s*(\d+)\s*([a-z]+)\s*$")
+_BUCKET_UNITS = {
+    "s": "seconds", "sec": "seconds", "second": "seconds", "seconds": "seconds",
+    "m": "minutes", "min": "minutes", "minute": "minutes", "minutes": "minutes",
+    "h": "hours", "hour": "hours", "hours": "hours",
+    "d": "days", "day": "days", "days": "days",
+}
+
+def parse_bucket(value: str) -> timedelta:
+    """'30s', '5m', '1 hour' 형식의 버킷 크기를 timedelta로 변환"""
+    match = _BUCKET_PATTERN.match(value.lower())
+    if not match or match.group(2) not in _BUCKET_UNITS:
+        raise ValueError(f"Invalid bucket '{value}'. Use e.g. 30s, 5m, 1h, 1d")
+    width = timedelta(**{_BUCKET_UNITS[match.group(2)]: int(match.group(1))})
+    if width < timedelta(seconds=1):
+        raise ValueError("bucket must be at least 1 second")
+    return width
+
+def bucket_for_max_points(span: timedelta, max_points: int) -> timedelta:
+    """전체 구간을 max_points개 이하의 버킷으로 나누는 버킷 크기 (최소 1초)
+
+    30분/12시간 이상이면 시간/일 단위로 올림해 연속 집계 뷰를 그대로 읽을 수 있게 한다.
+    올림만 하므로 버킷 수는 max_points를 넘지 않는다.
+    """
+    seconds = max(1, int(-(-span.total_seconds() // max_points)))
+    for unit in (86400, 3600):
+        if seconds >= unit // 2:
+            seconds = -(-seconds // unit) * unit
+            break
+    return timedelta(seconds=seconds)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 다운샘플링으로 남길 인덱스 반환
+
+    첫 점과 마지막 점은 항상 남기고, 나머지 구간을 threshold - 2개의 버킷으로 나눠
+    버킷마다 (직전에 선택한 점, 현재 버킷의 점, 다음 버킷의 평균 점)이 이루는
+    삼각형 넓이가 가장 큰 점을 고른다. 버킷 간 순차 의존성이 있어 버킷 단위로
+    순회하지만, 버킷 내부 계산은 NumPy 벡터 연산으로 처리한다.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
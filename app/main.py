@@ -1,18 +1,61 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+
+import anyio
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from .routers import vehicles, events, telemetry
-from .timescaledb import init_timescaledb
+from .compression import CompressionMiddleware, UNAVAILABLE_ENCODINGS
+from .config import settings
+from .responses import FastJSONResponse, FastJSONRoute
+from .metrics import METRICS_MEDIA_TYPE, MetricsMiddleware, render_metrics
+from .db import get_db_pool_stats, get_async_db_pool_stats, close_async_engine
+from .routers import vehicles, events, telemetry, fleet, admin
+from .timescaledb import (
+    init_timescaledb,
+    init_timescaledb_pool,
+    close_timescaledb_pool,
+    get_timescaledb_pool_stats,
+    PoolTimeoutError,
+)
+from .timescaledb_async import init_async_pool, close_async_pool
+from .vehicle_registry import vehicle_registry
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 시작 시 TimescaleDB 초기화
+    # sync 라우트 스레드풀 크기 (MySQL 풀 크기와 함께 조정)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    if UNAVAILABLE_ENCODINGS:
+        print(f"Compression encodings not available (library not installed), skipping: {', '.join(UNAVAILABLE_ENCODINGS)}")
+    # 시작 시 TimescaleDB 커넥션 풀 생성 및 초기화
+    init_timescaledb_pool()
     init_timescaledb()
+    try:
+        await init_async_pool()
+    except Exception as e:
+        # 첫 요청 시 다시 생성을 시도하므로 기동은 계속 진행
+        print(f"Failed to create async TimescaleDB pool: {e}")
+    # 차량 목록을 메모리에 올리고 주기적으로 변경 여부 확인
+    vehicle_registry.load()
+    registry_task = asyncio.create_task(vehicle_registry.refresh_loop())
     yield
-    # 종료 시 정리 작업 (필요시)
+    registry_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await registry_task
+    # 종료 시 커넥션 풀 정리
+    await close_async_engine()
+    await close_async_pool()
+    close_timescaledb_pool()
 
 app = FastAPI(title="Alcha Dashboard API", lifespan=lifespan)
+# 헬스 체크 등 앱에 직접 등록하는 라우트도 render_json으로 직렬화
+app.router.route_class = FastJSONRoute
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # 풀 고갈은 일시적인 과부하이므로 빈 결과나 500 대신 503으로 재시도를 유도
+    return FastJSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,14 +64,35 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 응답 본문 압축 (Accept-Encoding 협상, COMPRESSION_MIN_SIZE 미만은 그대로 전송)
+app.add_middleware(CompressionMiddleware)
+# 라우트별 지연 시간/DB 시간/쿼리 수/응답 바이트 (가장 바깥에서 측정, /metrics로 노출)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(vehicles.router, prefix="/api")
 app.include_router(events.router, prefix="/api")
 app.include_router(telemetry.router, prefix="/api")
+app.include_router(fleet.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=METRICS_MEDIA_TYPE)
+
+@app.get("/health/timescaledb")
+def timescaledb_health():
+    return get_timescaledb_pool_stats()
+
+@app.get("/health/mysql")
+def mysql_health():
+    stats = get_db_pool_stats()
+    if settings.db_async_mode:
+        stats["async"] = get_async_db_pool_stats()
+    return stats
+
 # deploy test !!!
 
@@ -0,0 +1,131 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_MEDIA_TYPE = CONTENT_TYPE_LATEST
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(10))  # 256B ~ 64MiB
+
+# 라우트 라벨은 경로 템플릿(/api/telemetry/{vehicle_id})을 써서 차량 수만큼 시계열이 늘지 않게 함
+REQUEST_LABELS = ("method", "route")
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency until the last response body chunk is sent",
+    REQUEST_LABELS + ("status",), buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Total database time spent by one request",
+    REQUEST_LABELS, buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Number of queries executed by one request",
+    REQUEST_LABELS, buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_ROWS = Histogram(
+    "http_request_db_rows", "Number of rows fetched from the database by one request",
+    REQUEST_LABELS, buckets=ROW_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body bytes sent on the wire (after compression)",
+    REQUEST_LABELS, buckets=SIZE_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "Requests currently being processed", ("method",))
+
+# 요청 밖(기동 시 초기화, 백그라운드 갱신)의 쿼리도 포함하는 쿼리 단위 지표
+# backend: mysql (SQLAlchemy), timescaledb (psycopg2), timescaledb_async (asyncpg)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Execution time of a single query", ("backend",), buckets=LATENCY_BUCKETS,
+)
+ROWS_FETCHED = Counter("db_rows_fetched_total", "Rows fetched from the database", ("backend",))
+
+
+class RequestMetrics:
+    """요청 하나 동안 누적하는 DB 시간/쿼리 수/행 수
+
+    ContextVar에 담기므로 스레드풀에서 실행되는 sync 라우트와 스트리밍 응답 태스크에서도
+    같은 객체에 더해진다.
+    """
+
+    __slots__ = ("db_seconds", "queries", "rows")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def record_query(backend: str, seconds: float, rows: int = 0) -> None:
+    """DB 훅(SQLAlchemy 이벤트, psycopg2 커서, asyncpg 커넥션)에서 쿼리 한 번을 기록"""
+    QUERY_DURATION.labels(backend).observe(seconds)
+    if rows:
+        ROWS_FETCHED.labels(backend).inc(rows)
+    current = _current.get()
+    if current is not None:
+        current.db_seconds += seconds
+        current.queries += 1
+        current.rows += rows
+
+
+def _route_label(scope: Scope) -> str:
+    # 매칭되지 않은 경로(404 스캔 등)는 하나로 묶음
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """라우트별 지연 시간, DB 시간, 쿼리 수, 행 수, 응답 바이트를 기록하는 ASGI 미들웨어
+
+    가장 바깥에 두어 지연 시간에 압축 시간이 포함되고 응답 바이트는 실제 전송 크기가 되도록 한다.
+    스트리밍 응답은 마지막 본문 조각을 보낸 뒤에 기록된다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            _current.reset(token)
+            route = _route_label(scope)
+            REQUEST_DURATION.labels(method, route, str(status)).observe(elapsed)
+            REQUEST_DB_DURATION.labels(method, route).observe(metrics.db_seconds)
+            REQUEST_DB_QUERIES.labels(method, route).observe(metrics.queries)
+            REQUEST_DB_ROWS.labels(method, route).observe(metrics.rows)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+def render_metrics() -> bytes:
+    """Prometheus 텍스트 형식의 전체 지표"""
+    return generate_latest()
@@ -13,6 +13,7 @@ class Vehicle(Base):
     model = Column(String(100), nullable=False)
     year = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     daily_metrics = relationship("DailyMetrics", back_populates="vehicle", cascade="all, delete-orphan")
@@ -61,6 +62,8 @@ class VehicleScoreDaily(Base):
     engine_start_count = Column(Integer)
     suddenacc_count = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 재적재/재계산으로 행이 바뀌면 갱신 (조건부 GET 검증자에 사용)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     vehicle = relationship("Vehicle", back_populates="score_daily")
 
@@ -78,5 +81,7 @@ class DrivingHabitMonthly(Base):
     avg_speed = Column(Float)
     avg_distance = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 재적재/재계산으로 행이 바뀌면 갱신 (조건부 GET 검증자에 사용)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     vehicle = relationship("Vehicle", back_populates="driving_habits")
@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional
+
+# 원본 조회 시 테이블별 반환 컬럼
+RAW_COLUMNS = {
+    "vehicle_telemetry": "vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp",
+    "engine_off_events": "vehicle_id, speed, gear_status, gyro, side, ignition, timestamp",
+    "collision_events": "vehicle_id, damage, timestamp",
+    "sudden_acceleration_events": "vehicle_id, vehicle_speed, throttle_position, gear_position_mode, timestamp",
+    "warning_light_events": "vehicle_id, warning_type, timestamp",
+    "periodic_data": """vehicle_id, location_latitude, location_longitude, location_altitude,
+           temperature_cabin, temperature_ambient, battery_voltage,
+           tpms_front_left, tpms_front_right, tpms_rear_left, tpms_rear_right,
+           accelerometer_x, accelerometer_y, accelerometer_z, fuel_level,
+           engine_coolant_temp, transmission_oil_temp, timestamp""",
+}
+
+EVENT_TABLES = ("engine_off_events", "collision_events", "sudden_acceleration_events", "warning_light_events")
+
+# 시간 범위 조건 형태 (시작/끝 시각 유무에 따라 네 가지). $1은 vehicle_id, 시각은 $2부터 바인딩
+TIME_BOUNDS = {
+    "range": "AND timestamp BETWEEN $2 AND $3",
+    "from": "AND timestamp >= $2",
+    "until": "AND timestamp <= $2",
+    "all": "",
+}
+
+
+def time_bounds(start_time: Optional[Any], end_time: Optional[Any]) -> str:
+    """시작/끝 시각 유무로 TIME_BOUNDS 키 결정"""
+    if start_time and end_time:
+        return "range"
+    if start_time:
+        return "from"
+    if end_time:
+        return "until"
+    return "all"
+
+
+def bound_values(start_time: Optional[Any], end_time: Optional[Any]) -> List[Any]:
+    """TIME_BOUNDS 조건에 바인딩할 값 (주어진 것만 순서대로)"""
+    return [value for value in (start_time, end_time) if value]
+
+
+def query_name(kind: str, table: str, bounds: str) -> str:
+    return f"{kind}_{table}_{bounds}"
+
+
+def _columnar_select(columns: str) -> str:
+    """열 단위 응답용 SELECT 목록: vehicle_id 제외, timestamp는 epoch 밀리초 정수로 DB에서 변환
+
+    출력 별칭도 timestamp이므로 ORDER BY에서는 테이블 이름을 붙여 원본 컬럼(인덱스 순서)을 가리켜야 한다.
+    """
+    names = [name.strip() for name in columns.split(",")]
+    return ", ".join(
+        ["floor(extract(epoch FROM timestamp) * 1000)::int8 AS timestamp"]
+        + [name for name in names if name not in ("vehicle_id", "timestamp")]
+    )
+
+
+def _build_queries() -> Dict[str, str]:
+    """테이블과 시간 범위 형태별 고정 문장 생성
+
+    - raw: 원본 범위 조회 ($1 vehicle_id, 시각)
+    - columns: raw와 같은 범위를 열 단위 응답용 컬럼(epoch 밀리초 timestamp)으로 조회
+    - page / page_after: 키셋 페이지 첫 페이지 / 커서 이후 (..., [커서 timestamp, id], limit)
+    - bounds: 텔레메트리 조회 구간의 첫/마지막 시각
+    - fleet_counts: 여러 차량의 이벤트 테이블별 건수 ($1 vehicle_id 배열)
+    """
+    queries = {}
+    for bounds, condition in TIME_BOUNDS.items():
+        next_param = 2 + condition.count("$")
+        for table, columns in RAW_COLUMNS.items():
+            queries[query_name("raw", table, bounds)] = f"""
+                SELECT {columns}
+                FROM {table}
+                WHERE vehicle_id = $1 {condition}
+                ORDER BY timestamp ASC
+            """
+            queries[query_name("columns", table, bounds)] = f"""
+                SELECT {_columnar_select(columns)}
+                FROM {table}
+                WHERE vehicle_id = $1 {condition}
+                ORDER BY {table}.timestamp ASC
+            """
+            queries[query_name("page", table, bounds)] = f"""
+                SELECT id, {columns}
+                FROM {table}
+                WHERE vehicle_id = $1 {condition}
+                ORDER BY timestamp ASC, id ASC
+                LIMIT ${next_param}
+            """
+            queries[query_name("page_after", table, bounds)] = f"""
+                SELECT id, {columns}
+                FROM {table}
+                WHERE vehicle_id = $1 {condition} AND (timestamp, id) > (${next_param}, ${next_param + 1})
+                ORDER BY timestamp ASC, id ASC
+                LIMIT ${next_param + 2}
+            """
+        queries[query_name("bounds", "vehicle_telemetry", bounds)] = f"""
+            SELECT min(timestamp) AS first, max(timestamp) AS last
+            FROM vehicle_telemetry
+            WHERE vehicle_id = $1 {condition}
+        """
+        queries[query_name("fleet_counts", "events", bounds)] = "\nUNION ALL\n".join(
+            f"""SELECT '{table}' AS event_table, vehicle_id, count(*) AS event_count, max(timestamp) AS last_event_at
+                FROM {table}
+                WHERE vehicle_id = ANY($1::text[]) {condition}
+                GROUP BY vehicle_id"""
+            for table in EVENT_TABLES
+        )
+    return queries
+
+
+# 이름 -> SQL. 커넥션마다 처음 쓸 때 한 번 prepare하고 이후에는 이름으로 실행
+QUERIES = _build_queries()
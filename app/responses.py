@@ -0,0 +1,68 @@
+import asyncio
+import functools
+from decimal import Decimal
+from typing import Any, Callable
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+JSON_MEDIA_TYPE = "application/json"
+
+# datetime/date(UTC 오프셋 포함)와 numpy 배열은 orjson이 직접 직렬화. 키가 문자열이 아닌 dict도 허용
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def render_json(content: Any) -> bytes:
+    """응답 본문을 orjson으로 한 번에 직렬화
+
+    datetime/date는 isoformat()과 같은 문자열로 나가므로 행마다 미리 문자열로 바꿀 필요가 없다.
+    NaN/Infinity는 null로 직렬화된다.
+    """
+    return orjson.dumps(content, default=_json_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """render_json으로 직렬화하는 JSON 응답"""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+def json_response(content: Any) -> Response:
+    """FastAPI 응답 검증/jsonable_encoder를 거치지 않고 바로 직렬화한 JSON 응답"""
+    return FastJSONResponse(content)
+
+
+def _render_result(endpoint: Callable) -> Callable:
+    """핸들러 반환값이 Response가 아니면 json_response로 감싸는 래퍼
+
+    FastAPI는 Response 인스턴스를 받으면 response_model 검증과 jsonable_encoder를 건너뛰므로
+    response_model은 문서(OpenAPI)에만 쓰인다. 의존성에서 설정한 응답 헤더는 옮겨지지 않으므로
+    헤더가 필요한 라우트는 직접 Response를 만들어 반환해야 한다 (cached_response 참고).
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            return result if isinstance(result, Response) else json_response(result)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            return result if isinstance(result, Response) else json_response(result)
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """반환값을 render_json으로 바로 직렬화하는 라우트 (APIRouter(route_class=...)로 사용)"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _render_result(endpoint), **kwargs)
@@ -0,0 +1,80 @@
+import hmac
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from ..cache import response_cache
+from ..compression import compression_stats
+from ..config import settings
+from ..responses import FastJSONRoute
+from ..timescaledb_async import get_chunk_sizes
+from ..vehicle_registry import vehicle_registry
+
+
+
+def require_admin_token(
+    x_admin_token: str = Header(None),
+    authorization: str = Header(None),
+):
+    """관리 API 인증: ADMIN_API_TOKEN과 같은 토큰이 없으면 거부 (설정하지 않으면 관리 API 전체 비활성화)"""
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_API_TOKEN is not set)")
+    token = x_admin_token
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+    if token is None or not hmac.compare_digest(token.encode(), settings.admin_api_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+    route_class=FastJSONRoute,
+)
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+def cache_stats():
+    """응답 캐시 백엔드, 항목 수, 라우트별 hit/miss 카운터 조회"""
+    return response_cache.stats()
+
+
+@router.post("/cache/invalidate", response_model=Dict[str, Any])
+def invalidate_cache(
+    vehicle_id: str = Query(None, description="이 차량의 캐시 항목만 삭제"),
+    table: str = Query(None, description="이 테이블을 읽는 캐시 항목만 삭제 (예: vehicle_score_daily)")
+):
+    """배치 적재 후 오래된 응답 캐시 삭제 (조건이 없으면 전체 삭제)"""
+    removed = response_cache.invalidate(vehicle_id=vehicle_id, table=table)
+    return {"vehicle_id": vehicle_id, "table": table, "removed": removed}
+
+
+@router.get("/compression", response_model=Dict[str, Any])
+def compression_statistics():
+    """라우트/인코딩별 응답 수, 압축 전/전송 바이트, 압축률, 응답당 압축 CPU 시간 조회"""
+    return compression_stats.stats()
+
+
+@router.get("/vehicle-registry", response_model=Dict[str, Any])
+def vehicle_registry_stats():
+    """메모리 차량 레지스트리 상태 조회"""
+    return vehicle_registry.stats()
+
+
+@router.post("/vehicle-registry/refresh", response_model=Dict[str, Any])
+def refresh_vehicle_registry():
+    """차량 추가/삭제 직후 다음 주기를 기다리지 않고 레지스트리 다시 읽기"""
+    vehicle_registry.refresh(force=True)
+    return vehicle_registry.stats()
+
+
+@router.get("/chunks/{table}", response_model=Dict[str, Any])
+async def chunk_sizes(table: str):
+    """하이퍼테이블 청크별 압축 여부와 압축 전/후 크기 조회"""
+    try:
+        return await get_chunk_sizes(table)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch chunk sizes: {str(e)}")
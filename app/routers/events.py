@@ -1,15 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Dict, Any, Union
 from datetime import datetime
-from ..timescaledb import get_events_for_vehicle, get_timescaledb_connection
+from ..timescaledb_async import (
+    get_events_for_vehicle,
+    get_sudden_acceleration_events as fetch_sudden_acceleration_events,
+    get_warning_light_events as fetch_warning_light_events,
+    get_periodic_data as fetch_periodic_data,
+    get_periodic_buckets,
+    fetch_page,
+    fetch_columns,
+    stream_rows,
+    StreamBusyError,
+)
+from ..downsampling import parse_bucket
+from ..responses import FastJSONRoute
+from ..vehicle_registry import require_known_vehicle_async
+from ..columnar import (
+    arrow_response,
+    columnar_json_response,
+    negotiate_format,
+    vary_on_accept,
+    COLUMNAR_FORMAT_DESCRIPTION,
+)
+from ..streaming import (
+    ndjson_response,
+    DEFAULT_PAGE_SIZE,
+    LIMIT_DESCRIPTION,
+    CURSOR_DESCRIPTION,
+    FORMAT_DESCRIPTION,
+)
 
-router = APIRouter(prefix="/events", tags=["events"])
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    dependencies=[Depends(require_known_vehicle_async)],
+    route_class=FastJSONRoute,
+)
 
 @router.get("/{vehicle_id}", response_model=Dict[str, List[Dict[str, Any]]])
 async def get_events_for_vehicle_endpoint(vehicle_id: str):
     """특정 차량의 이벤트 데이터 조회 (TimescaleDB)"""
     try:
-        events = get_events_for_vehicle(vehicle_id)
+        events = await get_events_for_vehicle(vehicle_id)
         return events
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch events: {str(e)}")
@@ -22,184 +54,105 @@ async def get_events_for_vehicle_range(
 ):
     """특정 차량의 시간 범위 이벤트 데이터 조회 (TimescaleDB)"""
     try:
-        events = get_events_for_vehicle(vehicle_id, start_time, end_time)
+        events = await get_events_for_vehicle(vehicle_id, start_time, end_time)
         return events
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid time range: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch events: {str(e)}")
 
-@router.get("/{vehicle_id}/sudden-acceleration", response_model=List[Dict[str, Any]])
+@router.get("/{vehicle_id}/sudden-acceleration", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
 async def get_sudden_acceleration_events(
     vehicle_id: str,
     start_time: str = Query(None, description="시작 시간"),
-    end_time: str = Query(None, description="종료 시간")
+    end_time: str = Query(None, description="종료 시간"),
+    limit: int = Query(None, ge=1, le=10000, description=LIMIT_DESCRIPTION),
+    cursor: str = Query(None, description=CURSOR_DESCRIPTION),
+    format: str = Query("json", pattern="^(json|ndjson)$", description=FORMAT_DESCRIPTION)
 ):
     """급가속 이벤트 조회"""
     try:
-        conn = get_timescaledb_connection()
-        if not conn:
-            raise HTTPException(status_code=500, detail="Database connection failed")
-        
-        cursor = conn.cursor()
-        
-        # 시간 범위 조건 설정
-        time_condition = ""
-        params = [vehicle_id]
-        
-        if start_time and end_time:
-            time_condition = "AND timestamp BETWEEN %s AND %s"
-            params.extend([start_time, end_time])
-        elif start_time:
-            time_condition = "AND timestamp >= %s"
-            params.append(start_time)
-        elif end_time:
-            time_condition = "AND timestamp <= %s"
-            params.append(end_time)
-        
-        query = f"""
-            SELECT vehicle_id, vehicle_speed, throttle_position, gear_position_mode, timestamp
-            FROM sudden_acceleration_events
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(query, params)
-        events = []
-        for row in cursor.fetchall():
-            events.append({
-                "vehicle_id": row[0],
-                "vehicle_speed": row[1],
-                "throttle_position": row[2],
-                "gear_position_mode": row[3],
-                "timestamp": row[4].isoformat()
-            })
-        
-        return events
-        
+        if format == "ndjson":
+            if limit or cursor:
+                raise ValueError("format=ndjson does not support limit/cursor")
+            return ndjson_response(await stream_rows("sudden_acceleration_events", vehicle_id, start_time, end_time))
+        if limit or cursor:
+            return await fetch_page("sudden_acceleration_events", vehicle_id, start_time, end_time, limit or DEFAULT_PAGE_SIZE, cursor)
+        return await fetch_sudden_acceleration_events(vehicle_id, start_time, end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
+    except StreamBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch sudden acceleration events: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
-@router.get("/{vehicle_id}/warning-lights", response_model=List[Dict[str, Any]])
+@router.get("/{vehicle_id}/warning-lights", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
 async def get_warning_light_events(
     vehicle_id: str,
     start_time: str = Query(None, description="시작 시간"),
-    end_time: str = Query(None, description="종료 시간")
+    end_time: str = Query(None, description="종료 시간"),
+    limit: int = Query(None, ge=1, le=10000, description=LIMIT_DESCRIPTION),
+    cursor: str = Query(None, description=CURSOR_DESCRIPTION),
+    format: str = Query("json", pattern="^(json|ndjson)$", description=FORMAT_DESCRIPTION)
 ):
     """경고등 이벤트 조회"""
     try:
-        conn = get_timescaledb_connection()
-        if not conn:
-            raise HTTPException(status_code=500, detail="Database connection failed")
-        
-        cursor = conn.cursor()
-        
-        # 시간 범위 조건 설정
-        time_condition = ""
-        params = [vehicle_id]
-        
-        if start_time and end_time:
-            time_condition = "AND timestamp BETWEEN %s AND %s"
-            params.extend([start_time, end_time])
-        elif start_time:
-            time_condition = "AND timestamp >= %s"
-            params.append(start_time)
-        elif end_time:
-            time_condition = "AND timestamp <= %s"
-            params.append(end_time)
-        
-        query = f"""
-            SELECT vehicle_id, warning_type, timestamp
-            FROM warning_light_events
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(query, params)
-        events = []
-        for row in cursor.fetchall():
-            events.append({
-                "vehicle_id": row[0],
-                "warning_type": row[1],
-                "timestamp": row[2].isoformat()
-            })
-        
-        return events
-        
+        if format == "ndjson":
+            if limit or cursor:
+                raise ValueError("format=ndjson does not support limit/cursor")
+            return ndjson_response(await stream_rows("warning_light_events", vehicle_id, start_time, end_time))
+        if limit or cursor:
+            return await fetch_page("warning_light_events", vehicle_id, start_time, end_time, limit or DEFAULT_PAGE_SIZE, cursor)
+        return await fetch_warning_light_events(vehicle_id, start_time, end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
+    except StreamBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch warning light events: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
-@router.get("/{vehicle_id}/periodic-data", response_model=List[Dict[str, Any]])
+@router.get("/{vehicle_id}/periodic-data", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+@vary_on_accept
 async def get_periodic_data(
     vehicle_id: str,
+    request: Request,
     start_time: str = Query(None, description="시작 시간"),
-    end_time: str = Query(None, description="종료 시간")
+    end_time: str = Query(None, description="종료 시간"),
+    bucket: str = Query(None, description="집계 버킷 크기 (예: 5m, 1h, 1d)"),
+    limit: int = Query(None, ge=1, le=10000, description=LIMIT_DESCRIPTION),
+    cursor: str = Query(None, description=CURSOR_DESCRIPTION),
+    format: str = Query("json", pattern="^(json|ndjson|columns|arrow)$", description=COLUMNAR_FORMAT_DESCRIPTION)
 ):
-    """주기적 데이터 조회 (위치, 온도, 배터리 등)"""
+    """주기적 데이터 조회 (위치, 온도, 배터리 등)
+
+    bucket을 지정하면 배터리 전압, 냉각수/변속기 온도, TPMS, 연료량의 버킷별 avg/min/max를 반환
+    (시간/일 단위 버킷은 연속 집계 뷰에서 읽음)
+    """
+    if bucket and (limit or cursor or format != "json"):
+        raise HTTPException(
+            status_code=400, detail="Invalid query parameters: limit/cursor/format cannot be combined with bucket"
+        )
+    format = negotiate_format(format, request.headers.get("accept"), downsampled=bool(bucket))
     try:
-        conn = get_timescaledb_connection()
-        if not conn:
-            raise HTTPException(status_code=500, detail="Database connection failed")
-        
-        cursor = conn.cursor()
-        
-        # 시간 범위 조건 설정
-        time_condition = ""
-        params = [vehicle_id]
-        
-        if start_time and end_time:
-            time_condition = "AND timestamp BETWEEN %s AND %s"
-            params.extend([start_time, end_time])
-        elif start_time:
-            time_condition = "AND timestamp >= %s"
-            params.append(start_time)
-        elif end_time:
-            time_condition = "AND timestamp <= %s"
-            params.append(end_time)
-        
-        query = f"""
-            SELECT vehicle_id, location_latitude, location_longitude, location_altitude,
-                   temperature_cabin, temperature_ambient, battery_voltage,
-                   tpms_front_left, tpms_front_right, tpms_rear_left, tpms_rear_right,
-                   accelerometer_x, accelerometer_y, accelerometer_z, fuel_level,
-                   engine_coolant_temp, transmission_oil_temp, timestamp
-            FROM periodic_data
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(query, params)
-        data = []
-        for row in cursor.fetchall():
-            data.append({
-                "vehicle_id": row[0],
-                "location_latitude": row[1],
-                "location_longitude": row[2],
-                "location_altitude": row[3],
-                "temperature_cabin": row[4],
-                "temperature_ambient": row[5],
-                "battery_voltage": row[6],
-                "tpms_front_left": row[7],
-                "tpms_front_right": row[8],
-                "tpms_rear_left": row[9],
-                "tpms_rear_right": row[10],
-                "accelerometer_x": row[11],
-                "accelerometer_y": row[12],
-                "accelerometer_z": row[13],
-                "fuel_level": row[14],
-                "engine_coolant_temp": row[15],
-                "transmission_oil_temp": row[16],
-                "timestamp": row[17].isoformat()
-            })
-        
-        return data
-        
+        if bucket:
+            return await get_periodic_buckets(vehicle_id, parse_bucket(bucket), start_time, end_time)
+        if format == "ndjson":
+            if limit or cursor:
+                raise ValueError("format=ndjson does not support limit/cursor")
+            return ndjson_response(await stream_rows("periodic_data", vehicle_id, start_time, end_time))
+        if format in ("columns", "arrow"):
+            if limit or cursor:
+                raise ValueError(f"format={format} does not support limit/cursor")
+            columns = await fetch_columns("periodic_data", vehicle_id, start_time, end_time)
+            if format == "arrow":
+                return arrow_response(vehicle_id, columns)
+            return columnar_json_response(vehicle_id, columns)
+        if limit or cursor:
+            return await fetch_page("periodic_data", vehicle_id, start_time, end_time, limit or DEFAULT_PAGE_SIZE, cursor)
+        return await fetch_periodic_data(vehicle_id, start_time, end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
+    except StreamBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch periodic data: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
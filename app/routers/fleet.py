@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..db import get_db
+from ..responses import FastJSONRoute
+from ..timescaledb_async import get_fleet_event_counts
+from ..vehicle_registry import vehicle_registry
+from .vehicles import DAILY_METRIC_FIELDS, DRIVING_HABIT_FIELDS, SCORE_DAILY_FIELDS
+
+router = APIRouter(prefix="/fleet", tags=["fleet"], route_class=FastJSONRoute)
+
+# 한 번에 조회할 수 있는 최대 차량 수
+FLEET_MAX_VEHICLES = 1000
+
+
+def _latest_rows(db: Session, model, date_column: str, fields: Sequence[str],
+                 vehicle_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """차량별 최신 행 하나씩을 ROW_NUMBER() 윈도 함수로 한 번에 조회 (MySQL 8)
+
+    fields는 vehicles 라우트와 같은 응답 필드 튜플이므로 id/created_at 같은 내부 컬럼은 나가지 않는다.
+    """
+    date_attr = getattr(model, date_column)
+    row_number = func.row_number().over(
+        partition_by=model.vehicle_id, order_by=date_attr.desc()
+    ).label("row_number")
+    ranked = (
+        db.query(model.vehicle_id, *(getattr(model, field) for field in fields), row_number)
+        .filter(model.vehicle_id.in_(vehicle_ids))
+        .subquery()
+    )
+    rows = (
+        db.query(ranked.c.vehicle_id, *(ranked.c[field] for field in fields))
+        .filter(ranked.c.row_number == 1)
+        .all()
+    )
+    return {row[0]: dict(zip(fields, row[1:])) for row in rows}
+
+
+async def _event_counts(vehicle_ids: List[str], start_time: Optional[str],
+                        end_time: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(차량별 이벤트 건수, 오류 메시지). TimescaleDB 장애 시 MySQL 결과는 살리고 건수만 None으로 대체
+
+    시간 파라미터 오류(ValueError)는 그대로 전달해 400으로 응답한다.
+    """
+    if not vehicle_ids:
+        return {}, None
+    try:
+        return await get_fleet_event_counts(vehicle_ids, start_time, end_time), None
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"Failed to fetch fleet event counts: {e}")
+        return None, f"Failed to fetch event counts: {str(e)}"
+
+
+def _load_fleet(db: Session, vehicle_ids: Optional[List[str]], offset: int, limit: int) -> Dict[str, Any]:
+    """차량 목록과 최신 일간 지표/점수/월간 습관을 테이블당 쿼리 하나로 조회"""
+    if vehicle_registry.loaded:
+        # 차량 목록은 메모리 레지스트리에서 (DB 조회 없음)
+        if vehicle_ids is not None:
+            vehicles = sorted(
+                (vehicle_registry.get(vid) for vid in vehicle_ids if vehicle_registry.get(vid)),
+                key=lambda vehicle: vehicle["vehicle_id"],
+            )
+            total = len(vehicles)
+        else:
+            total = vehicle_registry.count()
+            vehicles = vehicle_registry.vehicles()[offset:offset + limit]
+    else:
+        query = db.query(models.Vehicle.vehicle_id, models.Vehicle.model, models.Vehicle.year)
+        if vehicle_ids is not None:
+            query = query.filter(models.Vehicle.vehicle_id.in_(vehicle_ids))
+            rows = query.order_by(models.Vehicle.vehicle_id).all()
+            total = len(rows)
+        else:
+            total = db.query(func.count(models.Vehicle.vehicle_id)).scalar()
+            rows = query.order_by(models.Vehicle.vehicle_id).offset(offset).limit(limit).all()
+        vehicles = [dict(row._mapping) for row in rows]
+
+    found_ids = [vehicle["vehicle_id"] for vehicle in vehicles]
+    if not found_ids:
+        return {"total": total, "vehicles": [], "metrics": {}, "scores": {}, "habits": {}}
+
+    return {
+        "total": total,
+        "vehicles": vehicles,
+        "metrics": _latest_rows(db, models.DailyMetrics, "analysis_date", DAILY_METRIC_FIELDS, found_ids),
+        "scores": _latest_rows(db, models.VehicleScoreDaily, "analysis_date", SCORE_DAILY_FIELDS, found_ids),
+        "habits": _latest_rows(db, models.DrivingHabitMonthly, "analysis_month", DRIVING_HABIT_FIELDS, found_ids),
+    }
+
+
+async def _fleet_overview(
+    db: Session,
+    vehicle_ids: Optional[List[str]],
+    offset: int,
+    limit: int,
+    start_time: Optional[str],
+    end_time: Optional[str],
+) -> Dict[str, Any]:
+    if vehicle_ids is not None:
+        # 순서를 유지하며 중복 제거
+        vehicle_ids = list(dict.fromkeys(vid.strip() for vid in vehicle_ids if vid.strip()))
+        if not vehicle_ids:
+            raise HTTPException(status_code=400, detail="vehicle_ids must not be empty")
+        if len(vehicle_ids) > FLEET_MAX_VEHICLES:
+            raise HTTPException(status_code=400, detail=f"At most {FLEET_MAX_VEHICLES} vehicle_ids per request")
+
+    try:
+        if vehicle_ids is not None:
+            # 요청 ID를 알고 있으므로 MySQL 조회와 이벤트 집계를 동시에 실행
+            fleet, (event_counts, event_counts_error) = await asyncio.gather(
+                run_in_threadpool(_load_fleet, db, vehicle_ids, offset, limit),
+                _event_counts(vehicle_ids, start_time, end_time),
+            )
+        else:
+            fleet = await run_in_threadpool(_load_fleet, db, vehicle_ids, offset, limit)
+            page_ids = [vehicle["vehicle_id"] for vehicle in fleet["vehicles"]]
+            event_counts, event_counts_error = await _event_counts(page_ids, start_time, end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid time range: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch fleet overview: {str(e)}")
+
+    items = [
+        {
+            **vehicle,
+            "latest_metrics": fleet["metrics"].get(vehicle["vehicle_id"]),
+            "latest_score": fleet["scores"].get(vehicle["vehicle_id"]),
+            "latest_habit": fleet["habits"].get(vehicle["vehicle_id"]),
+            "event_counts": event_counts.get(vehicle["vehicle_id"]) if event_counts is not None else None,
+        }
+        for vehicle in fleet["vehicles"]
+    ]
+    response = {"total": fleet["total"], "vehicles": items}
+    if event_counts_error:
+        response["event_counts_error"] = event_counts_error
+    if vehicle_ids is not None:
+        found = {vehicle["vehicle_id"] for vehicle in fleet["vehicles"]}
+        response["missing"] = [vid for vid in vehicle_ids if vid not in found]
+    else:
+        response["offset"] = offset
+        response["limit"] = limit
+    return response
+
+
+@router.get("/overview", response_model=Dict[str, Any])
+async def get_fleet_overview(
+    vehicle_ids: str = Query(None, description="쉼표로 구분한 차량 ID 목록. 생략하면 offset/limit 페이지 단위로 전체 차량 조회"),
+    offset: int = Query(0, ge=0, description="차량 목록 페이지 시작 위치 (vehicle_id 순)"),
+    limit: int = Query(100, ge=1, le=FLEET_MAX_VEHICLES, description="차량 목록 페이지 크기"),
+    start_time: str = Query(None, description="이벤트 집계 시작 시간 (ISO 8601 format)"),
+    end_time: str = Query(None, description="이벤트 집계 종료 시간 (ISO 8601 format)"),
+    db: Session = Depends(get_db),
+):
+    """여러 차량의 최신 지표, 점수, 운전 습관, 이벤트 건수를 한 번에 조회
+
+    차량 수와 관계없이 MySQL 쿼리 3~5개와 TimescaleDB 쿼리 1개로 처리한다.
+    """
+    ids = vehicle_ids.split(",") if vehicle_ids is not None else None
+    return await _fleet_overview(db, ids, offset, limit, start_time, end_time)
+
+
+@router.post("/overview", response_model=Dict[str, Any])
+async def post_fleet_overview(
+    vehicle_ids: List[str] = Body(..., embed=True, description="조회할 차량 ID 목록"),
+    start_time: Optional[str] = Body(None, embed=True, description="이벤트 집계 시작 시간 (ISO 8601 format)"),
+    end_time: Optional[str] = Body(None, embed=True, description="이벤트 집계 종료 시간 (ISO 8601 format)"),
+    db: Session = Depends(get_db),
+):
+    """URL에 담기 어려운 긴 차량 ID 목록용 POST 버전"""
+    return await _fleet_overview(db, vehicle_ids, 0, len(vehicle_ids), start_time, end_time)
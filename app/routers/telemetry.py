@@ -1,15 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Dict, Any, Union
 from datetime import datetime
-from ..timescaledb import get_telemetry_data
+from ..downsampling import parse_bucket
+from ..responses import FastJSONRoute
+from ..timescaledb_async import (
+    get_telemetry_data,
+    get_telemetry_buckets,
+    get_telemetry_lttb,
+    get_telemetry_summary as fetch_telemetry_summary,
+    fetch_page,
+    fetch_columns,
+    stream_rows,
+    StreamBusyError,
+)
+from ..vehicle_registry import require_known_vehicle_async
+from ..columnar import (
+    arrow_response,
+    columnar_json_response,
+    negotiate_format,
+    vary_on_accept,
+    COLUMNAR_FORMAT_DESCRIPTION,
+)
+from ..streaming import (
+    ndjson_response,
+    DEFAULT_PAGE_SIZE,
+    LIMIT_DESCRIPTION,
+    CURSOR_DESCRIPTION,
+)
 
-router = APIRouter(prefix="/telemetry", tags=["telemetry"])
+router = APIRouter(
+    prefix="/telemetry",
+    tags=["telemetry"],
+    dependencies=[Depends(require_known_vehicle_async)],
+    route_class=FastJSONRoute,
+)
 
-@router.get("/{vehicle_id}", response_model=List[Dict[str, Any]])
+@router.get("/{vehicle_id}", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+@vary_on_accept
 async def get_vehicle_telemetry(
     vehicle_id: str,
+    request: Request,
     start_time: str = Query(None, description="시작 시간 (ISO 8601 format)"),
-    end_time: str = Query(None, description="종료 시간 (ISO 8601 format)")
+    end_time: str = Query(None, description="종료 시간 (ISO 8601 format)"),
+    bucket: str = Query(None, description="다운샘플링 버킷 크기 (예: 30s, 5m, 1h)"),
+    max_points: int = Query(None, ge=3, le=100000, description="반환할 최대 포인트 수"),
+    mode: str = Query("bucket", pattern="^(bucket|lttb)$", description="다운샘플링 방식 (bucket | lttb)"),
+    limit: int = Query(None, ge=1, le=10000, description=LIMIT_DESCRIPTION),
+    cursor: str = Query(None, description=CURSOR_DESCRIPTION),
+    format: str = Query("json", pattern="^(json|ndjson|columns|arrow)$", description=COLUMNAR_FORMAT_DESCRIPTION)
 ):
     """
     특정 차량의 텔레메트리 데이터 조회 (TimescaleDB)
@@ -17,16 +55,59 @@ async def get_vehicle_telemetry(
     - **vehicle_id**: 차량 ID (예: VHC-001)
     - **start_time**: 시작 시간 (선택, 예: 2024-10-20T11:00:00)
     - **end_time**: 종료 시간 (선택, 예: 2024-10-20T12:00:00)
+    - **bucket**: 버킷 크기 (선택). 지정하면 time_bucket으로 버킷별 avg/min/max 반환
+    - **max_points**: 최대 포인트 수 (선택). bucket 모드에서는 버킷 수 상한,
+      lttb 모드에서는 속도 곡선의 형태를 보존하도록 고른 원본 행 수
+    - **mode**: bucket(기본) 또는 lttb
+    
+    bucket과 max_points를 모두 생략하면 1초 단위 원본 데이터를 그대로 반환하며,
+    이때 limit/cursor로 페이지 단위 조회, format=ndjson으로 스트리밍 조회 가능
+    format=columns(또는 arrow, Accept: application/vnd.apache.arrow.stream)이면 행 대신
+    컬럼별 배열로 반환하며 timestamp는 epoch 밀리초
+    (limit/cursor/format은 원본 조회 전용이라 bucket/max_points/lttb와 함께 쓰면 400)
     
     반환: 시계열 텔레메트리 데이터 리스트
     - vehicle_speed: 차량 속도 (km/h)
     - engine_rpm: 엔진 회전수 (RPM)
     - throttle_position: 스로틀 위치 (%)
-    - timestamp: 타임스탬프
+    - timestamp: 타임스탬프 (bucket 모드에서는 버킷 시작 시각)
+    - sample_count, *_min, *_max: bucket 모드에서만 포함
     """
+    downsampled = bool(bucket or max_points or mode == "lttb")
+    if downsampled and (limit or cursor or format != "json"):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid query parameters: limit/cursor/format cannot be combined with bucket/max_points/mode=lttb"
+        )
+    format = negotiate_format(format, request.headers.get("accept"), downsampled=downsampled)
     try:
-        telemetry = get_telemetry_data(vehicle_id, start_time, end_time)
+        if mode == "lttb":
+            if not max_points:
+                raise ValueError("mode=lttb requires max_points")
+            return await get_telemetry_lttb(vehicle_id, max_points, start_time, end_time)
+        if bucket or max_points:
+            return await get_telemetry_buckets(
+                vehicle_id, parse_bucket(bucket) if bucket else None, max_points, start_time, end_time
+            )
+        if format == "ndjson":
+            if limit or cursor:
+                raise ValueError("format=ndjson does not support limit/cursor")
+            return ndjson_response(await stream_rows("vehicle_telemetry", vehicle_id, start_time, end_time))
+        if format in ("columns", "arrow"):
+            if limit or cursor:
+                raise ValueError(f"format={format} does not support limit/cursor")
+            columns = await fetch_columns("vehicle_telemetry", vehicle_id, start_time, end_time)
+            if format == "arrow":
+                return arrow_response(vehicle_id, columns)
+            return columnar_json_response(vehicle_id, columns)
+        if limit or cursor:
+            return await fetch_page("vehicle_telemetry", vehicle_id, start_time, end_time, limit or DEFAULT_PAGE_SIZE, cursor)
+        telemetry = await get_telemetry_data(vehicle_id, start_time, end_time)
         return telemetry
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
+    except StreamBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch telemetry data: {str(e)}")
 
@@ -34,10 +115,12 @@ async def get_vehicle_telemetry(
 async def get_telemetry_summary(
     vehicle_id: str,
     start_time: str = Query(None, description="시작 시간"),
-    end_time: str = Query(None, description="종료 시간")
+    end_time: str = Query(None, description="종료 시간"),
+    group_by: str = Query(None, pattern="^(hour|day)$", description="구간별 집계 단위 (hour | day)"),
+    percentiles: str = Query(None, description="백분위수 목록 (예: 50,95,99)")
 ):
     """
-    특정 차량의 텔레메트리 데이터 요약 통계
+    특정 차량의 텔레메트리 데이터 요약 통계 (DB에서 집계)
     
     반환: 통계 정보
     - count: 총 데이터 포인트 수
@@ -45,32 +128,23 @@ async def get_telemetry_summary(
     - max_speed: 최고 속도
     - min_speed: 최저 속도
     - avg_rpm: 평균 RPM
+    - p{N}_speed, p{N}_rpm: percentiles 지정 시 백분위수
+    
+    group_by 지정 시: {"vehicle_id", "group_by", "buckets": [구간별 통계 + timestamp]}
     """
     try:
-        telemetry = get_telemetry_data(vehicle_id, start_time, end_time)
-        
-        if not telemetry:
-            return {
-                "count": 0,
-                "avg_speed": 0,
-                "max_speed": 0,
-                "min_speed": 0,
-                "avg_rpm": 0,
-                "max_rpm": 0,
-                "min_rpm": 0
-            }
-        
-        speeds = [d['vehicle_speed'] for d in telemetry]
-        rpms = [d['engine_rpm'] for d in telemetry]
-        
-        return {
-            "count": len(telemetry),
-            "avg_speed": round(sum(speeds) / len(speeds), 2),
-            "max_speed": max(speeds),
-            "min_speed": min(speeds),
-            "avg_rpm": round(sum(rpms) / len(rpms), 2),
-            "max_rpm": max(rpms),
-            "min_rpm": min(rpms)
-        }
+        percentile_values = None
+        if percentiles:
+            percentile_values = [float(p) for p in percentiles.split(",")]
+            if any(not 0 < p < 100 for p in percentile_values):
+                raise ValueError("percentiles must be between 0 and 100")
+
+        summaries = await fetch_telemetry_summary(vehicle_id, start_time, end_time, group_by, percentile_values)
+
+        if group_by:
+            return {"vehicle_id": vehicle_id, "group_by": group_by, "buckets": summaries}
+        return summaries[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate summary: {str(e)}")
@@ -1,200 +1,171 @@
+import os
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..db import get_db
+from ..cache import cached_response
+from ..conditional import conditional_get
+from ..config import settings
+from ..db import async_db_endpoint, get_db
+from ..responses import FastJSONRoute
+from ..vehicle_registry import require_known_vehicle, require_known_vehicle_async, vehicle_registry
 
 
-router = APIRouter(prefix="/vehicles", tags=["vehicles"])
+router = APIRouter(prefix="/vehicles", tags=["vehicles"], route_class=FastJSONRoute)
 
+# 등록되지 않은 vehicle_id는 DB 조회 없이 404
+known_vehicle = Depends(require_known_vehicle_async if settings.db_async_mode else require_known_vehicle)
+# ETag/Last-Modified 검증 의존성 (일치하면 304)
+score_validators = Depends(conditional_get(models.VehicleScoreDaily, "analysis_date"))
+habit_validators = Depends(conditional_get(models.DrivingHabitMonthly, "analysis_month"))
 
-@router.get("/", response_model=List[Dict[str, Any]])
+# 라우트별 응답 캐시 TTL (초). 점수/습관 테이블은 일/월 단위 배치로만 갱신됨
+SCORE_CACHE_TTL = int(os.getenv("SCORE_CACHE_TTL", "3600"))
+HABIT_CACHE_TTL = int(os.getenv("HABIT_CACHE_TTL", "21600"))
+
+# 응답 필드 (schemas 정의 순서). ORM 객체 대신 이 컬럼만 튜플로 조회해 바로 dict로 만든다
+DAILY_METRIC_FIELDS = tuple(schemas.DailyMetric.model_fields)
+SCORE_DAILY_FIELDS = tuple(schemas.VehicleScoreDailyItem.model_fields)
+SCORE_HISTORY_FIELDS = tuple(schemas.VehicleScoreHistoryItem.model_fields)
+DRIVING_HABIT_FIELDS = tuple(schemas.DrivingHabitMonthlyItem.model_fields)
+HABIT_MONTHLY_FIELDS = (
+    "vehicle_id", "analysis_month", "acceleration_events", "deceleration_events",
+    "lane_departure_events", "night_drive_ratio", "avg_drive_duration_minutes",
+    "avg_speed", "avg_distance", "created_at",
+)
+# score/{analysis_date} 응답의 scores / metrics 구분
+SCORE_FIELDS = SCORE_HISTORY_FIELDS[1:]
+SCORE_METRIC_FIELDS = tuple(f for f in SCORE_DAILY_FIELDS[1:] if f not in SCORE_FIELDS)
+
+
+def _columns(model, fields) -> List[Any]:
+    return [getattr(model, field) for field in fields]
+
+
+def _record(fields, values) -> Dict[str, Any]:
+    """조회한 컬럼 튜플을 dict로 변환 (날짜는 render_json이 ISO 문자열로 직렬화)"""
+    return dict(zip(fields, values))
+
+
+def _vehicle_join(model, *conditions):
+    """vehicles 기준 LEFT JOIN 조건: 행이 하나도 없으면 차량이 없는 것 (존재 확인 쿼리 생략)"""
+    return model, and_(model.vehicle_id == models.Vehicle.vehicle_id, *conditions)
+
+
+@router.get("/", response_model=None)
+@async_db_endpoint
 def list_vehicles(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
-    vehicles = db.query(models.Vehicle).order_by(models.Vehicle.vehicle_id).all()
-    return [
-        {"vehicle_id": v.vehicle_id, "model": v.model, "year": v.year}
-        for v in vehicles
-    ]
+    # 차량 레지스트리가 적재되어 있으면 DB를 조회하지 않음
+    if vehicle_registry.loaded:
+        return vehicle_registry.vehicles()
+    rows = (
+        db.query(models.Vehicle.vehicle_id, models.Vehicle.model, models.Vehicle.year)
+        .order_by(models.Vehicle.vehicle_id)
+        .all()
+    )
+    return [{"vehicle_id": vehicle_id, "model": model, "year": year} for vehicle_id, model, year in rows]
 
 
-@router.get("/summary", response_model=Dict[str, int])
+@router.get("/summary", response_model=None)
+@async_db_endpoint
 def vehicles_summary(db: Session = Depends(get_db)) -> Dict[str, int]:
-    total = db.query(models.Vehicle).count()
+    if vehicle_registry.loaded:
+        return {"total_vehicles": vehicle_registry.count()}
+    total = db.query(func.count(models.Vehicle.vehicle_id)).scalar()
     return {"total_vehicles": total}
 
 
-@router.get("/{vehicle_id}")
+@router.get("/{vehicle_id}", response_model=None, dependencies=[known_vehicle])
+@async_db_endpoint
 def get_vehicle_detail(vehicle_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
-    vehicle = (
-        db.query(models.Vehicle)
+    rows = (
+        db.query(
+            models.Vehicle.model,
+            models.Vehicle.year,
+            *_columns(models.DailyMetrics, DAILY_METRIC_FIELDS),
+        )
+        .outerjoin(*_vehicle_join(models.DailyMetrics))
         .filter(models.Vehicle.vehicle_id == vehicle_id)
-        .first()
-    )
-
-    if not vehicle:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-
-    recent_metrics = (
-        db.query(models.DailyMetrics)
-        .filter(models.DailyMetrics.vehicle_id == vehicle_id)
         .order_by(models.DailyMetrics.analysis_date.desc())
         .limit(30)
         .all()
     )
 
-    latest_metric = recent_metrics[0] if recent_metrics else None
-
-    def serialize_metric(metric: Optional[models.DailyMetrics]) -> Optional[schemas.DailyMetric]:
-        if not metric:
-            return None
-        return schemas.DailyMetric(
-            analysis_date=metric.analysis_date,
-            total_distance=metric.total_distance,
-            average_speed=metric.average_speed,
-            fuel_efficiency=metric.fuel_efficiency,
-        )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
 
-    recent_serialized = [
-        schemas.DailyMetric(
-            analysis_date=metric.analysis_date,
-            total_distance=metric.total_distance,
-            average_speed=metric.average_speed,
-            fuel_efficiency=metric.fuel_efficiency,
-        )
-        for metric in recent_metrics
-    ]
-
-    response = schemas.VehicleDetailResponse(
-        vehicle_id=vehicle.vehicle_id,
-        model=vehicle.model,
-        year=vehicle.year,
-        latest_metrics=serialize_metric(latest_metric),
-        recent_metrics=recent_serialized,
-    )
+    model, year = rows[0][0], rows[0][1]
+    recent_metrics = [_record(DAILY_METRIC_FIELDS, row[2:]) for row in rows if row[2] is not None]
 
     return {
-        "vehicle_id": response.vehicle_id,
-        "model": response.model,
-        "year": response.year,
-        "latest_metrics": response.latest_metrics.dict() if response.latest_metrics else None,
-        "recent_metrics": [metric.dict() for metric in response.recent_metrics],
+        "vehicle_id": vehicle_id,
+        "model": model,
+        "year": year,
+        "latest_metrics": recent_metrics[0] if recent_metrics else None,
+        "recent_metrics": recent_metrics,
     }
 
 
-@router.get("/{vehicle_id}/scores")
+@router.get("/{vehicle_id}/scores", response_model=None, dependencies=[known_vehicle, score_validators])
+@async_db_endpoint
+@cached_response("vehicle_scores", SCORE_CACHE_TTL, tables=("vehicles", "vehicle_score_daily"))
 def get_vehicle_scores(vehicle_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
-    vehicle = (
-        db.query(models.Vehicle)
+    rows = (
+        db.query(*_columns(models.VehicleScoreDaily, SCORE_DAILY_FIELDS))
+        .select_from(models.Vehicle)
+        .outerjoin(*_vehicle_join(models.VehicleScoreDaily))
         .filter(models.Vehicle.vehicle_id == vehicle_id)
-        .first()
-    )
-    if not vehicle:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-
-    scores = (
-        db.query(models.VehicleScoreDaily)
-        .filter(models.VehicleScoreDaily.vehicle_id == vehicle_id)
         .order_by(models.VehicleScoreDaily.analysis_date.desc())
         .all()
     )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
 
     return {
         "vehicle_id": vehicle_id,
-        "records": [
-            schemas.VehicleScoreDailyItem(
-                analysis_date=score.analysis_date,
-                final_score=score.final_score,
-                engine_powertrain_score=score.engine_powertrain_score,
-                transmission_drivetrain_score=score.transmission_drivetrain_score,
-                brake_suspension_score=score.brake_suspension_score,
-                adas_safety_score=score.adas_safety_score,
-                electrical_battery_score=score.electrical_battery_score,
-                other_score=score.other_score,
-                engine_rpm_avg=score.engine_rpm_avg,
-                engine_coolant_temp_avg=score.engine_coolant_temp_avg,
-                transmission_oil_temp_avg=score.transmission_oil_temp_avg,
-                battery_voltage_avg=score.battery_voltage_avg,
-                alternator_output_avg=score.alternator_output_avg,
-                temperature_ambient_avg=score.temperature_ambient_avg,
-                dtc_count=score.dtc_count,
-                gear_change_count=score.gear_change_count,
-                abs_activation_count=score.abs_activation_count,
-                suspension_shock_count=score.suspension_shock_count,
-                adas_sensor_fault_count=score.adas_sensor_fault_count,
-                aeb_activation_count=score.aeb_activation_count,
-                engine_start_count=score.engine_start_count,
-                suddenacc_count=score.suddenacc_count,
-            ).dict()
-            for score in scores
-        ],
+        "records": [_record(SCORE_DAILY_FIELDS, row) for row in rows if row[0] is not None],
     }
 
 
-@router.get("/{vehicle_id}/score/{analysis_date}")
+@router.get("/{vehicle_id}/score/{analysis_date}", response_model=None, dependencies=[known_vehicle])
+@async_db_endpoint
 def get_vehicle_score_by_date(vehicle_id: str, analysis_date: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
     """특정 날짜의 차량 점수 데이터 조회"""
-    vehicle = (
-        db.query(models.Vehicle)
-        .filter(models.Vehicle.vehicle_id == vehicle_id)
-        .first()
-    )
-    if not vehicle:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-
     # 날짜 문자열을 date 객체로 변환
-    from datetime import datetime
     try:
         date_obj = datetime.strptime(analysis_date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-    score = (
-        db.query(models.VehicleScoreDaily)
-        .filter(
-            models.VehicleScoreDaily.vehicle_id == vehicle_id,
-            models.VehicleScoreDaily.analysis_date == date_obj
-        )
+    row = (
+        db.query(*_columns(models.VehicleScoreDaily, SCORE_DAILY_FIELDS))
+        .select_from(models.Vehicle)
+        .outerjoin(*_vehicle_join(models.VehicleScoreDaily, models.VehicleScoreDaily.analysis_date == date_obj))
+        .filter(models.Vehicle.vehicle_id == vehicle_id)
         .first()
     )
 
-    if not score:
+    if row is None:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    if row[0] is None:
         raise HTTPException(status_code=404, detail=f"No score data found for {analysis_date}")
 
+    score = _record(SCORE_DAILY_FIELDS, row)
     return {
         "vehicle_id": vehicle_id,
         "analysis_date": analysis_date,
-        "scores": {
-            "final_score": score.final_score,
-            "engine_powertrain_score": score.engine_powertrain_score,
-            "transmission_drivetrain_score": score.transmission_drivetrain_score,
-            "brake_suspension_score": score.brake_suspension_score,
-            "adas_safety_score": score.adas_safety_score,
-            "electrical_battery_score": score.electrical_battery_score,
-            "other_score": score.other_score,
-        },
-        "metrics": {
-            "engine_rpm_avg": score.engine_rpm_avg,
-            "engine_coolant_temp_avg": score.engine_coolant_temp_avg,
-            "transmission_oil_temp_avg": score.transmission_oil_temp_avg,
-            "battery_voltage_avg": score.battery_voltage_avg,
-            "alternator_output_avg": score.alternator_output_avg,
-            "temperature_ambient_avg": score.temperature_ambient_avg,
-            "dtc_count": score.dtc_count,
-            "gear_change_count": score.gear_change_count,
-            "abs_activation_count": score.abs_activation_count,
-            "suspension_shock_count": score.suspension_shock_count,
-            "adas_sensor_fault_count": score.adas_sensor_fault_count,
-            "aeb_activation_count": score.aeb_activation_count,
-            "engine_start_count": score.engine_start_count,
-            "suddenacc_count": score.suddenacc_count,
-        }
+        "scores": {field: score[field] for field in SCORE_FIELDS},
+        "metrics": {field: score[field] for field in SCORE_METRIC_FIELDS},
     }
 
 
-@router.get("/{vehicle_id}/score-history")
+@router.get("/{vehicle_id}/score-history", response_model=None, dependencies=[known_vehicle, score_validators])
+@async_db_endpoint
+@cached_response("vehicle_score_history", SCORE_CACHE_TTL, tables=("vehicles", "vehicle_score_daily"))
 def get_vehicle_score_history(
     vehicle_id: str,
     days: int = 14,
@@ -206,13 +177,17 @@ def get_vehicle_score_history(
     if days <= 0:
         raise HTTPException(status_code=400, detail="days must be greater than 0")
 
+    # 차량 존재 여부와 최신 점수 날짜를 한 번에 조회
     vehicle = (
-        db.query(models.Vehicle)
+        db.query(models.Vehicle.vehicle_id, func.max(models.VehicleScoreDaily.analysis_date))
+        .outerjoin(*_vehicle_join(models.VehicleScoreDaily))
         .filter(models.Vehicle.vehicle_id == vehicle_id)
+        .group_by(models.Vehicle.vehicle_id)
         .first()
     )
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
+    latest_date = vehicle[1]
 
     def parse_date(value: Optional[str]) -> Optional[date]:
         if value is None:
@@ -225,10 +200,7 @@ def get_vehicle_score_history(
     start_dt = parse_date(start_date)
     end_dt = parse_date(end_date)
 
-    base_query = db.query(models.VehicleScoreDaily).filter(models.VehicleScoreDaily.vehicle_id == vehicle_id)
-
-    latest_score = base_query.order_by(models.VehicleScoreDaily.analysis_date.desc()).first()
-    if not latest_score:
+    if latest_date is None:
         return {
             "vehicle_id": vehicle_id,
             "start_date": start_dt.isoformat() if start_dt else None,
@@ -240,154 +212,104 @@ def get_vehicle_score_history(
         raise HTTPException(status_code=400, detail="start_date must be before or equal to end_date")
 
     if not start_dt and not end_dt:
-        end_dt = latest_score.analysis_date
+        end_dt = latest_date
         start_dt = end_dt - timedelta(days=days - 1)
     elif start_dt and not end_dt:
         end_dt = start_dt + timedelta(days=days - 1)
     elif end_dt and not start_dt:
         start_dt = end_dt - timedelta(days=days - 1)
 
-    history_query = db.query(models.VehicleScoreDaily).filter(
-        models.VehicleScoreDaily.vehicle_id == vehicle_id,
-        models.VehicleScoreDaily.analysis_date >= start_dt,
-        models.VehicleScoreDaily.analysis_date <= end_dt,
+    rows = (
+        db.query(*_columns(models.VehicleScoreDaily, SCORE_HISTORY_FIELDS))
+        .filter(
+            models.VehicleScoreDaily.vehicle_id == vehicle_id,
+            models.VehicleScoreDaily.analysis_date >= start_dt,
+            models.VehicleScoreDaily.analysis_date <= end_dt,
+        )
+        .order_by(models.VehicleScoreDaily.analysis_date.asc())
+        .all()
     )
 
-    scores = history_query.order_by(models.VehicleScoreDaily.analysis_date.asc()).all()
-
-    records = [
-        schemas.VehicleScoreHistoryItem(
-            analysis_date=score.analysis_date,
-            final_score=score.final_score,
-            engine_powertrain_score=score.engine_powertrain_score,
-            transmission_drivetrain_score=score.transmission_drivetrain_score,
-            brake_suspension_score=score.brake_suspension_score,
-            adas_safety_score=score.adas_safety_score,
-            electrical_battery_score=score.electrical_battery_score,
-            other_score=score.other_score,
-        ).dict()
-        for score in scores
-    ]
-
     return {
         "vehicle_id": vehicle_id,
         "start_date": start_dt.isoformat() if start_dt else None,
         "end_date": end_dt.isoformat() if end_dt else None,
-        "records": records,
+        "records": [_record(SCORE_HISTORY_FIELDS, row) for row in rows],
     }
 
 
-@router.get("/{vehicle_id}/driving-habits")
+@router.get("/{vehicle_id}/driving-habits", response_model=None, dependencies=[known_vehicle, habit_validators])
+@async_db_endpoint
+@cached_response("driving_habits", HABIT_CACHE_TTL, tables=("vehicles", "driving_habit_monthly"))
 def get_driving_habits(vehicle_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
-    vehicle = (
-        db.query(models.Vehicle)
+    rows = (
+        db.query(*_columns(models.DrivingHabitMonthly, DRIVING_HABIT_FIELDS))
+        .select_from(models.Vehicle)
+        .outerjoin(*_vehicle_join(models.DrivingHabitMonthly))
         .filter(models.Vehicle.vehicle_id == vehicle_id)
-        .first()
-    )
-    if not vehicle:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-
-    habits = (
-        db.query(models.DrivingHabitMonthly)
-        .filter(models.DrivingHabitMonthly.vehicle_id == vehicle_id)
         .order_by(models.DrivingHabitMonthly.analysis_month.desc())
         .all()
     )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
 
-    records = [
-        schemas.DrivingHabitMonthlyItem(
-            analysis_month=habit.analysis_month,
-            acceleration_events=habit.acceleration_events,
-            lane_departure_events=habit.lane_departure_events,
-            night_drive_ratio=habit.night_drive_ratio,
-            avg_drive_duration_minutes=habit.avg_drive_duration_minutes,
-            avg_speed=habit.avg_speed,
-            avg_distance=habit.avg_distance,
-        )
-        for habit in habits
-    ]
+    records = [_record(DRIVING_HABIT_FIELDS, row) for row in rows if row[0] is not None]
 
     latest = records[0] if records else None
     previous = records[1] if len(records) > 1 else None
 
-    def to_dict(item: Optional[schemas.DrivingHabitMonthlyItem]) -> Optional[Dict[str, Any]]:
-        return item.dict() if item else None
-
     def diff(
-        latest_item: Optional[schemas.DrivingHabitMonthlyItem],
-        previous_item: Optional[schemas.DrivingHabitMonthlyItem],
+        latest_item: Optional[Dict[str, Any]],
+        previous_item: Optional[Dict[str, Any]],
     ) -> Optional[Dict[str, Optional[float]]]:
         if not latest_item or not previous_item:
             return None
         return {
-            "acceleration_events": (latest_item.acceleration_events or 0) - (previous_item.acceleration_events or 0),
-            "lane_departure_events": (latest_item.lane_departure_events or 0) - (previous_item.lane_departure_events or 0),
-            "night_drive_ratio": (latest_item.night_drive_ratio or 0.0) - (previous_item.night_drive_ratio or 0.0),
-            "avg_drive_duration_minutes": (latest_item.avg_drive_duration_minutes or 0.0) - (previous_item.avg_drive_duration_minutes or 0.0),
-            "avg_speed": (latest_item.avg_speed or 0.0) - (previous_item.avg_speed or 0.0),
-            "avg_distance": (latest_item.avg_distance or 0.0) - (previous_item.avg_distance or 0.0),
+            "acceleration_events": (latest_item["acceleration_events"] or 0) - (previous_item["acceleration_events"] or 0),
+            "lane_departure_events": (latest_item["lane_departure_events"] or 0) - (previous_item["lane_departure_events"] or 0),
+            "night_drive_ratio": (latest_item["night_drive_ratio"] or 0.0) - (previous_item["night_drive_ratio"] or 0.0),
+            "avg_drive_duration_minutes": (latest_item["avg_drive_duration_minutes"] or 0.0) - (previous_item["avg_drive_duration_minutes"] or 0.0),
+            "avg_speed": (latest_item["avg_speed"] or 0.0) - (previous_item["avg_speed"] or 0.0),
+            "avg_distance": (latest_item["avg_distance"] or 0.0) - (previous_item["avg_distance"] or 0.0),
         }
 
     return {
         "vehicle_id": vehicle_id,
-        "latest": to_dict(latest),
-        "previous": to_dict(previous),
+        "latest": latest,
+        "previous": previous,
         "delta": diff(latest, previous),
-        "history": [item.dict() for item in records],
+        "history": records,
     }
 
 
-@router.get("/{vehicle_id}/habit-monthly")
+@router.get("/{vehicle_id}/habit-monthly", response_model=None, dependencies=[known_vehicle])
+@async_db_endpoint
+@cached_response("vehicle_habit_monthly", HABIT_CACHE_TTL, tables=("vehicles", "driving_habit_monthly"))
 def get_vehicle_habit_monthly(
     vehicle_id: str,
     month: Optional[str] = None,
     db: Session = Depends(get_db),
 ) -> List[Dict[str, Any]]:
     """차량의 월별 운전 습관 데이터 조회"""
-    vehicle = (
-        db.query(models.Vehicle)
-        .filter(models.Vehicle.vehicle_id == vehicle_id)
-        .first()
-    )
-    if not vehicle:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-
-    query = (
-        db.query(models.DrivingHabitMonthly)
-        .filter(models.DrivingHabitMonthly.vehicle_id == vehicle_id)
-    )
-
+    conditions = []
     if month:
         # 월 필터링 (YYYY-MM 형식) - LIKE 연산자 사용
-        try:
-            # 2025-09 -> 2025-09% 패턴으로 검색
-            month_pattern = f"{month}%"
-            query = query.filter(models.DrivingHabitMonthly.analysis_month.like(month_pattern))
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+        # 2025-09 -> 2025-09% 패턴으로 검색
+        conditions.append(models.DrivingHabitMonthly.analysis_month.like(f"{month}%"))
 
-    records = query.order_by(models.DrivingHabitMonthly.analysis_month.desc()).all()
+    rows = (
+        db.query(*_columns(models.DrivingHabitMonthly, HABIT_MONTHLY_FIELDS))
+        .select_from(models.Vehicle)
+        .outerjoin(*_vehicle_join(models.DrivingHabitMonthly, *conditions))
+        .filter(models.Vehicle.vehicle_id == vehicle_id)
+        .order_by(models.DrivingHabitMonthly.analysis_month.desc())
+        .all()
+    )
 
-    if not records:
+    if not rows:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    if rows[0][0] is None:
         raise HTTPException(status_code=404, detail=f"No habit data found for vehicle {vehicle_id}")
 
     # 월별 데이터만 반환 (추가 계산 없음)
-    result = [
-        {
-            "vehicle_id": record.vehicle_id,
-            "analysis_month": record.analysis_month.isoformat(),
-            "acceleration_events": record.acceleration_events,
-            "deceleration_events": record.deceleration_events,
-            "lane_departure_events": record.lane_departure_events,
-            "night_drive_ratio": record.night_drive_ratio,
-            "avg_drive_duration_minutes": record.avg_drive_duration_minutes,
-            "avg_speed": record.avg_speed,
-            "avg_distance": record.avg_distance,
-            "created_at": record.created_at.isoformat() if record.created_at else None,
-        }
-        for record in records
-    ]
-    
-    return result
-
-    # cd test !!!!
+    return [_record(HABIT_MONTHLY_FIELDS, row) for row in rows]
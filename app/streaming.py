@@ -0,0 +1,34 @@
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.responses import StreamingResponse
+
+from .responses import render_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# limit 없이 cursor만 넘어온 경우의 페이지 크기
+DEFAULT_PAGE_SIZE = 1000
+
+# 원본 시계열 엔드포인트 공통 파라미터 설명
+LIMIT_DESCRIPTION = "페이지 크기. 지정하면 {items, next_cursor} 형태로 (timestamp, id) 키셋 페이지네이션"
+CURSOR_DESCRIPTION = "이전 응답의 next_cursor"
+FORMAT_DESCRIPTION = "json(기본) 또는 ndjson (서버 측 커서로 한 줄에 한 행씩 스트리밍)"
+
+# 한 번에 전송할 줄 수 (행마다 전송하면 ASGI send 호출이 너무 많아짐)
+NDJSON_CHUNK_ROWS = 500
+
+
+def ndjson_response(rows: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """행 이터레이터를 한 줄에 JSON 객체 하나씩(NDJSON) 내보내는 스트리밍 응답"""
+
+    async def lines():
+        chunk = []
+        async for row in rows:
+            chunk.append(render_json(row))
+            if len(chunk) >= NDJSON_CHUNK_ROWS:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
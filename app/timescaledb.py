@@ -1,8 +1,15 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
+from .metrics import record_query
+import csv
+import io
+import itertools
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterable, Sequence
 from datetime import datetime
 
 load_dotenv()
@@ -14,21 +21,334 @@ TIMESCALEDB_DB = os.getenv("TIMESCALEDB_DB", "alcha_events")
 TIMESCALEDB_USER = os.getenv("TIMESCALEDB_USER", "alcha")
 TIMESCALEDB_PASSWORD = os.getenv("TIMESCALEDB_PASSWORD", "alcha_password")
 
-def get_timescaledb_connection():
-    """TimescaleDB 연결 반환"""
-    try:
-        conn = psycopg2.connect(
+# 커넥션 풀 설정
+TIMESCALEDB_POOL_MIN_SIZE = int(os.getenv("TIMESCALEDB_POOL_MIN_SIZE", "1"))
+TIMESCALEDB_POOL_MAX_SIZE = int(os.getenv("TIMESCALEDB_POOL_MAX_SIZE", "10"))
+# 풀이 가득 찼을 때 커넥션 대여를 기다리는 최대 시간 (초)
+TIMESCALEDB_POOL_TIMEOUT = float(os.getenv("TIMESCALEDB_POOL_TIMEOUT", "5"))
+# 이 시간(초) 이상 유휴 상태였던 커넥션은 대여 전에 SELECT 1로 상태 확인
+TIMESCALEDB_POOL_HEALTHCHECK_INTERVAL = float(os.getenv("TIMESCALEDB_POOL_HEALTHCHECK_INTERVAL", "30"))
+# 세션 plan_cache_mode (auto | force_generic_plan | force_custom_plan)
+# prepare된 조회 문장을 일반 계획(generic plan)으로 재사용할지 결정. auto는 처음 5번 실행 후 비용을 비교해 선택
+TIMESCALEDB_PLAN_CACHE_MODE = os.getenv("TIMESCALEDB_PLAN_CACHE_MODE", "auto")
+
+# 원본 시계열 압축/보존 정책 (PostgreSQL interval 문자열, 보존 기간이 비어 있으면 삭제하지 않음)
+TIMESCALEDB_COMPRESSION_ENABLED = os.getenv("TIMESCALEDB_COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+STORAGE_POLICIES = {
+    "vehicle_telemetry": (
+        os.getenv("TIMESCALEDB_TELEMETRY_COMPRESS_AFTER", "7 days"),
+        os.getenv("TIMESCALEDB_TELEMETRY_RETENTION", ""),
+    ),
+    "periodic_data": (
+        os.getenv("TIMESCALEDB_PERIODIC_COMPRESS_AFTER", "7 days"),
+        os.getenv("TIMESCALEDB_PERIODIC_RETENTION", ""),
+    ),
+}
+
+# 하이퍼테이블별 청크 크기와 vehicle_id 해시 파티션 수 (0이면 공간 파티션 없음)
+# 청크 하나(인덱스 포함)가 메모리의 일부에 들어가도록 초당 적재되는 텔레메트리는 짧게,
+# 하루 몇 건인 이벤트 테이블은 청크가 너무 잘게 쪼개지지 않도록 길게 잡는다.
+# 간격 변경은 이후 생성되는 청크에만 적용되며, 기존 데이터는 scripts/rechunk_hypertable.py로 다시 나눈다.
+CHUNK_SETTINGS = {
+    "vehicle_telemetry": (
+        os.getenv("TIMESCALEDB_TELEMETRY_CHUNK_INTERVAL", "1 day"),
+        int(os.getenv("TIMESCALEDB_TELEMETRY_SPACE_PARTITIONS", "0")),
+    ),
+    "periodic_data": (
+        os.getenv("TIMESCALEDB_PERIODIC_CHUNK_INTERVAL", "1 day"),
+        int(os.getenv("TIMESCALEDB_PERIODIC_SPACE_PARTITIONS", "0")),
+    ),
+    "engine_off_events": (os.getenv("TIMESCALEDB_ENGINE_OFF_CHUNK_INTERVAL", "30 days"), 0),
+    "collision_events": (os.getenv("TIMESCALEDB_COLLISION_CHUNK_INTERVAL", "90 days"), 0),
+    "sudden_acceleration_events": (os.getenv("TIMESCALEDB_SUDDEN_ACCEL_CHUNK_INTERVAL", "30 days"), 0),
+    "warning_light_events": (os.getenv("TIMESCALEDB_WARNING_CHUNK_INTERVAL", "30 days"), 0),
+}
+
+# 벌크 적재 설정 (COPY 또는 execute_values 한 번에 보낼 행 수)
+TIMESCALEDB_BULK_BATCH_SIZE = int(os.getenv("TIMESCALEDB_BULK_BATCH_SIZE", "5000"))
+
+# 벌크 적재 시 테이블별 입력 컬럼 순서 (id, created_at은 기본값 사용)
+TABLE_COLUMNS = {
+    "vehicle_telemetry": ("vehicle_id", "vehicle_speed", "engine_rpm", "throttle_position", "timestamp"),
+    "periodic_data": (
+        "vehicle_id", "location_latitude", "location_longitude", "location_altitude",
+        "temperature_cabin", "temperature_ambient", "battery_voltage",
+        "tpms_front_left", "tpms_front_right", "tpms_rear_left", "tpms_rear_right",
+        "accelerometer_x", "accelerometer_y", "accelerometer_z", "fuel_level",
+        "engine_coolant_temp", "transmission_oil_temp", "timestamp",
+    ),
+    "engine_off_events": ("vehicle_id", "speed", "gear_status", "gyro", "side", "ignition", "timestamp"),
+    "collision_events": ("vehicle_id", "damage", "timestamp"),
+    "sudden_acceleration_events": ("vehicle_id", "vehicle_speed", "throttle_position", "gear_position_mode", "timestamp"),
+    "warning_light_events": ("vehicle_id", "warning_type", "timestamp"),
+}
+
+# 연속 집계(continuous aggregate) 대상 컬럼: 컬럼마다 {col}_sum/_count/_min/_max와 sample_count를 저장
+# ({col}_count는 NULL을 뺀 행 수로 평균의 분모, sample_count는 NULL을 포함한 전체 행 수)
+TELEMETRY_AGGREGATE_COLUMNS = ("vehicle_speed", "engine_rpm", "throttle_position")
+PERIODIC_AGGREGATE_COLUMNS = (
+    "battery_voltage", "engine_coolant_temp", "transmission_oil_temp",
+    "tpms_front_left", "tpms_front_right", "tpms_rear_left", "tpms_rear_right",
+    "fuel_level",
+)
+# (원본 테이블, 뷰 이름 접두사, 집계 컬럼)
+CONTINUOUS_AGGREGATES = (
+    ("vehicle_telemetry", "telemetry", TELEMETRY_AGGREGATE_COLUMNS),
+    ("periodic_data", "periodic", PERIODIC_AGGREGATE_COLUMNS),
+)
+# 증분 동기화 시 중복 적재를 막는 테이블별 자연 키 (하이퍼테이블 유니크 인덱스는 timestamp를 포함해야 함)
+NATURAL_KEYS = {
+    "vehicle_telemetry": ("vehicle_id", "timestamp"),
+    "periodic_data": ("vehicle_id", "timestamp"),
+    "engine_off_events": ("vehicle_id", "timestamp"),
+    "collision_events": ("vehicle_id", "timestamp"),
+    "sudden_acceleration_events": ("vehicle_id", "timestamp"),
+    "warning_light_events": ("vehicle_id", "warning_type", "timestamp"),
+}
+# 모든 엔드포인트의 조회 형태(vehicle_id = ? AND timestamp 범위 ORDER BY timestamp)에 맞춘 테이블별 복합 인덱스
+QUERY_INDEXES = {
+    "vehicle_telemetry": "idx_telemetry_vehicle_time",
+    "periodic_data": "idx_periodic_vehicle_time",
+    "engine_off_events": "idx_engine_off_vehicle_time",
+    "collision_events": "idx_collision_vehicle_time",
+    "sudden_acceleration_events": "idx_sudden_accel_vehicle_time",
+    "warning_light_events": "idx_warning_vehicle_time",
+}
+# 이전 스키마의 단일 컬럼 인덱스: vehicle_id는 복합 인덱스의 선두 컬럼과, timestamp는
+# create_hypertable이 만드는 기본 시간 인덱스({table}_timestamp_idx)와 중복되어 적재만 느리게 함
+REDUNDANT_INDEXES = (
+    "idx_engine_off_vehicle_id", "idx_engine_off_timestamp",
+    "idx_collision_vehicle_id", "idx_collision_timestamp",
+    "idx_telemetry_vehicle_id", "idx_telemetry_timestamp",
+    "idx_periodic_vehicle_id", "idx_periodic_timestamp",
+    "idx_sudden_accel_vehicle_id", "idx_sudden_accel_timestamp",
+    "idx_warning_vehicle_id", "idx_warning_timestamp",
+)
+# (뷰 이름 접미사, 버킷 크기, 갱신 start_offset, end_offset, schedule_interval)
+CONTINUOUS_AGGREGATE_LEVELS = (
+    ("hourly", "1 hour", "3 days", "1 hour", "30 minutes"),
+    ("daily", "1 day", "30 days", "1 day", "1 hour"),
+)
+
+
+class _TimedCursorMixin:
+    """execute/executemany/copy_expert 실행 시간과 읽은 행 수를 metrics에 기록하는 커서 믹스인"""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._record(started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self._record(started)
+
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            self._record(started, fetched=False)
+
+    def _record(self, started: float, fetched: bool = True):
+        # 클라이언트 측 커서는 실행 시 결과를 모두 받으므로 SELECT의 rowcount가 읽은 행 수
+        rows = max(self.rowcount, 0) if fetched and self.description is not None else 0
+        record_query("timescaledb", time.perf_counter() - started, rows)
+
+
+class InstrumentedCursor(_TimedCursorMixin, psycopg2.extensions.cursor):
+    """풀 커넥션의 기본 커서"""
+
+
+class PoolTimeoutError(pg_pool.PoolError):
+    """커넥션 대여 대기 시간 초과"""
+
+
+class TimescaleDBPool:
+    """프로세스 전역 TimescaleDB 커넥션 풀
+
+    psycopg2 ThreadedConnectionPool은 풀이 가득 차면 즉시 PoolError를 던지므로
+    세마포어로 대여 대기를 구현하고, 대여 시 유휴 커넥션 상태 확인과
+    대여 대기 시간/타임아웃 지표를 함께 기록한다.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, timeout: float, healthcheck_interval: float):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self._pool = pg_pool.ThreadedConnectionPool(
+            minconn,
+            maxconn,
             host=TIMESCALEDB_HOST,
             port=TIMESCALEDB_PORT,
             database=TIMESCALEDB_DB,
             user=TIMESCALEDB_USER,
-            password=TIMESCALEDB_PASSWORD
+            password=TIMESCALEDB_PASSWORD,
+            options=f"-c plan_cache_mode={TIMESCALEDB_PLAN_CACHE_MODE}",
+            cursor_factory=InstrumentedCursor
         )
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used: Dict[int, float] = {}
+        self._in_use = 0
+        self._borrows = 0
+        self._timeouts = 0
+        self._healthcheck_failures = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def getconn(self):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(f"Timed out after {self.timeout}s waiting for a TimescaleDB connection")
+
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                with self._lock:
+                    self._healthcheck_failures += 1
+                self._forget(conn)
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._in_use += 1
+            self._borrows += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
         return conn
+
+    def putconn(self, conn):
+        try:
+            if conn.closed:
+                # 끊어진 커넥션은 풀에 되돌리지 않고 폐기
+                self._forget(conn)
+                self._pool.putconn(conn, close=True)
+            else:
+                with self._lock:
+                    self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn)
+                # minconn을 넘는 커넥션은 반납 시 닫히므로 마지막 사용 기록도 함께 지움
+                if conn.closed:
+                    self._forget(conn)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def closeall(self):
+        self._pool.closeall()
+        with self._lock:
+            self._last_used.clear()
+
+    def _forget(self, conn):
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        with self._lock:
+            last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.healthcheck_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "min_size": self.minconn,
+                "max_size": self.maxconn,
+                "in_use": self._in_use,
+                "borrows": self._borrows,
+                "borrow_timeouts": self._timeouts,
+                "healthcheck_failures": self._healthcheck_failures,
+                "avg_borrow_wait_ms": round(self._wait_total / self._borrows * 1000, 3) if self._borrows else 0.0,
+                "max_borrow_wait_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+_pool: Optional[TimescaleDBPool] = None
+_pool_lock = threading.Lock()
+
+def init_timescaledb_pool(minconn: int = None, maxconn: int = None) -> Optional[TimescaleDBPool]:
+    """TimescaleDB 커넥션 풀 생성 (이미 있으면 그대로 반환)
+
+    크기를 지정하지 않으면 TIMESCALEDB_POOL_MIN_SIZE/MAX_SIZE 설정을 사용
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = TimescaleDBPool(
+                    minconn or TIMESCALEDB_POOL_MIN_SIZE,
+                    maxconn or TIMESCALEDB_POOL_MAX_SIZE,
+                    TIMESCALEDB_POOL_TIMEOUT,
+                    TIMESCALEDB_POOL_HEALTHCHECK_INTERVAL
+                )
+            except Exception as e:
+                print(f"Failed to create TimescaleDB connection pool: {e}")
+                return None
+        return _pool
+
+def close_timescaledb_pool():
+    """TimescaleDB 커넥션 풀의 모든 커넥션 종료"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+def get_timescaledb_pool_stats() -> Dict[str, Any]:
+    """커넥션 풀 지표 반환"""
+    if _pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pool.stats()}
+
+def get_timescaledb_connection():
+    """커넥션 풀에서 TimescaleDB 연결 대여 (사용 후 release_timescaledb_connection 호출)
+
+    연결 실패는 None을 반환하지만, 풀 대여 대기 시간 초과(PoolTimeoutError)는 "데이터 없음"과
+    구분되도록 그대로 전달한다 (API에서는 503으로 응답).
+    """
+    pool = _pool or init_timescaledb_pool()
+    if pool is None:
+        return None
+    try:
+        return pool.getconn()
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         print(f"Failed to connect to TimescaleDB: {e}")
         return None
 
+def release_timescaledb_connection(conn):
+    """대여한 TimescaleDB 연결을 풀에 반납"""
+    if conn is None:
+        return
+    if _pool is None:
+        conn.close()
+        return
+    _pool.putconn(conn)
+
 def init_timescaledb():
     """TimescaleDB 초기화 및 테이블 생성"""
     conn = get_timescaledb_connection()
@@ -137,31 +457,17 @@ def init_timescaledb():
         """)
         
         # TimescaleDB 하이퍼테이블로 변환
-        cursor.execute("SELECT create_hypertable('engine_off_events', 'timestamp', if_not_exists => TRUE);")
-        cursor.execute("SELECT create_hypertable('collision_events', 'timestamp', if_not_exists => TRUE);")
-        cursor.execute("SELECT create_hypertable('vehicle_telemetry', 'timestamp', if_not_exists => TRUE);")
-        cursor.execute("SELECT create_hypertable('periodic_data', 'timestamp', if_not_exists => TRUE);")
-        cursor.execute("SELECT create_hypertable('sudden_acceleration_events', 'timestamp', if_not_exists => TRUE);")
-        cursor.execute("SELECT create_hypertable('warning_light_events', 'timestamp', if_not_exists => TRUE);")
-        
-        # 인덱스 생성
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_engine_off_vehicle_id ON engine_off_events(vehicle_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_engine_off_timestamp ON engine_off_events(timestamp);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collision_vehicle_id ON collision_events(vehicle_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collision_timestamp ON collision_events(timestamp);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_telemetry_vehicle_id ON vehicle_telemetry(vehicle_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_telemetry_timestamp ON vehicle_telemetry(timestamp);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_telemetry_vehicle_time ON vehicle_telemetry(vehicle_id, timestamp DESC);")
-        
-        # 새로운 테이블 인덱스
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_periodic_vehicle_id ON periodic_data(vehicle_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_periodic_timestamp ON periodic_data(timestamp);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sudden_accel_vehicle_id ON sudden_acceleration_events(vehicle_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sudden_accel_timestamp ON sudden_acceleration_events(timestamp);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_warning_vehicle_id ON warning_light_events(vehicle_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_warning_timestamp ON warning_light_events(timestamp);")
+        for table, (chunk_interval, _) in CHUNK_SETTINGS.items():
+            cursor.execute(
+                "SELECT create_hypertable(%s, 'timestamp', chunk_time_interval => %s::interval, if_not_exists => TRUE);",
+                (table, chunk_interval)
+            )
         
         conn.commit()
+        init_chunk_settings(conn)
+        migrate_query_indexes(conn)
+        init_continuous_aggregates(conn)
+        init_storage_policies(conn)
         print("TimescaleDB 초기화 완료")
         return True
         
@@ -170,7 +476,348 @@ def init_timescaledb():
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
+
+def add_space_partitioning(cursor, table: str, partitions: int):
+    """비어 있는 하이퍼테이블에 vehicle_id 해시 공간 파티션 추가
+
+    하이퍼테이블의 유니크 제약은 모든 파티션 컬럼을 포함해야 하므로
+    기본 키를 (id, timestamp, vehicle_id)로 바꾼 뒤 차원을 추가한다.
+    """
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+        (table,)
+    )
+    row = cursor.fetchone()
+    if row:
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{row[0]}";')
+    cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, timestamp, vehicle_id);")
+    cursor.execute(
+        "SELECT add_dimension(%s, 'vehicle_id', number_partitions => %s, if_not_exists => TRUE);",
+        (table, partitions)
+    )
+
+def init_chunk_settings(conn):
+    """CHUNK_SETTINGS의 청크 간격과 공간 파티션 수를 기존 하이퍼테이블에 반영
+
+    create_hypertable(if_not_exists)은 이미 있는 테이블의 설정을 바꾸지 않으므로 간격이 다르면
+    set_chunk_time_interval로 바꾼다 (새로 만들어지는 청크부터 적용). 공간 파티션은 청크가
+    없는 테이블에만 추가할 수 있어, 데이터가 있으면 안내만 출력하고 재청크 스크립트에 맡긴다.
+    """
+    cursor = conn.cursor()
+    for table, (chunk_interval, partitions) in CHUNK_SETTINGS.items():
+        cursor.execute("""
+            SELECT time_interval = %s::interval
+            FROM timescaledb_information.dimensions
+            WHERE hypertable_name = %s AND dimension_type = 'Time'
+        """, (chunk_interval, table))
+        row = cursor.fetchone()
+        if row and not row[0]:
+            cursor.execute("SELECT set_chunk_time_interval(%s, %s::interval);", (table, chunk_interval))
+
+        cursor.execute("""
+            SELECT num_partitions
+            FROM timescaledb_information.dimensions
+            WHERE hypertable_name = %s AND column_name = 'vehicle_id'
+        """, (table,))
+        row = cursor.fetchone()
+        if row:
+            if partitions and row[0] != partitions:
+                cursor.execute("SELECT set_number_partitions(%s, %s, 'vehicle_id');", (table, partitions))
+            elif not partitions:
+                print(f"{table}: vehicle_id 공간 파티션은 제거할 수 없음 (재청크 스크립트로 다시 만들어야 함)")
+        elif partitions:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM timescaledb_information.chunks WHERE hypertable_name = %s)",
+                (table,)
+            )
+            if cursor.fetchone()[0]:
+                print(f"{table}: 데이터가 있어 공간 파티션을 추가하지 못함 "
+                      f"(python scripts/rechunk_hypertable.py --table {table} 실행 필요)")
+            else:
+                add_space_partitioning(cursor, table, partitions)
+    conn.commit()
+
+def _has_unique_vehicle_time_index(cursor, table: str) -> bool:
+    """(vehicle_id, timestamp)로 시작하는 유니크 인덱스가 있는지 (증분 동기화용 자연 키 인덱스)"""
+    cursor.execute("""
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_attribute a0 ON a0.attrelid = i.indrelid AND a0.attnum = i.indkey[0]
+        JOIN pg_attribute a1 ON a1.attrelid = i.indrelid AND a1.attnum = i.indkey[1]
+        WHERE i.indrelid = %s::regclass
+          AND i.indisunique AND i.indisvalid
+          AND a0.attname = 'vehicle_id' AND a1.attname = 'timestamp'
+    """, (table,))
+    return cursor.fetchone() is not None
+
+def migrate_query_indexes(conn):
+    """조회 형태에 맞는 인덱스만 남기도록 인덱스 구성 정리 (여러 번 실행해도 안전)
+
+    - 중복 단일 컬럼 인덱스(REDUNDANT_INDEXES) 삭제
+    - 테이블마다 (vehicle_id, timestamp DESC) 복합 인덱스 생성. 단, 증분 동기화가 만든
+      (vehicle_id, timestamp) 유니크 인덱스가 있으면 역방향 스캔으로 같은 조회를 처리하므로
+      복합 인덱스는 만들지 않고 이미 있으면 삭제한다 (쓰기마다 같은 인덱스를 두 번 갱신하지 않도록)
+    청크 단위로 나눠 생성하는 timescaledb.transaction_per_chunk는 트랜잭션 블록 밖에서만
+    실행할 수 있으므로 autocommit 모드로 실행한다.
+    """
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        for index in REDUNDANT_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index};")
+        for table, index in QUERY_INDEXES.items():
+            if _has_unique_vehicle_time_index(cursor, table):
+                cursor.execute(f"DROP INDEX IF EXISTS {index};")
+            else:
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS {index} ON {table} (vehicle_id, timestamp DESC)
+                    WITH (timescaledb.transaction_per_chunk);
+                """)
+    finally:
+        conn.autocommit = False
+
+def _stale_aggregate_view(cursor, view: str, columns) -> bool:
+    """이미 있는 뷰에 {col}_count 컬럼이 빠져 있는지 (컬럼별 NULL 제외 행 수 추가 전에 만든 뷰)"""
+    cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = %s", (view,))
+    existing = {row[0] for row in cursor.fetchall()}
+    return bool(existing) and any(f"{column}_count" not in existing for column in columns)
+
+def _aggregate_has_orphan_buckets(cursor, table: str, view: str, width: str) -> bool:
+    """원본 첫 행보다 오래된 버킷이 뷰에 있는지 (보존 정책으로 원본이 지워진 집계 이력)"""
+    cursor.execute(f"SELECT min(timestamp) FROM {table}")
+    first = cursor.fetchone()[0]
+    if first is None:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {view})")
+    else:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {view} WHERE bucket < %s - %s::interval)", (first, width))
+    return cursor.fetchone()[0]
+
+def init_continuous_aggregates(conn):
+    """시간/일 단위 연속 집계 뷰와 자동 갱신 정책 생성
+
+    CREATE MATERIALIZED VIEW ... WITH (timescaledb.continuous)는 트랜잭션 블록 안에서
+    실행할 수 없으므로 autocommit 모드로 실행한다. materialized_only = false로 두어
+    아직 갱신되지 않은 최근 구간은 원본 테이블에서 실시간으로 합쳐 읽는다.
+    {col}_count가 없는 기존 뷰는 삭제 후 다시 만들어 원본 전체로 갱신한다. 단 원본이 이미
+    지워진 집계 이력이 있으면 다시 계산할 수 없으므로 그대로 두고, 조회는 원본 테이블을 사용한다.
+    """
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        for table, prefix, columns in CONTINUOUS_AGGREGATES:
+            aggregates = ",\n".join(
+                f"sum({column}) AS {column}_sum, count({column}) AS {column}_count, "
+                f"min({column}) AS {column}_min, max({column}) AS {column}_max"
+                for column in columns
+            )
+            for suffix, width, start_offset, end_offset, schedule_interval in CONTINUOUS_AGGREGATE_LEVELS:
+                view = f"{prefix}_{suffix}"
+                stale = _stale_aggregate_view(cursor, view, columns)
+                if stale:
+                    if _aggregate_has_orphan_buckets(cursor, table, view, width):
+                        print(f"⚠️ {view}에 컬럼별 행 수가 없지만 원본이 지워진 집계 이력이 있어 다시 만들지 않습니다. "
+                              f"이 뷰 대신 {table}을 직접 집계합니다.")
+                        continue
+                    print(f"연속 집계 {view}를 컬럼별 행 수 포함으로 다시 만듭니다")
+                    cursor.execute(f"DROP MATERIALIZED VIEW {view};")
+                cursor.execute(f"""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS {view}
+                    WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                    SELECT vehicle_id,
+                           time_bucket(INTERVAL '{width}', timestamp) AS bucket,
+                           count(*) AS sample_count,
+                           {aggregates}
+                    FROM {table}
+                    GROUP BY vehicle_id, bucket
+                    WITH NO DATA;
+                """)
+                cursor.execute("""
+                    SELECT add_continuous_aggregate_policy(%s,
+                        start_offset => INTERVAL %s,
+                        end_offset => INTERVAL %s,
+                        schedule_interval => INTERVAL %s,
+                        if_not_exists => TRUE);
+                """, (view, start_offset, end_offset, schedule_interval))
+                if stale:
+                    cursor.execute("CALL refresh_continuous_aggregate(%s, NULL, NULL);", (view,))
+    finally:
+        conn.autocommit = False
+
+def _replace_policy(cursor, table: str, proc_name: str, config_key: str, interval: str,
+                    add_sql: str, remove_sql: str):
+    """정책이 없거나 간격이 다르면 다시 만듦 (if_not_exists는 기존 정책의 간격을 바꾸지 않음)"""
+    cursor.execute("""
+        SELECT (config->>%s)::interval = %s::interval
+        FROM timescaledb_information.jobs
+        WHERE proc_name = %s AND hypertable_name = %s
+    """, (config_key, interval, proc_name, table))
+    row = cursor.fetchone()
+    if row and row[0]:
+        return
+    if row:
+        cursor.execute(remove_sql, (table,))
+    cursor.execute(add_sql, (table, interval))
+
+def _retention_covers_aggregates(cursor, table: str, retention: str) -> bool:
+    """보존 기간이 연속 집계 갱신 범위(가장 큰 start_offset)보다 긴지 확인
+
+    보존 기간이 더 짧으면 집계 뷰가 아직 반영하지 않은 원본 청크가 먼저 삭제되고,
+    이후 갱신이 그 구간을 빈 데이터로 다시 계산해 집계 이력까지 사라진다.
+    """
+    if table not in {source for source, _, _ in CONTINUOUS_AGGREGATES}:
+        return True
+    cursor.execute(
+        "SELECT %s::interval > MAX(o::interval), MAX(o::interval)::text FROM unnest(%s::text[]) AS o",
+        (retention, [start_offset for _, _, start_offset, _, _ in CONTINUOUS_AGGREGATE_LEVELS])
+    )
+    covers, max_offset = cursor.fetchone()
+    if not covers:
+        print(f"Refusing retention policy for {table}: drop_after {retention} must be longer than "
+              f"the continuous aggregate refresh window ({max_offset}). Keeping the current retention policy.")
+    return covers
+
+def init_storage_policies(conn):
+    """vehicle_telemetry, periodic_data에 컬럼형 압축과 압축/보존 정책 적용
+
+    vehicle_id로 세그먼트를 나누고 timestamp 역순으로 정렬해 압축하므로 차량별 범위 조회는
+    압축된 청크에서도 해당 세그먼트만 풀어 읽는다. 기본 키 (id, timestamp)의 id도
+    정렬 컬럼에 포함해야 압축을 켤 수 있다. 보존 기간은 연속 집계 갱신 범위(최대 30일)보다
+    길어야 집계 뷰가 삭제 전 구간을 모두 반영하므로, 그보다 짧은 보존 기간은 적용하지 않고
+    경고만 출력한다 (기존 보존 정책은 그대로 둠). TIMESCALEDB_COMPRESSION_ENABLED가 꺼져 있으면
+    압축 정책만 제거하고 보존 정책은 그대로 적용한다 (이미 압축된 청크는 그대로 둠).
+    """
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        for table, (compress_after, retention) in STORAGE_POLICIES.items():
+            cursor.execute(
+                "SELECT compression_enabled FROM timescaledb_information.hypertables WHERE hypertable_name = %s",
+                (table,)
+            )
+            row = cursor.fetchone()
+            if TIMESCALEDB_COMPRESSION_ENABLED and row and not row[0]:
+                cursor.execute(f"""
+                    ALTER TABLE {table} SET (
+                        timescaledb.compress,
+                        timescaledb.compress_segmentby = 'vehicle_id',
+                        timescaledb.compress_orderby = 'timestamp DESC, id DESC'
+                    );
+                """)
+            if TIMESCALEDB_COMPRESSION_ENABLED and compress_after:
+                _replace_policy(
+                    cursor, table, "policy_compression", "compress_after", compress_after,
+                    "SELECT add_compression_policy(%s, compress_after => %s::interval);",
+                    "SELECT remove_compression_policy(%s, if_exists => TRUE);",
+                )
+            else:
+                cursor.execute("SELECT remove_compression_policy(%s, if_exists => TRUE);", (table,))
+            if retention:
+                if not _retention_covers_aggregates(cursor, table, retention):
+                    continue
+                _replace_policy(
+                    cursor, table, "policy_retention", "drop_after", retention,
+                    "SELECT add_retention_policy(%s, drop_after => %s::interval);",
+                    "SELECT remove_retention_policy(%s, if_exists => TRUE);",
+                )
+            else:
+                cursor.execute("SELECT remove_retention_policy(%s, if_exists => TRUE);", (table,))
+    finally:
+        conn.autocommit = False
+
+def init_sync_state():
+    """MongoDB 증분 동기화용 워터마크 테이블과 자연 키 유니크 인덱스 생성
+
+    기존 데이터에 중복이 있으면 유니크 인덱스 생성이 실패하므로
+    그 경우 전체 재적재(--full)를 한 번 실행해야 한다.
+    """
+    conn = get_timescaledb_connection()
+    if not conn:
+        return False
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_watermarks (
+                collection VARCHAR(100) PRIMARY KEY,
+                last_object_id VARCHAR(24) NOT NULL,
+                last_timestamp TIMESTAMPTZ,
+                updated_at TIMESTAMPTZ DEFAULT NOW()
+            );
+        """)
+        for table, columns in NATURAL_KEYS.items():
+            cursor.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_natural_key ON {table} ({', '.join(columns)});"
+            )
+        
+        conn.commit()
+        # 자연 키 인덱스와 겹치게 된 복합 인덱스 정리
+        migrate_query_indexes(conn)
+        return True
+    except Exception as e:
+        print(f"Failed to initialize sync state: {e}")
+        conn.rollback()
+        return False
+    finally:
+        release_timescaledb_connection(conn)
+
+def get_sync_watermark(collection: str) -> Optional[str]:
+    """컬렉션의 마지막 동기화 ObjectId (16진수 문자열) 조회"""
+    conn = get_timescaledb_connection()
+    if not conn:
+        return None
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT last_object_id FROM sync_watermarks WHERE collection = %s", (collection,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        release_timescaledb_connection(conn)
+
+def set_sync_watermark(collection: str, last_object_id: str, last_timestamp=None):
+    """컬렉션의 동기화 워터마크 갱신"""
+    conn = get_timescaledb_connection()
+    if not conn:
+        return False
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO sync_watermarks (collection, last_object_id, last_timestamp, updated_at)
+            VALUES (%s, %s, %s, NOW())
+            ON CONFLICT (collection) DO UPDATE
+            SET last_object_id = EXCLUDED.last_object_id,
+                last_timestamp = EXCLUDED.last_timestamp,
+                updated_at = NOW()
+        """, (collection, last_object_id, last_timestamp))
+        
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"Failed to update sync watermark: {e}")
+        conn.rollback()
+        return False
+    finally:
+        release_timescaledb_connection(conn)
+
+def reset_sync_watermarks():
+    """모든 워터마크 삭제 (전체 재적재 전에 호출)"""
+    conn = get_timescaledb_connection()
+    if not conn:
+        return False
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM sync_watermarks;")
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"Failed to reset sync watermarks: {e}")
+        conn.rollback()
+        return False
+    finally:
+        release_timescaledb_connection(conn)
 
 def write_engine_off_event(vehicle_id: str, speed: float, gear_status: str, 
                           gyro: float, side: str, ignition: bool, timestamp: str):
@@ -184,6 +831,7 @@ def write_engine_off_event(vehicle_id: str, speed: float, gear_status: str,
         cursor.execute("""
             INSERT INTO engine_off_events (vehicle_id, speed, gear_status, gyro, side, ignition, timestamp)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
         """, (vehicle_id, speed, gear_status, gyro, side, ignition, timestamp))
         
         conn.commit()
@@ -194,7 +842,7 @@ def write_engine_off_event(vehicle_id: str, speed: float, gear_status: str,
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def write_collision_event(vehicle_id: str, damage: int, timestamp: str):
     """충돌 이벤트를 TimescaleDB에 기록"""
@@ -207,6 +855,7 @@ def write_collision_event(vehicle_id: str, damage: int, timestamp: str):
         cursor.execute("""
             INSERT INTO collision_events (vehicle_id, damage, timestamp)
             VALUES (%s, %s, %s)
+            ON CONFLICT DO NOTHING
         """, (vehicle_id, damage, timestamp))
         
         conn.commit()
@@ -217,7 +866,7 @@ def write_collision_event(vehicle_id: str, damage: int, timestamp: str):
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def write_telemetry_data(vehicle_id: str, vehicle_speed: float, engine_rpm: int, 
                         throttle_position: float, timestamp: str):
@@ -231,6 +880,7 @@ def write_telemetry_data(vehicle_id: str, vehicle_speed: float, engine_rpm: int,
         cursor.execute("""
             INSERT INTO vehicle_telemetry (vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp)
             VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
         """, (vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp))
         
         conn.commit()
@@ -240,209 +890,77 @@ def write_telemetry_data(vehicle_id: str, vehicle_speed: float, engine_rpm: int,
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def batch_write_telemetry_data(data_list: List[Dict[str, Any]]):
     """배치로 텔레메트리 데이터 기록 (성능 최적화)"""
-    conn = get_timescaledb_connection()
-    if not conn:
-        return False
-    
-    try:
-        cursor = conn.cursor()
-        
-        # 배치 삽입
-        args = [(
-            d['vehicle_id'],
-            d['vehicle_speed'],
-            d['engine_rpm'],
-            d['throttle_position'],
-            d['timestamp']
-        ) for d in data_list]
-        
-        cursor.executemany("""
-            INSERT INTO vehicle_telemetry (vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp)
-            VALUES (%s, %s, %s, %s, %s)
-        """, args)
-        
-        conn.commit()
-        print(f"Successfully wrote {len(data_list)} telemetry records")
-        return True
-    except Exception as e:
-        print(f"Failed to batch write telemetry data: {e}")
-        conn.rollback()
+    columns = TABLE_COLUMNS["vehicle_telemetry"]
+    written = bulk_write_rows("vehicle_telemetry", (tuple(d[c] for c in columns) for d in data_list))
+    if written is None:
         return False
-    finally:
-        conn.close()
+    print(f"Successfully wrote {written} telemetry records")
+    return True
 
-def get_telemetry_data(vehicle_id: str, start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
-    """특정 차량의 텔레메트리 데이터 조회"""
-    conn = get_timescaledb_connection()
-    if not conn:
-        return []
-    
-    try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 시간 범위 조건 설정
-        time_condition = ""
-        params = [vehicle_id]
-        
-        if start_time and end_time:
-            time_condition = "AND timestamp BETWEEN %s AND %s"
-            params.extend([start_time, end_time])
-        elif start_time:
-            time_condition = "AND timestamp >= %s"
-            params.append(start_time)
-        elif end_time:
-            time_condition = "AND timestamp <= %s"
-            params.append(end_time)
-        
-        query = f"""
-            SELECT vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp
-            FROM vehicle_telemetry
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(query, params)
-        telemetry_data = []
-        for row in cursor.fetchall():
-            telemetry_data.append({
-                "vehicle_id": row["vehicle_id"],
-                "vehicle_speed": row["vehicle_speed"],
-                "engine_rpm": row["engine_rpm"],
-                "throttle_position": row["throttle_position"],
-                "timestamp": row["timestamp"].isoformat()
-            })
-        
-        return telemetry_data
-        
-    except Exception as e:
-        print(f"Failed to query telemetry data: {e}")
-        return []
-    finally:
-        conn.close()
+def bulk_write_rows(table: str, rows: Iterable[Sequence[Any]], batch_size: int = None,
+                    method: str = "copy") -> Optional[int]:
+    """행 튜플(TABLE_COLUMNS 순서)을 batch_size개씩 나눠 벌크 적재
 
-def get_events_for_vehicle(vehicle_id: str, start_time: str = None, end_time: str = None) -> Dict[str, List[Dict[str, Any]]]:
-    """특정 차량의 이벤트 데이터 조회"""
+    - copy: 배치를 CSV로 직렬화해 임시 스테이징 테이블에 COPY FROM STDIN으로 넣은 뒤
+      INSERT ... SELECT ... ON CONFLICT DO NOTHING으로 옮긴다 (COPY는 ON CONFLICT를 지원하지 않음)
+    - values: execute_values로 여러 행을 한 INSERT 문에 담아 전송
+
+    배치마다 커밋하며 rows는 이터레이터로 소비하므로 메모리는 배치 크기로 제한된다.
+    반환: 적재를 시도한 행 수 (실패 시 None)
+    """
+    columns = TABLE_COLUMNS[table]
+    column_list = ", ".join(columns)
+    batch_size = batch_size or TIMESCALEDB_BULK_BATCH_SIZE
     conn = get_timescaledb_connection()
     if not conn:
-        return {
-            "engine_off_events": [], 
-            "collision_events": [],
-            "sudden_acceleration_events": [],
-            "warning_light_events": []
-        }
+        return None
     
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 시간 범위 조건 설정
-        time_condition = ""
-        params = [vehicle_id]
-        
-        if start_time and end_time:
-            time_condition = "AND timestamp BETWEEN %s AND %s"
-            params.extend([start_time, end_time])
-        elif start_time:
-            time_condition = "AND timestamp >= %s"
-            params.append(start_time)
-        elif end_time:
-            time_condition = "AND timestamp <= %s"
-            params.append(end_time)
-        
-        # 엔진 오프 이벤트 조회
-        engine_off_query = f"""
-            SELECT vehicle_id, speed, gear_status, gyro, side, ignition, timestamp
-            FROM engine_off_events
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(engine_off_query, params)
-        engine_off_events = []
-        for row in cursor.fetchall():
-            engine_off_events.append({
-                "vehicle_id": row["vehicle_id"],
-                "speed": row["speed"],
-                "gear_status": row["gear_status"],
-                "gyro": row["gyro"],
-                "side": row["side"],
-                "ignition": row["ignition"],
-                "timestamp": row["timestamp"].isoformat()
-            })
-        
-        # 충돌 이벤트 조회
-        collision_query = f"""
-            SELECT vehicle_id, damage, timestamp
-            FROM collision_events
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(collision_query, params)
-        collision_events = []
-        for row in cursor.fetchall():
-            collision_events.append({
-                "vehicle_id": row["vehicle_id"],
-                "damage": row["damage"],
-                "timestamp": row["timestamp"].isoformat()
-            })
-        
-        # 급가속 이벤트 조회
-        sudden_accel_query = f"""
-            SELECT vehicle_id, vehicle_speed, throttle_position, gear_position_mode, timestamp
-            FROM sudden_acceleration_events
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(sudden_accel_query, params)
-        sudden_acceleration_events = []
-        for row in cursor.fetchall():
-            sudden_acceleration_events.append({
-                "vehicle_id": row["vehicle_id"],
-                "vehicle_speed": row["vehicle_speed"],
-                "throttle_position": row["throttle_position"],
-                "gear_position_mode": row["gear_position_mode"],
-                "timestamp": row["timestamp"].isoformat()
-            })
-        
-        # 경고등 이벤트 조회
-        warning_light_query = f"""
-            SELECT vehicle_id, warning_type, timestamp
-            FROM warning_light_events
-            WHERE vehicle_id = %s {time_condition}
-            ORDER BY timestamp ASC
-        """
-        
-        cursor.execute(warning_light_query, params)
-        warning_light_events = []
-        for row in cursor.fetchall():
-            warning_light_events.append({
-                "vehicle_id": row["vehicle_id"],
-                "warning_type": row["warning_type"],
-                "timestamp": row["timestamp"].isoformat()
-            })
+        cursor = conn.cursor()
+        stage = f"_stage_{table}"
+        if method == "copy":
+            cursor.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS
+                SELECT {column_list} FROM {table} WITH NO DATA
+            """)
         
-        return {
-            "engine_off_events": engine_off_events,
-            "collision_events": collision_events,
-            "sudden_acceleration_events": sudden_acceleration_events,
-            "warning_light_events": warning_light_events
-        }
+        written = 0
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            if method == "copy":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(batch)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+                cursor.execute(f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM {stage}
+                    ON CONFLICT DO NOTHING
+                """)
+            else:
+                execute_values(
+                    cursor,
+                    f"INSERT INTO {table} ({column_list}) VALUES %s ON CONFLICT DO NOTHING",
+                    batch,
+                    page_size=batch_size
+                )
+            conn.commit()
+            written += len(batch)
         
+        return written
     except Exception as e:
-        print(f"Failed to query events: {e}")
-        return {
-            "engine_off_events": [], 
-            "collision_events": [],
-            "sudden_acceleration_events": [],
-            "warning_light_events": []
-        }
+        print(f"Failed to bulk write {table}: {e}")
+        conn.rollback()
+        return None
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def write_periodic_data(vehicle_id: str, location_latitude: float, location_longitude: float, 
                        location_altitude: float, temperature_cabin: float, temperature_ambient: float,
@@ -464,6 +982,7 @@ def write_periodic_data(vehicle_id: str, location_latitude: float, location_long
                                      accelerometer_x, accelerometer_y, accelerometer_z, fuel_level,
                                      engine_coolant_temp, transmission_oil_temp, timestamp)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
         """, (vehicle_id, location_latitude, location_longitude, location_altitude,
               temperature_cabin, temperature_ambient, battery_voltage,
               tpms_front_left, tpms_front_right, tpms_rear_left, tpms_rear_right,
@@ -477,7 +996,7 @@ def write_periodic_data(vehicle_id: str, location_latitude: float, location_long
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def write_sudden_acceleration_event(vehicle_id: str, vehicle_speed: float, throttle_position: float,
                                    gear_position_mode: str, timestamp: str):
@@ -491,6 +1010,7 @@ def write_sudden_acceleration_event(vehicle_id: str, vehicle_speed: float, throt
         cursor.execute("""
             INSERT INTO sudden_acceleration_events (vehicle_id, vehicle_speed, throttle_position, gear_position_mode, timestamp)
             VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
         """, (vehicle_id, vehicle_speed, throttle_position, gear_position_mode, timestamp))
         
         conn.commit()
@@ -500,7 +1020,7 @@ def write_sudden_acceleration_event(vehicle_id: str, vehicle_speed: float, throt
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def write_warning_light_event(vehicle_id: str, warning_type: str, timestamp: str):
     """경고등 이벤트를 TimescaleDB에 기록"""
@@ -513,6 +1033,7 @@ def write_warning_light_event(vehicle_id: str, warning_type: str, timestamp: str
         cursor.execute("""
             INSERT INTO warning_light_events (vehicle_id, warning_type, timestamp)
             VALUES (%s, %s, %s)
+            ON CONFLICT DO NOTHING
         """, (vehicle_id, warning_type, timestamp))
         
         conn.commit()
@@ -522,4 +1043,4 @@ def write_warning_light_event(vehicle_id: str, warning_type: str, timestamp: str
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
@@ -0,0 +1,685 @@
+import asyncio
+import asyncpg
+import base64
+import numpy as np
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from datetime import datetime, timedelta, timezone
+
+from .downsampling import bucket_for_max_points, lttb_indices, parse_bucket
+from .metrics import record_query
+from .query_registry import QUERIES, RAW_COLUMNS, EVENT_TABLES, bound_values, query_name, time_bounds
+
+from .timescaledb import (
+    TIMESCALEDB_HOST,
+    TIMESCALEDB_PORT,
+    TIMESCALEDB_DB,
+    TIMESCALEDB_USER,
+    TIMESCALEDB_PASSWORD,
+    TIMESCALEDB_POOL_MIN_SIZE,
+    TIMESCALEDB_POOL_MAX_SIZE,
+    TIMESCALEDB_POOL_TIMEOUT,
+    TIMESCALEDB_PLAN_CACHE_MODE,
+    TELEMETRY_AGGREGATE_COLUMNS,
+    PERIODIC_AGGREGATE_COLUMNS,
+    CONTINUOUS_AGGREGATES,
+    CONTINUOUS_AGGREGATE_LEVELS,
+)
+
+# asyncpg 커넥션 풀 (이벤트 루프 위에서 동작하는 라우터 전용)
+_pool: Optional[asyncpg.Pool] = None
+
+# 스트리밍 조회 시 서버 측 커서에서 한 번에 가져올 행 수
+TIMESCALEDB_STREAM_PREFETCH = int(os.getenv("TIMESCALEDB_STREAM_PREFETCH", "1000"))
+# 동시에 열어 둘 수 있는 스트리밍 커서 수 (느린 클라이언트가 풀 커넥션을 모두 점유하지 않도록 풀 크기보다 작게)
+TIMESCALEDB_STREAM_MAX_CONCURRENCY = int(os.getenv("TIMESCALEDB_STREAM_MAX_CONCURRENCY", "3"))
+_stream_slots = asyncio.Semaphore(TIMESCALEDB_STREAM_MAX_CONCURRENCY)
+# LTTB 사전 선별 구간 수 배율: 조회 구간을 max_points * 이 값개로 나눠 구간마다
+# vehicle_speed 최소/최대 행만 DB에서 가져온 뒤 LTTB를 적용 (원본 전체를 읽지 않음)
+TELEMETRY_LTTB_PREBUCKET_RATIO = int(os.getenv("TELEMETRY_LTTB_PREBUCKET_RATIO", "4"))
+
+# 원본 테이블 -> 연속 집계 뷰 이름 접두사, 뷰 버킷 크기 (큰 단위부터)
+_AGGREGATE_VIEW_PREFIXES = {table: prefix for table, prefix, _ in CONTINUOUS_AGGREGATES}
+_AGGREGATE_VIEW_LEVELS = sorted(
+    ((suffix, parse_bucket(width)) for suffix, width, *_ in CONTINUOUS_AGGREGATE_LEVELS),
+    key=lambda level: level[1], reverse=True
+)
+# 뷰 이름 -> 평균 계산에 필요한 {col}_count 컬럼
+_AGGREGATE_VIEW_COUNT_COLUMNS = {
+    f"{prefix}_{suffix}": {f"{column}_count" for column in columns}
+    for _, prefix, columns in CONTINUOUS_AGGREGATES
+    for suffix, *_ in CONTINUOUS_AGGREGATE_LEVELS
+}
+# 풀 생성 시 확인한, 읽을 수 있는 연속 집계 뷰 (None이면 아직 확인 전이므로 모두 사용)
+_usable_views: Optional[set] = None
+
+class RegistryConnection(asyncpg.Connection):
+    """query_registry 문장을 커넥션마다 처음 쓸 때 한 번 prepare해 두고 이름으로 실행하는 커넥션
+
+    풀 커넥션 프록시는 속성 접근을 실제 커넥션으로 넘기므로 pool.acquire()로 받은
+    커넥션에서 바로 fetch_registered()를 호출할 수 있다.
+    fetch/fetch_registered는 실행 시간과 행 수를 metrics에 기록한다.
+    """
+
+    __slots__ = ("_registered",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._registered: Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+    async def registered(self, name: str) -> asyncpg.prepared_stmt.PreparedStatement:
+        statement = self._registered.get(name)
+        if statement is None:
+            statement = await self.prepare(QUERIES[name])
+            self._registered[name] = statement
+        return statement
+
+    async def fetch_registered(self, name: str, *args) -> List[asyncpg.Record]:
+        started = time.perf_counter()
+        rows = []
+        try:
+            statement = await self.registered(name)
+            try:
+                rows = await statement.fetch(*args)
+            except asyncpg.InvalidCachedStatementError:
+                # 테이블 교체(재청크 등)로 결과 형태가 바뀌면 다시 prepare
+                self._registered.pop(name, None)
+                rows = await (await self.registered(name)).fetch(*args)
+            return rows
+        finally:
+            record_query("timescaledb_async", time.perf_counter() - started, len(rows))
+
+    async def fetch(self, query, *args, **kwargs) -> List[asyncpg.Record]:
+        started = time.perf_counter()
+        rows = []
+        try:
+            rows = await super().fetch(query, *args, **kwargs)
+            return rows
+        finally:
+            record_query("timescaledb_async", time.perf_counter() - started, len(rows))
+
+    async def fetchrow_registered(self, name: str, *args) -> Optional[asyncpg.Record]:
+        rows = await self.fetch_registered(name, *args)
+        return rows[0] if rows else None
+
+async def init_async_pool() -> asyncpg.Pool:
+    """asyncpg 커넥션 풀 생성 (이미 있으면 그대로 반환)"""
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            host=TIMESCALEDB_HOST,
+            port=int(TIMESCALEDB_PORT),
+            database=TIMESCALEDB_DB,
+            user=TIMESCALEDB_USER,
+            password=TIMESCALEDB_PASSWORD,
+            min_size=TIMESCALEDB_POOL_MIN_SIZE,
+            max_size=TIMESCALEDB_POOL_MAX_SIZE,
+            connection_class=RegistryConnection,
+            server_settings={"plan_cache_mode": TIMESCALEDB_PLAN_CACHE_MODE},
+        )
+        await _load_usable_views(_pool)
+    return _pool
+
+async def _load_usable_views(pool: asyncpg.Pool):
+    """{col}_count 컬럼까지 갖춘 연속 집계 뷰만 집계 조회에 사용하도록 기록
+
+    init_continuous_aggregates가 다시 만들지 못한 이전 형식의 뷰나 아직 없는 뷰는
+    원본 테이블을 직접 집계한다.
+    """
+    global _usable_views
+    try:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT table_name, column_name FROM information_schema.columns WHERE table_name = ANY($1::text[])",
+                list(_AGGREGATE_VIEW_COUNT_COLUMNS)
+            )
+    except Exception as e:
+        print(f"Failed to check continuous aggregate views: {e}")
+        return
+    existing: Dict[str, set] = {}
+    for row in rows:
+        existing.setdefault(row["table_name"], set()).add(row["column_name"])
+    _usable_views = {
+        view for view, required in _AGGREGATE_VIEW_COUNT_COLUMNS.items()
+        if required <= existing.get(view, set())
+    }
+    for view in sorted(set(_AGGREGATE_VIEW_COUNT_COLUMNS) - _usable_views):
+        print(f"⚠️ 연속 집계 {view}를 사용할 수 없어 원본 테이블을 집계합니다 (뷰가 없거나 컬럼별 행 수가 없음)")
+
+async def close_async_pool():
+    """asyncpg 커넥션 풀 종료"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+def parse_timestamp(value: str) -> datetime:
+    """ISO 8601 문자열을 timestamptz 파라미터로 변환 (타임존이 없으면 UTC로 간주)"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def build_time_condition(params: List[Any], start_time: Optional[str], end_time: Optional[str],
+                         column: str = "timestamp") -> str:
+    """시간 범위 조건을 만들고 params에 바인딩 값을 추가"""
+    if start_time and end_time:
+        params.extend([parse_timestamp(start_time), parse_timestamp(end_time)])
+        return f"AND {column} BETWEEN ${len(params) - 1} AND ${len(params)}"
+    if start_time:
+        params.append(parse_timestamp(start_time))
+        return f"AND {column} >= ${len(params)}"
+    if end_time:
+        params.append(parse_timestamp(end_time))
+        return f"AND {column} <= ${len(params)}"
+    return ""
+
+def _aggregate_source(table: str, bucket: timedelta) -> Tuple[str, str, Optional[timedelta]]:
+    """버킷 크기로 읽을 대상 결정: (테이블 또는 연속 집계 뷰, 시간 컬럼, 뷰 버킷 크기)
+
+    버킷 크기가 일/시간 단위의 배수이면 미리 집계된 뷰를 다시 묶어 읽고,
+    그렇지 않거나 해당 뷰를 쓸 수 없으면 원본 테이블을 time_bucket으로 집계한다.
+    """
+    prefix = _AGGREGATE_VIEW_PREFIXES.get(table)
+    if prefix:
+        for suffix, width in _AGGREGATE_VIEW_LEVELS:
+            view = f"{prefix}_{suffix}"
+            if _usable_views is not None and view not in _usable_views:
+                continue
+            if bucket % width == timedelta(0):
+                return view, "bucket", width
+    return table, "timestamp", None
+
+def _aggregate_expressions(column: str, from_view: bool) -> Tuple[str, str, str]:
+    """(avg, min, max) 집계식. 뷰에서는 sum/{col}_count로 평균을 다시 계산 (avg처럼 NULL 제외)"""
+    if from_view:
+        return (f"(sum({column}_sum) / nullif(sum({column}_count), 0))::float8",
+                f"min({column}_min)", f"max({column}_max)")
+    return f"avg({column})::float8", f"min({column})", f"max({column})"
+
+def _view_parts(table: str, view: str, width: timedelta, columns: Tuple[str, ...], params: List[Any],
+                vehicle_param: str, start_time: Optional[str], end_time: Optional[str]) -> Optional[str]:
+    """연속 집계 뷰와 원본 테이블 가장자리를 합친 부분 집계 서브쿼리 (vehicle_param은 vehicle_id 바인딩 자리)
+
+    뷰에서는 조회 구간 안에 통째로 들어가는 버킷(bucket >= 시작 올림, bucket + width <= 끝)만 읽고,
+    시작/끝 시각이 버킷 경계에 맞지 않아 남는 가장자리는 원본 테이블에서 같은 너비로 집계해
+    UNION ALL로 합친다. 따라서 결과는 원본 테이블을 직접 집계한 것과 같다.
+    구간이 뷰 버킷 하나도 온전히 포함하지 않으면 None (원본 테이블 집계 사용).
+    반환하는 서브쿼리는 뷰와 같은 컬럼(vehicle_id, bucket, sample_count, {컬럼}_sum/_count/_min/_max)을 가진다.
+    """
+    step = width.total_seconds()
+    start = parse_timestamp(start_time) if start_time else None
+    end = parse_timestamp(end_time) if end_time else None
+    # 시작은 다음 버킷 경계로 올림, 끝은 속한 버킷의 시작으로 내림
+    view_start = start + timedelta(seconds=-start.timestamp() % step) if start else None
+    view_end = end - timedelta(seconds=end.timestamp() % step) if end else None
+    if view_start and view_end and view_start >= view_end:
+        return None
+
+    def bind(value) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    view_conditions = "".join(
+        condition for condition in (
+            f" AND bucket >= {bind(view_start)}" if view_start else "",
+            f" AND bucket < {bind(view_end)}" if view_end else "",
+        )
+    )
+    columns_sql = ", ".join(f"{column}_sum, {column}_count, {column}_min, {column}_max" for column in columns)
+    raw_aggregates = ", ".join(
+        f"sum({column}) AS {column}_sum, count({column}) AS {column}_count, "
+        f"min({column}) AS {column}_min, max({column}) AS {column}_max"
+        for column in columns
+    )
+    parts = [f"SELECT vehicle_id, bucket, sample_count, {columns_sql} FROM {view} WHERE vehicle_id = {vehicle_param}{view_conditions}"]
+
+    edges = []
+    if start and start < view_start:
+        edges.append(f"timestamp >= {bind(start)} AND timestamp < {bind(view_start)}")
+    if end:
+        edges.append(f"timestamp >= {bind(view_end)} AND timestamp <= {bind(end)}")
+    for edge in edges:
+        parts.append(f"""SELECT vehicle_id, time_bucket({bind(width)}, timestamp) AS bucket, count(*) AS sample_count,
+                   {raw_aggregates}
+            FROM {table} WHERE vehicle_id = {vehicle_param} AND {edge} GROUP BY 1, 2""")
+    return "(" + "\n            UNION ALL\n            ".join(parts) + ") AS parts"
+
+def _serialize_row(row: asyncpg.Record) -> Dict[str, Any]:
+    # timestamp(datetime)는 render_json이 ISO 문자열로 직렬화
+    return dict(row)
+
+def _serialize_rows(rows: List[asyncpg.Record]) -> List[Dict[str, Any]]:
+    return [_serialize_row(row) for row in rows]
+
+def _registered_params(start_time: Optional[str], end_time: Optional[str]) -> Tuple[str, List[datetime]]:
+    """(TIME_BOUNDS 키, 파싱한 시각 파라미터)"""
+    return time_bounds(start_time, end_time), [parse_timestamp(value) for value in bound_values(start_time, end_time)]
+
+async def _fetch(table: str, vehicle_id: str,
+                 start_time: Optional[str], end_time: Optional[str]) -> List[Dict[str, Any]]:
+    bounds, times = _registered_params(start_time, end_time)
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        rows = await conn.fetch_registered(query_name("raw", table, bounds), vehicle_id, *times)
+    return _serialize_rows(rows)
+
+async def fetch_columns(table: str, vehicle_id: str,
+                        start_time: Optional[str], end_time: Optional[str]) -> Dict[str, List[Any]]:
+    """원본 범위를 컬럼 이름 -> 값 배열로 조회 (timestamp는 epoch 밀리초)
+
+    asyncpg Record(튜플)를 zip으로 바로 전치하므로 행마다 dict를 만들거나
+    datetime을 문자열로 바꾸지 않는다. 행이 없어도 컬럼 이름은 prepare된 문장에서 얻는다.
+    """
+    bounds, times = _registered_params(start_time, end_time)
+    name = query_name("columns", table, bounds)
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        rows = await conn.fetch_registered(name, vehicle_id, *times)
+        names = [attribute.name for attribute in (await conn.registered(name)).get_attributes()]
+    values = zip(*rows) if rows else ([] for _ in names)
+    return {column: list(column_values) for column, column_values in zip(names, values)}
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """페이지 마지막 행의 (timestamp, id)를 불투명한 커서 문자열로 인코딩"""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """encode_cursor의 역변환 (형식이 잘못되면 ValueError)"""
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+async def fetch_page(table: str, vehicle_id: str, start_time: Optional[str], end_time: Optional[str],
+                     limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """(timestamp, id) 키셋 페이지네이션 조회
+
+    반환: {"items": [...], "next_cursor": 다음 페이지 커서 또는 None}
+    """
+    bounds, params = _registered_params(start_time, end_time)
+    kind = "page"
+    if cursor:
+        params.extend(decode_cursor(cursor))
+        kind = "page_after"
+    # 다음 페이지 존재 여부를 알기 위해 한 행 더 조회
+    params.append(limit + 1)
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        rows = await conn.fetch_registered(query_name(kind, table, bounds), vehicle_id, *params)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+    items = []
+    for row in rows:
+        item = _serialize_row(row)
+        del item["id"]
+        items.append(item)
+    return {"items": items, "next_cursor": next_cursor}
+
+class StreamBusyError(Exception):
+    """동시 스트리밍 수 상한 또는 풀 대기 시간 초과 (라우트에서 503으로 응답)"""
+
+async def stream_rows(table: str, vehicle_id: str, start_time: Optional[str],
+                      end_time: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+    """서버 측 커서로 TIMESCALEDB_STREAM_PREFETCH개씩 가져오며 행을 하나씩 내보내는 이터레이터 반환
+
+    결과 전체를 메모리에 올리지 않으므로 조회 구간이 넓어도 메모리 사용량이 일정하다.
+    스트리밍 슬롯과 커넥션 대여, 커서 열기, 첫 배치 조회까지 여기서 끝내므로
+    파라미터 오류(ValueError), 슬롯/풀 대기 초과(StreamBusyError), DB 오류는
+    응답 헤더를 보내기 전에 발생한다. 반환된 이터레이터는 소비가 끝나거나 닫힐 때까지
+    커넥션 하나와 스트리밍 슬롯 하나를 점유한다.
+    """
+    bounds, times = _registered_params(start_time, end_time)
+    batches = _iterate_cursor(query_name("raw", table, bounds), [vehicle_id, *times])
+    first = await batches.__anext__()
+
+    async def rows():
+        try:
+            for row in first:
+                yield row
+            async for batch in batches:
+                for row in batch:
+                    yield row
+        finally:
+            await batches.aclose()
+
+    return rows()
+
+async def _iterate_cursor(name: str, params: List[Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+    # 첫 배치(비어 있을 수 있음)는 항상 내보내고, 이후 배치는 prefetch보다 적게 오면 끝
+    try:
+        await asyncio.wait_for(_stream_slots.acquire(), TIMESCALEDB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise StreamBusyError(f"Too many concurrent streams (max {TIMESCALEDB_STREAM_MAX_CONCURRENCY})")
+    try:
+        pool = await init_async_pool()
+        try:
+            conn = await pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise StreamBusyError(f"Timed out after {TIMESCALEDB_POOL_TIMEOUT}s waiting for a TimescaleDB connection")
+        try:
+            statement = await conn.registered(name)
+            # asyncpg 커서는 트랜잭션 안에서만 사용할 수 있음
+            async with conn.transaction():
+                # DB 시간에는 배치를 기다린 시간만 넣고 클라이언트로 내보내는 동안은 제외
+                rows, db_seconds = 0, 0.0
+                try:
+                    started = time.perf_counter()
+                    cursor = await statement.cursor(*params)
+                    while True:
+                        batch = await cursor.fetch(TIMESCALEDB_STREAM_PREFETCH)
+                        db_seconds += time.perf_counter() - started
+                        rows += len(batch)
+                        if batch or not rows:
+                            yield _serialize_rows(batch)
+                        if len(batch) < TIMESCALEDB_STREAM_PREFETCH:
+                            break
+                        started = time.perf_counter()
+                finally:
+                    record_query("timescaledb_async", db_seconds, rows)
+        finally:
+            await pool.release(conn)
+    finally:
+        _stream_slots.release()
+
+async def get_telemetry_data(vehicle_id: str, start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """특정 차량의 텔레메트리 데이터 조회"""
+    return await _fetch("vehicle_telemetry", vehicle_id, start_time, end_time)
+
+async def get_telemetry_buckets(vehicle_id: str, bucket: Optional[timedelta] = None, max_points: Optional[int] = None,
+                                start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """time_bucket 기반 텔레메트리 다운샘플링 (버킷별 avg/min/max)
+
+    bucket이 없으면 조회 구간을 max_points개 이하로 나누는 버킷 크기를 사용하고,
+    둘 다 주어지면 max_points를 넘지 않도록 bucket을 넓힌다.
+    """
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        if max_points:
+            span = await _telemetry_span(conn, vehicle_id, start_time, end_time)
+            if span is None:
+                return []
+            bucket = max(bucket or timedelta(seconds=1), bucket_for_max_points(span, max_points))
+
+        return await _fetch_buckets(conn, "vehicle_telemetry", TELEMETRY_AGGREGATE_COLUMNS,
+                                    vehicle_id, bucket, start_time, end_time)
+
+async def _telemetry_span(conn: asyncpg.Connection, vehicle_id: str,
+                          start_time: Optional[str], end_time: Optional[str]) -> Optional[timedelta]:
+    """조회 구간 길이. 시작/끝이 모두 없으면 실제 데이터의 첫/마지막 시각으로 계산 (데이터가 없으면 None)"""
+    if start_time and end_time:
+        return parse_timestamp(end_time) - parse_timestamp(start_time)
+    time_bound, times = _registered_params(start_time, end_time)
+    bounds = await conn.fetchrow_registered(query_name("bounds", "vehicle_telemetry", time_bound), vehicle_id, *times)
+    if bounds["first"] is None:
+        return None
+    return bounds["last"] - bounds["first"]
+
+async def get_periodic_buckets(vehicle_id: str, bucket: timedelta,
+                               start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """주기적 데이터 버킷 집계 (배터리 전압, 냉각수/변속기 온도, TPMS, 연료량의 avg/min/max)"""
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        return await _fetch_buckets(conn, "periodic_data", PERIODIC_AGGREGATE_COLUMNS,
+                                    vehicle_id, bucket, start_time, end_time)
+
+def build_bucket_query(table: str, columns: Tuple[str, ...], vehicle_id: str, bucket: timedelta,
+                       start_time: Optional[str], end_time: Optional[str]) -> Tuple[str, List[Any]]:
+    """버킷 집계 문장과 파라미터 (scripts/check_query_plans.py도 같은 문장의 실행 계획을 검사)"""
+    params: List[Any] = [bucket, vehicle_id]
+    source, time_column, view_width = _aggregate_source(table, bucket)
+    if view_width:
+        parts = _view_parts(table, source, view_width, columns, params, "$2", start_time, end_time)
+        if parts is None:
+            source, time_column, view_width = table, "timestamp", None
+        else:
+            source = parts
+    # 뷰 경로의 시간 범위는 서브쿼리 안에서 이미 적용됨
+    time_condition = "" if view_width else build_time_condition(params, start_time, end_time, time_column)
+    selects = []
+    for column in columns:
+        avg_expr, min_expr, max_expr = _aggregate_expressions(column, bool(view_width))
+        selects.append(f"{avg_expr} AS {column}, {min_expr} AS {column}_min, {max_expr} AS {column}_max")
+
+    # 뷰에도 bucket 컬럼이 있으므로 GROUP BY/ORDER BY는 위치로 지정
+    return f"""
+        SELECT time_bucket($1, {time_column}) AS bucket,
+               {"sum(sample_count)::int8" if view_width else "count(*)"} AS sample_count,
+               {", ".join(selects)}
+        FROM {source}
+        WHERE vehicle_id = $2 {time_condition}
+        GROUP BY 1
+        ORDER BY 1 ASC
+    """, params
+
+async def _fetch_buckets(conn: asyncpg.Connection, table: str, columns: Tuple[str, ...], vehicle_id: str,
+                         bucket: timedelta, start_time: Optional[str], end_time: Optional[str]) -> List[Dict[str, Any]]:
+    query, params = build_bucket_query(table, columns, vehicle_id, bucket, start_time, end_time)
+    rows = await conn.fetch(query, *params)
+    return [
+        {"vehicle_id": vehicle_id, **{k: v for k, v in row.items() if k != "bucket"}, "timestamp": row["bucket"]}
+        for row in rows
+    ]
+
+async def get_telemetry_lttb(vehicle_id: str, max_points: int,
+                             start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """LTTB 기반 텔레메트리 다운샘플링 (vehicle_speed 곡선의 형태를 보존하는 max_points개의 원본 행)
+
+    원본 전체 대신 max_points * TELEMETRY_LTTB_PREBUCKET_RATIO개 구간마다 vehicle_speed가
+    가장 낮은 행과 높은 행만 DB에서 골라 오므로(MinMaxLTTB) 조회 구간이 넓어도
+    가져오는 행 수는 약 2 * max_points * TELEMETRY_LTTB_PREBUCKET_RATIO개다.
+    """
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        span = await _telemetry_span(conn, vehicle_id, start_time, end_time)
+        if span is None:
+            return []
+        width = max(span / (max_points * TELEMETRY_LTTB_PREBUCKET_RATIO), timedelta(milliseconds=1))
+        params: List[Any] = [width, vehicle_id]
+        time_condition = build_time_condition(params, start_time, end_time)
+        columns = RAW_COLUMNS["vehicle_telemetry"]
+        rows = await conn.fetch(f"""
+            SELECT {columns}
+            FROM (
+                SELECT {columns},
+                       row_number() OVER (PARTITION BY time_bucket($1, timestamp)
+                                          ORDER BY coalesce(vehicle_speed, 0) ASC, timestamp) AS low,
+                       row_number() OVER (PARTITION BY time_bucket($1, timestamp)
+                                          ORDER BY coalesce(vehicle_speed, 0) DESC, timestamp) AS high
+                FROM vehicle_telemetry
+                WHERE vehicle_id = $2 {time_condition}
+            ) AS ranked
+            WHERE low = 1 OR high = 1
+            ORDER BY timestamp ASC
+        """, *params)
+
+    if len(rows) > max_points:
+        x = np.fromiter((row["timestamp"].timestamp() for row in rows), dtype=np.float64, count=len(rows))
+        y = np.fromiter((row["vehicle_speed"] or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+        rows = [rows[i] for i in lttb_indices(x, y, max_points)]
+    return _serialize_rows(rows)
+
+async def get_telemetry_summary(vehicle_id: str, start_time: str = None, end_time: str = None,
+                                group_by: Optional[str] = None,
+                                percentiles: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+    """텔레메트리 요약 통계를 DB에서 집계 (count/avg/min/max, 선택적으로 백분위수)
+
+    group_by가 hour/day이면 구간별로 한 행씩, 없으면 전체 구간에 대해 한 행을 반환한다.
+    """
+    query, params = build_summary_query(vehicle_id, start_time, end_time, group_by, percentiles)
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        rows = await conn.fetch(query, *params)
+
+    summaries = []
+    for row in rows:
+        summary = {key: (0 if value is None else value) for key, value in row.items()
+                   if key not in ("bucket", "speed_percentiles", "rpm_percentiles")}
+        if group_by:
+            summary = {"timestamp": row["bucket"].isoformat(), **summary}
+        for p, speed, rpm in zip(percentiles or [], row.get("speed_percentiles") or [], row.get("rpm_percentiles") or []):
+            label = f"{p:g}".replace(".", "_")
+            summary[f"p{label}_speed"] = speed
+            summary[f"p{label}_rpm"] = rpm
+        summaries.append(summary)
+    return summaries
+
+def build_summary_query(vehicle_id: str, start_time: Optional[str], end_time: Optional[str],
+                        group_by: Optional[str] = None,
+                        percentiles: Optional[List[float]] = None) -> Tuple[str, List[Any]]:
+    """요약 통계 문장과 파라미터 (scripts/check_query_plans.py도 같은 문장의 실행 계획을 검사)"""
+    params: List[Any] = [vehicle_id]
+    source, time_column, view_width = "vehicle_telemetry", "timestamp", None
+    if group_by and not percentiles:
+        # 백분위수는 연속 집계로 다시 묶을 수 없으므로 그때만 뷰를 읽는다
+        source, time_column, view_width = _aggregate_source("vehicle_telemetry", parse_bucket(f"1 {group_by}"))
+        if view_width:
+            parts = _view_parts("vehicle_telemetry", source, view_width, ("vehicle_speed", "engine_rpm"),
+                                params, "$1", start_time, end_time)
+            if parts is None:
+                source, time_column, view_width = "vehicle_telemetry", "timestamp", None
+            else:
+                source = parts
+    time_condition = "" if view_width else build_time_condition(params, start_time, end_time, time_column)
+
+    bucket_select = ""
+    group_clause = ""
+    if group_by:
+        bucket_select = f"time_bucket(INTERVAL '1 {group_by}', {time_column}) AS bucket,"
+        group_clause = "GROUP BY 1 ORDER BY 1 ASC"
+
+    percentile_select = ""
+    if percentiles:
+        params.append([p / 100 for p in percentiles])
+        percentile_select = f""",
+               percentile_cont(${len(params)}::float8[]) WITHIN GROUP (ORDER BY vehicle_speed) AS speed_percentiles,
+               percentile_cont(${len(params)}::float8[]) WITHIN GROUP (ORDER BY engine_rpm) AS rpm_percentiles"""
+
+    avg_speed, min_speed, max_speed = _aggregate_expressions("vehicle_speed", bool(view_width))
+    avg_rpm, min_rpm, max_rpm = _aggregate_expressions("engine_rpm", bool(view_width))
+
+    return f"""
+        SELECT {bucket_select}
+               {"sum(sample_count)::int8" if view_width else "count(*)"} AS count,
+               round(({avg_speed})::numeric, 2)::float8 AS avg_speed,
+               {max_speed} AS max_speed,
+               {min_speed} AS min_speed,
+               round(({avg_rpm})::numeric, 2)::float8 AS avg_rpm,
+               {max_rpm} AS max_rpm,
+               {min_rpm} AS min_rpm{percentile_select}
+        FROM {source}
+        WHERE vehicle_id = $1 {time_condition}
+        {group_clause}
+    """, params
+
+async def get_events_for_vehicle(vehicle_id: str, start_time: str = None, end_time: str = None) -> Dict[str, List[Dict[str, Any]]]:
+    """특정 차량의 이벤트 데이터 조회
+
+    네 개의 이벤트 테이블을 각각 다른 풀 커넥션에서 동시에 조회하므로
+    응답 시간은 네 쿼리의 합이 아니라 가장 느린 쿼리 하나에 가깝다.
+    """
+    engine_off, collision, sudden_acceleration, warning_light = await asyncio.gather(
+        _fetch("engine_off_events", vehicle_id, start_time, end_time),
+        _fetch("collision_events", vehicle_id, start_time, end_time),
+        get_sudden_acceleration_events(vehicle_id, start_time, end_time),
+        get_warning_light_events(vehicle_id, start_time, end_time),
+    )
+    return {
+        "engine_off_events": engine_off,
+        "collision_events": collision,
+        "sudden_acceleration_events": sudden_acceleration,
+        "warning_light_events": warning_light,
+    }
+
+async def get_fleet_event_counts(vehicle_ids: List[str], start_time: str = None,
+                                 end_time: str = None) -> Dict[str, Dict[str, Any]]:
+    """여러 차량의 이벤트 테이블별 건수와 마지막 이벤트 시각을 쿼리 한 번으로 조회
+
+    네 테이블을 UNION ALL로 묶어 vehicle_id = ANY($1)로 한꺼번에 집계하므로
+    차량 수와 관계없이 왕복은 한 번이다. 이벤트가 없는 차량도 0건으로 채워 반환한다.
+    """
+    bounds, times = _registered_params(start_time, end_time)
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        rows = await conn.fetch_registered(query_name("fleet_counts", "events", bounds), list(vehicle_ids), *times)
+
+    counts = {
+        vehicle_id: {**{table: 0 for table in EVENT_TABLES}, "last_event_at": None}
+        for vehicle_id in vehicle_ids
+    }
+    last_events: Dict[str, datetime] = {}
+    for row in rows:
+        counts[row["vehicle_id"]][row["event_table"]] = row["event_count"]
+        previous = last_events.get(row["vehicle_id"])
+        if previous is None or row["last_event_at"] > previous:
+            last_events[row["vehicle_id"]] = row["last_event_at"]
+    for vehicle_id, last_event_at in last_events.items():
+        counts[vehicle_id]["last_event_at"] = last_event_at.isoformat()
+    return counts
+
+async def get_sudden_acceleration_events(vehicle_id: str, start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """급가속 이벤트 조회"""
+    return await _fetch("sudden_acceleration_events", vehicle_id, start_time, end_time)
+
+async def get_warning_light_events(vehicle_id: str, start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """경고등 이벤트 조회"""
+    return await _fetch("warning_light_events", vehicle_id, start_time, end_time)
+
+async def get_periodic_data(vehicle_id: str, start_time: str = None, end_time: str = None) -> List[Dict[str, Any]]:
+    """주기적 데이터 조회 (위치, 온도, 배터리 등)"""
+    return await _fetch("periodic_data", vehicle_id, start_time, end_time)
+
+async def get_chunk_sizes(table: str) -> Dict[str, Any]:
+    """하이퍼테이블의 청크별 범위, 압축 여부, 압축 전/후 크기 조회"""
+    if table not in RAW_COLUMNS:
+        raise ValueError(f"Unknown table '{table}'")
+    query = """
+        SELECT c.chunk_name, c.range_start, c.range_end, c.is_compressed,
+               d.total_bytes,
+               s.before_compression_total_bytes,
+               s.after_compression_total_bytes
+        FROM timescaledb_information.chunks c
+        LEFT JOIN chunks_detailed_size($1::regclass) d
+               ON d.chunk_schema = c.chunk_schema AND d.chunk_name = c.chunk_name
+        LEFT JOIN chunk_compression_stats($1::regclass) s
+               ON s.chunk_schema = c.chunk_schema AND s.chunk_name = c.chunk_name
+        WHERE c.hypertable_name = $1
+        ORDER BY c.range_start
+    """
+    pool = await init_async_pool()
+    async with pool.acquire(timeout=TIMESCALEDB_POOL_TIMEOUT) as conn:
+        rows = await conn.fetch(query, table)
+
+    chunks = []
+    uncompressed_bytes = on_disk_bytes = 0
+    for row in rows:
+        before = row["before_compression_total_bytes"]
+        after = row["after_compression_total_bytes"]
+        total = row["total_bytes"] or 0
+        # 압축된 청크는 압축 전 크기, 아니면 현재 크기를 원래 크기로 봄
+        uncompressed_bytes += before if row["is_compressed"] and before else total
+        on_disk_bytes += total
+        chunks.append({
+            "chunk_name": row["chunk_name"],
+            "range_start": row["range_start"].isoformat() if row["range_start"] else None,
+            "range_end": row["range_end"].isoformat() if row["range_end"] else None,
+            "is_compressed": row["is_compressed"],
+            "total_bytes": total,
+            "before_compression_bytes": before,
+            "after_compression_bytes": after,
+            "compression_ratio": round(before / after, 2) if before and after else None,
+        })
+    return {
+        "table": table,
+        "chunks": len(chunks),
+        "compressed_chunks": sum(1 for chunk in chunks if chunk["is_compressed"]),
+        "uncompressed_bytes": uncompressed_bytes,
+        "on_disk_bytes": on_disk_bytes,
+        "compression_ratio": round(uncompressed_bytes / on_disk_bytes, 2) if on_disk_bytes else None,
+        "chunk_sizes": chunks,
+    }
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+
+from . import models
+from .db import SessionLocal, has_column
+
+# 변경 여부 확인 주기 (초). 확인은 COUNT/MAX(updated_at) 한 번이고 바뀌었을 때만 전체를 다시 읽음
+VEHICLE_REGISTRY_REFRESH_INTERVAL = float(os.getenv("VEHICLE_REGISTRY_REFRESH_INTERVAL", "60"))
+# 마지막 전체 적재 후 이 시간(초)이 지나면 버전이 같아도 다시 읽음
+# (같은 초 안의 삭제+추가처럼 COUNT/MAX(updated_at)로 드러나지 않는 변경 대비)
+VEHICLE_REGISTRY_FORCE_RELOAD_INTERVAL = float(os.getenv("VEHICLE_REGISTRY_FORCE_RELOAD_INTERVAL", "900"))
+# 모르는 vehicle_id 요청 시 이 시간(초)이 지났으면 즉시 변경 여부를 다시 확인 (방금 추가된 차량 대비)
+VEHICLE_REGISTRY_MISS_REFRESH_INTERVAL = float(os.getenv("VEHICLE_REGISTRY_MISS_REFRESH_INTERVAL", "5"))
+
+
+class VehicleRegistry:
+    """vehicles 테이블 전체를 메모리에 올려 목록/개수/존재 확인을 DB 없이 처리
+
+    읽기 쪽은 잠금 없이 현재 스냅샷을 참조하고, 갱신은 새 스냅샷을 만들어 통째로 교체한다.
+    아직 한 번도 읽지 못했으면 loaded가 False이며, 이때 라우터는 기존처럼 DB를 조회한다.
+    """
+
+    def __init__(self):
+        self._vehicles: List[Dict[str, Any]] = []
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._version: Optional[Tuple[int, Any]] = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self.loaded = False
+
+    def _probe(self, db) -> Tuple[int, Any]:
+        # updated_at은 추가와 model/year 수정 모두에서 바뀜 (삭제는 COUNT로 감지)
+        # 마이그레이션 전 DB는 created_at으로 대체: 수정은 강제 재적재 주기에만 반영됨
+        if has_column(db, models.Vehicle.__tablename__, "updated_at"):
+            changed_attr = models.Vehicle.updated_at
+        else:
+            changed_attr = models.Vehicle.created_at
+        return db.query(func.count(models.Vehicle.vehicle_id), func.max(changed_attr)).one()
+
+    def refresh(self, force: bool = False, max_age: Optional[float] = None) -> bool:
+        """버전이 바뀌었을 때만 차량 목록을 다시 읽음. 다시 읽었으면 True
+
+        max_age가 주어지면 잠금을 얻은 뒤 마지막 확인이 그보다 최근인지 다시 보고,
+        그 사이 다른 스레드가 이미 확인했다면 DB에 가지 않는다.
+        """
+        with self._refresh_lock:
+            if max_age is not None and self.loaded and time.monotonic() - self._checked_at < max_age:
+                return False
+            db = SessionLocal()
+            try:
+                version = tuple(self._probe(db))
+                self._checked_at = time.monotonic()
+                if self._checked_at - self._loaded_at >= VEHICLE_REGISTRY_FORCE_RELOAD_INTERVAL:
+                    force = True
+                if not force and self.loaded and version == self._version:
+                    return False
+                rows = (
+                    db.query(models.Vehicle.vehicle_id, models.Vehicle.model, models.Vehicle.year)
+                    .order_by(models.Vehicle.vehicle_id)
+                    .all()
+                )
+            finally:
+                db.close()
+
+            vehicles = [{"vehicle_id": vehicle_id, "model": model, "year": year} for vehicle_id, model, year in rows]
+            self._vehicles = vehicles
+            self._index = {vehicle["vehicle_id"]: vehicle for vehicle in vehicles}
+            self._version = version
+            self._loaded_at = self._checked_at
+            self.loaded = True
+            return True
+
+    def load(self) -> bool:
+        """시작 시 초기 적재. 실패해도 기동은 계속하고 백그라운드 갱신에서 다시 시도"""
+        try:
+            self.refresh(force=True)
+            print(f"Vehicle registry loaded: {len(self._vehicles)} vehicles")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to load vehicle registry at startup: {e}")
+            print(
+                "❌ 차량 레지스트리 없이 기동합니다. 다음 갱신이 성공할 때까지 모든 요청이 DB로 차량을 조회합니다 "
+                f"(재시도 주기 {VEHICLE_REGISTRY_REFRESH_INTERVAL:g}초)"
+            )
+            traceback.print_exc()
+            return False
+
+    async def refresh_loop(self, interval: float = VEHICLE_REGISTRY_REFRESH_INTERVAL):
+        """lifespan에서 실행하는 주기적 갱신 태스크"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await run_in_threadpool(self.refresh):
+                    print(f"Vehicle registry reloaded: {len(self._vehicles)} vehicles")
+            except Exception as e:
+                print(f"Failed to refresh vehicle registry: {e}")
+
+    def vehicles(self) -> List[Dict[str, Any]]:
+        return self._vehicles
+
+    def count(self) -> int:
+        return len(self._vehicles)
+
+    def get(self, vehicle_id: str) -> Optional[Dict[str, Any]]:
+        return self._index.get(vehicle_id)
+
+    def contains(self, vehicle_id: str) -> Optional[bool]:
+        """등록 여부. 아직 적재 전이면 None (판단 불가)"""
+        if not self.loaded:
+            return None
+        if vehicle_id in self._index:
+            return True
+        # 방금 추가된 차량일 수 있으므로 마지막 확인 후 일정 시간이 지났으면 한 번 더 확인
+        if time.monotonic() - self._checked_at >= VEHICLE_REGISTRY_MISS_REFRESH_INTERVAL:
+            try:
+                self.refresh(max_age=VEHICLE_REGISTRY_MISS_REFRESH_INTERVAL)
+            except Exception as e:
+                print(f"Failed to refresh vehicle registry: {e}")
+        return vehicle_id in self._index
+
+    def stats(self) -> Dict[str, Any]:
+        last_updated_at = self._version[1] if self._version else None
+        return {
+            "loaded": self.loaded,
+            "vehicles": len(self._vehicles),
+            "last_updated_at": last_updated_at.isoformat() if last_updated_at else None,
+            "checked_seconds_ago": round(time.monotonic() - self._checked_at, 1) if self.loaded else None,
+            "loaded_seconds_ago": round(time.monotonic() - self._loaded_at, 1) if self.loaded else None,
+        }
+
+
+vehicle_registry = VehicleRegistry()
+
+
+def require_known_vehicle(vehicle_id: str) -> None:
+    """등록되지 않은 vehicle_id면 DB 조회 없이 404 (sync 라우트용 의존성)"""
+    if vehicle_registry.contains(vehicle_id) is False:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+
+async def require_known_vehicle_async(vehicle_id: str) -> None:
+    """이벤트 루프를 막지 않는 비동기 라우트용 의존성
+
+    등록된 차량이면 바로 통과하고, 모르는 ID일 때만 (변경 확인이 필요할 수 있으므로) 스레드풀에서 확인한다.
+    """
+    if not vehicle_registry.loaded or vehicle_registry.get(vehicle_id) is not None:
+        return
+    if await run_in_threadpool(vehicle_registry.contains, vehicle_id) is False:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+API 동시 요청 지연 시간 벤치마크
+- 실행 중인 백엔드에 동시에 여러 요청을 보내 p50/p95/p99 지연 시간과 처리량 측정
+- 변경 전/후 빌드에 같은 옵션으로 실행해 결과 비교
+
+사용 예:
+  python scripts/benchmark_api_latency.py --base-url http://localhost:8000 \
+      --path "/api/telemetry/VHC-001?start_time=2025-09-23T01:54:26&end_time=2025-09-23T02:54:26" \
+      --path /api/events/VHC-001 --concurrency 50 --requests 500
+"""
+
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def timed_request(url, timeout):
+    """요청 1회의 (지연 시간(ms), HTTP 상태, 응답 바이트 수) 반환"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body = b""
+        status = e.code
+    except Exception:
+        body = b""
+        status = 0
+    return (time.perf_counter() - started) * 1000, status, len(body)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run(base_url, paths, concurrency, total_requests, timeout):
+    urls = [base_url.rstrip("/") + paths[i % len(paths)] for i in range(total_requests)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda url: timed_request(url, timeout), urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if r[1] != 200)
+    payload = sum(r[2] for r in results)
+
+    print(f"📊 요청 {total_requests}개, 동시성 {concurrency}")
+    print(f"  - 처리량: {total_requests / elapsed:.1f} req/s (총 {elapsed:.2f}초)")
+    print(f"  - p50: {percentile(latencies, 50):.1f} ms")
+    print(f"  - p95: {percentile(latencies, 95):.1f} ms")
+    print(f"  - p99: {percentile(latencies, 99):.1f} ms")
+    print(f"  - max: {latencies[-1]:.1f} ms, 평균: {statistics.mean(latencies):.1f} ms")
+    print(f"  - 실패: {errors}개, 응답 크기 합계: {payload / 1024:.1f} KiB")
+    return {
+        "throughput": total_requests / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": latencies[-1],
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="API 동시 요청 지연 시간 벤치마크")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="요청할 경로 (여러 번 지정하면 순서대로 번갈아 요청)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    run(args.base_url, args.paths or ["/api/telemetry/VHC-001"], args.concurrency, args.requests, args.timeout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+TimescaleDB 벌크 적재 처리량 벤치마크
+- 테이블마다 합성 데이터를 만들어 적재 방식별 rows/s 측정
+  - copy: COPY FROM STDIN → 스테이징 테이블 → INSERT ... ON CONFLICT DO NOTHING
+  - values: execute_values 다중 행 INSERT
+  - executemany: 기존 batch_write_telemetry_data 방식 (행마다 INSERT 한 번)
+- 벤치마크 행은 vehicle_id가 BENCH-로 시작하며 측정 후 삭제됨
+
+사용 예:
+  python scripts/benchmark_bulk_load.py --rows 20000 --batch-size 5000
+"""
+
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.timescaledb import (
+    init_timescaledb,
+    bulk_write_rows,
+    get_timescaledb_connection,
+    release_timescaledb_connection,
+    TABLE_COLUMNS
+)
+
+BASE_TIMESTAMP = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+def sample_value(column, i):
+    """컬럼 이름에 맞는 합성 값"""
+    if column == "vehicle_id":
+        return f"BENCH-{i % 10:03d}"
+    if column == "timestamp":
+        return BASE_TIMESTAMP + timedelta(seconds=i)
+    if column == "engine_rpm":
+        return random.randint(800, 6000)
+    if column == "damage":
+        return random.randint(0, 100)
+    if column == "ignition":
+        return random.random() < 0.5
+    if column in ("gear_status", "gear_position_mode"):
+        return random.choice(["P", "R", "N", "D"])
+    if column == "side":
+        return "front"
+    if column == "warning_type":
+        return random.choice(["engine", "battery", "oil", "tpms"])
+    return round(random.uniform(0, 100), 3)
+
+def generate_rows(table, count):
+    columns = TABLE_COLUMNS[table]
+    return [tuple(sample_value(column, i) for column in columns) for i in range(count)]
+
+def cleanup(table):
+    conn = get_timescaledb_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"DELETE FROM {table} WHERE vehicle_id LIKE 'BENCH-%%'")
+        conn.commit()
+    finally:
+        release_timescaledb_connection(conn)
+
+def write_executemany(table, rows, batch_size):
+    columns = TABLE_COLUMNS[table]
+    conn = get_timescaledb_connection()
+    try:
+        cursor = conn.cursor()
+        placeholders = ", ".join(["%s"] * len(columns))
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) ON CONFLICT DO NOTHING",
+                rows[start:start + batch_size]
+            )
+            conn.commit()
+        return len(rows)
+    finally:
+        release_timescaledb_connection(conn)
+
+def main():
+    parser = argparse.ArgumentParser(description="TimescaleDB 벌크 적재 처리량 벤치마크")
+    parser.add_argument("--rows", type=int, default=20000, help="테이블당 적재할 행 수")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--methods", default="copy,values,executemany")
+    parser.add_argument("--tables", default=",".join(TABLE_COLUMNS))
+    args = parser.parse_args()
+
+    if not init_timescaledb():
+        print("❌ TimescaleDB 초기화 실패")
+        return
+
+    for table in args.tables.split(","):
+        rows = generate_rows(table, args.rows)
+        print(f"\n📊 {table} ({args.rows}행, 배치 {args.batch_size})")
+        for method in args.methods.split(","):
+            cleanup(table)
+            started = time.perf_counter()
+            if method == "executemany":
+                written = write_executemany(table, rows, args.batch_size)
+            else:
+                written = bulk_write_rows(table, rows, args.batch_size, method)
+            elapsed = time.perf_counter() - started
+            if written is None:
+                print(f"  ❌ {method}: 적재 실패")
+                continue
+            print(f"  - {method:<12} {written / elapsed:>12,.0f} rows/s ({elapsed:.2f}초)")
+        cleanup(table)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+청크 간격/공간 파티션 설정별 범위 조회 지연 벤치마크
+- 설정마다 vehicle_telemetry와 같은 형태의 임시 하이퍼테이블(bench_chunks_N)을 만들고
+  generate_series로 합성 텔레메트리를 서버에서 직접 적재
+- (vehicle_id, timestamp DESC) 복합 인덱스와 ANALYZE 후, 차량 하나의 1시간/1일/7일 범위
+  조회를 무작위 차량과 구간으로 반복해 p50/p95 지연과 계획 단계에서 남은 청크 수 측정
+- 측정이 끝나면 임시 테이블은 삭제됨
+
+사용 예:
+  python scripts/benchmark_chunk_settings.py --vehicles 20 --days 14 --sample-seconds 10
+  python scripts/benchmark_chunk_settings.py --config "7 days:0" --config "1 day:4"
+"""
+
+import sys
+import os
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.timescaledb import (
+    get_timescaledb_connection,
+    release_timescaledb_connection,
+    add_space_partitioning,
+)
+
+DEFAULT_CONFIGS = ("7 days:0", "1 day:0", "6 hours:0", "1 day:4")
+RANGES = (("1h", timedelta(hours=1)), ("1d", timedelta(days=1)), ("7d", timedelta(days=7)))
+BASE_TIMESTAMP = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+def create_table(conn, table, chunk_interval, partitions, vehicles, days, sample_seconds):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table};")
+    cursor.execute(f"""
+        CREATE TABLE {table} (
+            id SERIAL,
+            vehicle_id VARCHAR(50) NOT NULL,
+            vehicle_speed FLOAT,
+            engine_rpm INTEGER,
+            throttle_position FLOAT,
+            timestamp TIMESTAMPTZ NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            PRIMARY KEY (id, timestamp)
+        );
+    """)
+    cursor.execute(
+        "SELECT create_hypertable(%s, 'timestamp', chunk_time_interval => %s::interval);",
+        (table, chunk_interval)
+    )
+    if partitions:
+        add_space_partitioning(cursor, table, partitions)
+    cursor.execute(f"""
+        INSERT INTO {table} (vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp)
+        SELECT 'BENCH-' || lpad(v::text, 3, '0'), random() * 120, (800 + random() * 5000)::int,
+               random() * 100, ts
+        FROM generate_series(0, %s - 1) v,
+             generate_series(%s::timestamptz, %s::timestamptz - interval '1 second', %s * interval '1 second') ts
+    """, (vehicles, BASE_TIMESTAMP, BASE_TIMESTAMP + timedelta(days=days), sample_seconds))
+    cursor.execute(f"CREATE INDEX ON {table} (vehicle_id, timestamp DESC);")
+    conn.commit()
+    conn.autocommit = True
+    try:
+        conn.cursor().execute(f"ANALYZE {table};")
+    finally:
+        conn.autocommit = False
+    cursor.execute("SELECT count(*) FROM timescaledb_information.chunks WHERE hypertable_name = %s", (table,))
+    return cursor.fetchone()[0]
+
+def count_scanned_chunks(plan):
+    """계획에 남은 청크(_hyper_ 릴레이션) 수"""
+    count = 1 if plan.get("Relation Name", "").startswith("_hyper_") else 0
+    return count + sum(count_scanned_chunks(child) for child in plan.get("Plans", []))
+
+def measure(conn, table, span, vehicles, days, queries):
+    cursor = conn.cursor()
+    sql = f"""
+        SELECT vehicle_id, vehicle_speed, engine_rpm, throttle_position, timestamp
+        FROM {table}
+        WHERE vehicle_id = %s AND timestamp BETWEEN %s AND %s
+        ORDER BY timestamp ASC
+    """
+    max_offset = max(timedelta(days=days) - span, timedelta(0))
+    samples = []
+    for _ in range(queries):
+        vehicle_id = f"BENCH-{random.randrange(vehicles):03d}"
+        start = BASE_TIMESTAMP + max_offset * random.random()
+        params = (vehicle_id, start, start + span)
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        samples.append(time.perf_counter() - started)
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+    chunks = count_scanned_chunks(cursor.fetchone()[0][0]["Plan"])
+    conn.rollback()
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+        "rows": len(rows),
+        "chunks": chunks,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 설정별 범위 조회 지연 벤치마크")
+    parser.add_argument("--config", action="append", dest="configs",
+                        help='"청크 간격:공간 파티션 수" (예: "1 day:4"), 여러 번 지정 가능')
+    parser.add_argument("--vehicles", type=int, default=20)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--sample-seconds", type=int, default=10, help="차량별 행 간격 (초)")
+    parser.add_argument("--queries", type=int, default=100, help="범위마다 반복할 조회 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    conn = get_timescaledb_connection()
+    if not conn:
+        print("❌ TimescaleDB 연결 실패")
+        sys.exit(2)
+
+    results = []
+    try:
+        for i, config in enumerate(args.configs or DEFAULT_CONFIGS):
+            chunk_interval, _, partitions = config.partition(":")
+            partitions = int(partitions or 0)
+            table = f"bench_chunks_{i}"
+            try:
+                started = time.perf_counter()
+                chunk_count = create_table(conn, table, chunk_interval, partitions,
+                                           args.vehicles, args.days, args.sample_seconds)
+                load_seconds = time.perf_counter() - started
+                for label, span in RANGES:
+                    stats = measure(conn, table, span, args.vehicles, args.days, args.queries)
+                    results.append({
+                        "chunk_interval": chunk_interval,
+                        "space_partitions": partitions,
+                        "total_chunks": chunk_count,
+                        "load_seconds": round(load_seconds, 2),
+                        "range": label,
+                        **stats,
+                    })
+            finally:
+                conn.rollback()
+                conn.cursor().execute(f"DROP TABLE IF EXISTS {table};")
+                conn.commit()
+    finally:
+        release_timescaledb_connection(conn)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'chunk_interval':<15} {'parts':>5} {'chunks':>7} {'range':>5} "
+          f"{'scanned':>8} {'rows':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for r in results:
+        print(f"{r['chunk_interval']:<15} {r['space_partitions']:>5} {r['total_chunks']:>7} {r['range']:>5} "
+              f"{r['chunks']:>8} {r['rows']:>7} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+응답 압축 전송 바이트/CPU 비용 벤치마크
+- 실행 중인 백엔드의 각 경로를 Accept-Encoding별로 요청해 전송 바이트(wire)와 지연 시간 측정
+  (urllib은 응답을 자동으로 풀지 않으므로 읽은 바이트 수가 곧 전송 바이트)
+- identity 본문을 이 프로세스에서 인코딩/레벨별로 다시 압축해 응답 1회당 압축 CPU 시간과 압축률 비교
+  (COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY / COMPRESSION_ZSTD_LEVEL 선택 근거)
+- --server-stats를 주면 서버가 누적한 /api/admin/compression 라우트별 통계도 출력
+  (관리 API 토큰은 --admin-token 또는 ADMIN_API_TOKEN 환경 변수)
+
+사용 예:
+  python scripts/benchmark_compression.py --base-url http://localhost:8000 \
+      --path "/api/telemetry/VHC-001?start_time=2025-09-23T01:54:26&end_time=2025-09-23T02:54:26" \
+      --path "/api/telemetry/VHC-001?start_time=2025-09-23T01:54:26&end_time=2025-09-23T02:54:26&format=ndjson" \
+      --path /api/events/VHC-001 --repeat 5 --server-stats
+"""
+
+import sys
+import os
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+import zlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import available_encodings
+
+# 인코딩별로 비교할 레벨 (gzip/zstd는 level, br는 quality)
+LEVELS = {
+    "gzip": (1, 5, 6, 9),
+    "br": (1, 4, 5, 11),
+    "zstd": (1, 3, 6, 19),
+}
+
+def fetch(url, accept_encoding, timeout, headers=None):
+    """(지연 시간(ms), 본문 바이트, Content-Encoding) 반환"""
+    request = urllib.request.Request(url, headers={"Accept-Encoding": accept_encoding, **(headers or {})})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        encoding = response.headers.get("Content-Encoding", "identity")
+    return (time.perf_counter() - started) * 1000, body, encoding
+
+def compress_once(encoding, level, body):
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush()
+    if encoding == "br":
+        import brotli
+        return brotli.compress(body, quality=level)
+    import zstandard
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+def measure_wire(url, encodings, repeat, timeout):
+    print(f"  {'accept-encoding':<16} {'encoding':<9} {'wire KiB':>10} {'ratio':>7} {'p50 ms':>8}")
+    identity_size = None
+    identity_body = b""
+    for accept in ("identity", *encodings):
+        latencies, size, served = [], 0, "identity"
+        for _ in range(repeat):
+            latency, body, served = fetch(url, accept, timeout)
+            latencies.append(latency)
+            size = len(body)
+            if accept == "identity":
+                identity_body = body
+        identity_size = identity_size or size
+        print(f"  {accept:<16} {served:<9} {size / 1024:>10.1f} {identity_size / size if size else 0:>6.1f}x "
+              f"{statistics.median(latencies):>8.1f}")
+    return identity_body
+
+def measure_cpu(body, encodings, repeat):
+    print(f"  {'encoding':<9} {'level':>5} {'KiB':>10} {'ratio':>7} {'cpu ms':>8} {'MB/s':>8}")
+    for encoding in encodings:
+        for level in LEVELS[encoding]:
+            cpu_times = []
+            for _ in range(repeat):
+                started = time.process_time()
+                data = compress_once(encoding, level, body)
+                cpu_times.append(time.process_time() - started)
+            cpu = statistics.median(cpu_times)
+            print(f"  {encoding:<9} {level:>5} {len(data) / 1024:>10.1f} {len(body) / len(data):>6.1f}x "
+                  f"{cpu * 1000:>8.2f} {len(body) / 1e6 / cpu if cpu else 0:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 압축 전송 바이트/CPU 비용 벤치마크")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="요청할 경로 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--server-stats", action="store_true",
+                        help="서버의 /api/admin/compression 누적 통계 출력")
+    parser.add_argument("--admin-token", default=os.getenv("ADMIN_API_TOKEN", ""),
+                        help="관리 API 토큰 (X-Admin-Token)")
+    args = parser.parse_args()
+
+    # 이 프로세스에 설치된 라이브러리 기준 (서버에 없는 인코딩은 identity로 응답됨)
+    encodings = [name for name in ("zstd", "br", "gzip") if name in available_encodings()]
+    base_url = args.base_url.rstrip("/")
+    for path in args.paths or ["/api/telemetry/VHC-001"]:
+        print(f"📦 {path}")
+        body = measure_wire(base_url + path, encodings, args.repeat, args.timeout)
+        if body:
+            measure_cpu(body, encodings, args.repeat)
+
+    if args.server_stats:
+        _, body, _ = fetch(base_url + "/api/admin/compression", "identity", args.timeout,
+                           {"X-Admin-Token": args.admin_token})
+        print(json.dumps(json.loads(body), indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
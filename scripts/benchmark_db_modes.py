@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+vehicles 라우트 sync / async DB 모드 비교 벤치마크
+- 같은 코드를 MYSQL_ASYNC_MODE=false(스레드풀 + PyMySQL)와 true(이벤트 루프 + aiomysql)로
+  각각 uvicorn으로 띄우고, 동시 클라이언트 200개로 같은 요청을 보내 p50/p99 비교
+- DB 조회 비용을 비교하기 위해 응답 캐시는 끄고 실행 (RESPONSE_CACHE_BACKEND=none)
+- MySQL 접속 정보는 평소처럼 DATABASE_URL 또는 MYSQL_* 환경 변수로 지정
+
+사용 예:
+  python scripts/benchmark_db_modes.py --vehicle-id VHC-001 --concurrency 200 --requests 4000
+"""
+
+import sys
+import os
+import argparse
+import subprocess
+import time
+import urllib.request
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.benchmark_api_latency import run
+
+ROUTES = (
+    "/api/vehicles/{vehicle_id}",
+    "/api/vehicles/{vehicle_id}/scores",
+    "/api/vehicles/{vehicle_id}/score-history",
+    "/api/vehicles/{vehicle_id}/driving-habits",
+    "/api/vehicles/{vehicle_id}/habit-monthly",
+)
+
+def wait_until_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/health", timeout=2):
+                return
+        except Exception:
+            time.sleep(0.5)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+def benchmark_mode(async_mode, args):
+    env = {
+        **os.environ,
+        "MYSQL_ASYNC_MODE": "true" if async_mode else "false",
+        "RESPONSE_CACHE_BACKEND": "none",
+    }
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+    try:
+        wait_until_ready(base_url)
+        paths = [route.format(vehicle_id=args.vehicle_id) for route in ROUTES]
+        run(base_url, paths, args.concurrency, args.warmup, args.timeout)  # 워밍업 (커넥션 풀 채우기)
+        print(f"\n▶ {'async' if async_mode else 'sync'} 모드")
+        return run(base_url, paths, args.concurrency, args.requests, args.timeout)
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="vehicles 라우트 sync/async DB 모드 비교 벤치마크")
+    parser.add_argument("--vehicle-id", default="VHC-001")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--warmup", type=int, default=400)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {mode: benchmark_mode(mode == "async", args) for mode in ("sync", "async")}
+
+    print(f"\n{'mode':<8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for mode, stats in results.items():
+        print(f"{mode:<8} {stats['throughput']:>9.1f} {stats['p50']:>9.1f} {stats['p99']:>9.1f} {stats['errors']:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+텔레메트리 응답 직렬화 CPU 시간 마이크로벤치마크
+- asyncpg가 돌려주는 것과 같은 형태(UTC datetime 포함 dict)의 합성 텔레메트리 행 N개를 만들고
+  응답 본문 바이트를 만드는 방식별 소요 시간과 크기 측정
+  - fastapi default: response_model 검증 + jsonable_encoder + stdlib json (기존 라우트 경로)
+  - stdlib json: 행마다 timestamp.isoformat() 후 json.dumps (기존 render_json)
+  - render_json: orjson이 datetime을 직접 직렬화 (FastJSONRoute 경로)
+  - render_json columns: format=columns와 같은 컬럼 배열 (timestamp는 epoch 밀리초)
+- DB 없이 프로세스 안에서 직렬화만 측정
+
+사용 예:
+  python scripts/benchmark_json_serialization.py --rows 100000 --repeat 5
+"""
+
+import sys
+import os
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Union
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.responses import render_json
+
+BASE_TIMESTAMP = datetime(2025, 9, 30, tzinfo=timezone.utc)
+
+def generate_rows(count):
+    return [
+        {
+            "vehicle_id": "VHC-001",
+            "vehicle_speed": round(random.uniform(0, 120), 2),
+            "engine_rpm": random.randint(800, 6000),
+            "throttle_position": round(random.uniform(0, 100), 2),
+            "timestamp": BASE_TIMESTAMP + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+def fastapi_default(rows):
+    # 라우트의 response_model=Union[List[Dict[str, Any]], Dict[str, Any]] 검증 후 JSONResponse.render
+    adapter = TypeAdapter(Union[List[Dict[str, Any]], Dict[str, Any]])
+    content = jsonable_encoder(adapter.validate_python(rows))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def stdlib_json(rows):
+    serialized = [{**row, "timestamp": row["timestamp"].isoformat()} for row in rows]
+    return json.dumps(serialized, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def orjson_rows(rows):
+    return render_json(rows)
+
+def orjson_columns(rows):
+    # fetch_columns는 DB에서 epoch 밀리초로 받아 zip으로 전치하므로 여기서도 같은 형태로 준비
+    records = [(int(row["timestamp"].timestamp() * 1000), row["vehicle_speed"], row["engine_rpm"],
+                row["throttle_position"]) for row in rows]
+    names = ("timestamp", "vehicle_speed", "engine_rpm", "throttle_position")
+    columns = {name: list(values) for name, values in zip(names, zip(*records))}
+    return render_json({"vehicle_id": "VHC-001", "count": len(rows), "timestamp_unit": "ms", "columns": columns})
+
+METHODS = (
+    ("fastapi default", fastapi_default),
+    ("stdlib json", stdlib_json),
+    ("render_json", orjson_rows),
+    ("render_json columns", orjson_columns),
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="텔레메트리 응답 직렬화 벤치마크")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.rows)
+    print(f"{args.rows:,} rows, {args.repeat} repeats")
+    print(f"{'method':<22} {'median ms':>10} {'cpu ms':>8} {'MB':>7} {'vs default':>11}")
+    baseline = None
+    for label, method in METHODS:
+        method(rows[:1000])  # 워밍업
+        wall_times, cpu_times = [], []
+        for _ in range(args.repeat):
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            body = method(rows)
+            cpu_times.append(time.process_time() - cpu_start)
+            wall_times.append(time.perf_counter() - wall_start)
+        median_ms = statistics.median(wall_times) * 1000
+        baseline = baseline or median_ms
+        print(f"{label:<22} {median_ms:>10.1f} {statistics.median(cpu_times) * 1000:>8.1f} "
+              f"{len(body) / 1e6:>7.2f} {baseline / median_ms:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
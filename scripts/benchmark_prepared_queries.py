@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+짧은 구간 대시보드 조회의 파싱/계획 비용 벤치마크
+- query_registry의 원본 범위 조회(raw_{table}_range)를 최근 하루 안의 무작위 짧은 구간으로 반복 실행
+  - ad hoc: 매번 SQL 텍스트를 보내 파싱과 계획을 새로 수행 (기존 f-string 조회 방식)
+  - prepared/<plan_cache_mode>: 커넥션에서 한 번 PREPARE하고 EXECUTE로 실행
+    - auto: PostgreSQL 기본값 (처음 5번 실행 후 일반 계획 사용 여부를 비용으로 결정)
+    - force_custom_plan: 파싱만 생략하고 계획은 매번 수행
+    - force_generic_plan: 파싱과 계획 모두 생략 (청크 제외는 실행 시작 시점에 수행)
+- 클라이언트 측 왕복 지연(p50/p95)과 EXPLAIN ANALYZE로 얻은 서버 측 Planning/Execution Time을 함께 출력
+- 하이퍼테이블의 청크 수가 많을수록 계획 비용 차이가 커지므로 청크 수도 함께 표시
+
+사용 예:
+  python scripts/benchmark_prepared_queries.py --table vehicle_telemetry --window-minutes 15 --queries 500
+"""
+
+import sys
+import os
+import argparse
+import random
+import re
+import statistics
+import time
+from datetime import timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+
+from app.timescaledb import (
+    TIMESCALEDB_HOST,
+    TIMESCALEDB_PORT,
+    TIMESCALEDB_DB,
+    TIMESCALEDB_USER,
+    TIMESCALEDB_PASSWORD,
+)
+from app.query_registry import QUERIES, RAW_COLUMNS, query_name
+
+MODES = (
+    ("ad hoc", "auto", False),
+    ("prepared/auto", "auto", True),
+    ("prepared/custom", "force_custom_plan", True),
+    ("prepared/generic", "force_generic_plan", True),
+)
+
+def connect(plan_cache_mode):
+    return psycopg2.connect(
+        host=TIMESCALEDB_HOST,
+        port=TIMESCALEDB_PORT,
+        database=TIMESCALEDB_DB,
+        user=TIMESCALEDB_USER,
+        password=TIMESCALEDB_PASSWORD,
+        options=f"-c plan_cache_mode={plan_cache_mode}",
+    )
+
+def sample_windows(cursor, table, window, count):
+    """가장 최근 행의 차량과 직전 하루 안의 무작위 구간 count개"""
+    cursor.execute(f"SELECT vehicle_id, timestamp FROM {table} ORDER BY timestamp DESC LIMIT 1")
+    row = cursor.fetchone()
+    if not row:
+        return []
+    vehicle_id, latest = row
+    span = timedelta(days=1) - window
+    windows = []
+    for _ in range(count):
+        start = latest - window - span * random.random()
+        windows.append((vehicle_id, start, start + window))
+    return windows
+
+def run_mode(table, plan_cache_mode, prepared, windows, explain_samples):
+    name = query_name("raw", table, "range")
+    # 원본 범위 조회는 $1..$3이 한 번씩 순서대로 등장하므로 그대로 %s로 바꿔 ad hoc 조회로 사용
+    adhoc_sql = re.sub(r"\$\d+", "%s", QUERIES[name])
+    conn = connect(plan_cache_mode)
+    try:
+        cursor = conn.cursor()
+        if prepared:
+            cursor.execute(f"PREPARE {name} AS {QUERIES[name]}")
+            statement = f"EXECUTE {name} (%s, %s, %s)"
+        else:
+            statement = adhoc_sql
+
+        for params in windows[:10]:  # 워밍업 (auto 모드의 일반 계획 전환 포함)
+            cursor.execute(statement, params)
+            cursor.fetchall()
+
+        latencies, rows = [], 0
+        for params in windows:
+            started = time.perf_counter()
+            cursor.execute(statement, params)
+            rows += len(cursor.fetchall())
+            latencies.append(time.perf_counter() - started)
+
+        planning, execution = [], []
+        for params in windows[:explain_samples]:
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", params)
+            result = cursor.fetchone()[0][0]
+            planning.append(result["Planning Time"])
+            execution.append(result["Execution Time"])
+        conn.rollback()
+    finally:
+        conn.close()
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "avg_rows": rows / len(windows),
+        "planning_ms": statistics.mean(planning) if planning else 0.0,
+        "execution_ms": statistics.mean(execution) if execution else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="prepared statement 계획 비용 벤치마크")
+    parser.add_argument("--table", default="vehicle_telemetry", choices=sorted(RAW_COLUMNS))
+    parser.add_argument("--window-minutes", type=float, default=15)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--explain-samples", type=int, default=50)
+    args = parser.parse_args()
+
+    conn = connect("auto")
+    try:
+        cursor = conn.cursor()
+        windows = sample_windows(cursor, args.table, timedelta(minutes=args.window_minutes), args.queries)
+        cursor.execute("SELECT count(*) FROM timescaledb_information.chunks WHERE hypertable_name = %s", (args.table,))
+        chunk_count = cursor.fetchone()[0]
+    finally:
+        conn.close()
+    if not windows:
+        print(f"❌ {args.table}: 데이터 없음")
+        sys.exit(1)
+
+    print(f"{args.table}: 청크 {chunk_count}개, {args.window_minutes:g}분 구간 {args.queries}회")
+    print(f"{'mode':<18} {'p50 ms':>8} {'p95 ms':>8} {'rows':>7} {'plan ms':>8} {'exec ms':>8}")
+    baseline = None
+    for label, plan_cache_mode, prepared in MODES:
+        stats = run_mode(args.table, plan_cache_mode, prepared, windows, args.explain_samples)
+        baseline = baseline or stats
+        saved = baseline["p50_ms"] - stats["p50_ms"]
+        print(f"{label:<18} {stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['avg_rows']:>7.0f} "
+              f"{stats['planning_ms']:>8.3f} {stats['execution_ms']:>8.3f}"
+              + (f"  (p50 {saved:+.3f} ms saved)" if stats is not baseline else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+차량 라우트 요청당 CPU 시간 마이크로벤치마크
+- FastAPI TestClient로 /api/vehicles 라우트를 프로세스 안에서 직접 호출해
+  요청 하나에 드는 CPU 시간(쿼리 생성, ORM 변환, 직렬화 포함)과 경과 시간 측정
+- 기본은 합성 데이터를 넣은 SQLite 메모리 DB를 사용하므로 DB 왕복 비용은 거의 없고
+  애플리케이션 측 CPU 비용이 주로 측정됨 (--database-url로 실제 MySQL 지정 가능)
+- 응답 캐시는 끄고 측정 (RESPONSE_CACHE_BACKEND=none)
+
+사용 예:
+  python scripts/benchmark_vehicle_routes.py --vehicles 50 --days 365 --requests 200
+"""
+
+import sys
+import os
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.db import Base, get_db
+from app.main import app
+
+ROUTES = (
+    "/api/vehicles/",
+    "/api/vehicles/summary",
+    "/api/vehicles/{vehicle_id}",
+    "/api/vehicles/{vehicle_id}/scores",
+    "/api/vehicles/{vehicle_id}/score/{analysis_date}",
+    "/api/vehicles/{vehicle_id}/score-history",
+    "/api/vehicles/{vehicle_id}/driving-habits",
+    "/api/vehicles/{vehicle_id}/habit-monthly",
+)
+
+def create_session_factory(database_url):
+    if database_url.startswith("sqlite"):
+        engine = create_engine(database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(database_url, pool_pre_ping=True)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def populate(session, vehicles, days):
+    """합성 차량, 일간 지표, 일간 점수, 월간 습관 데이터 생성"""
+    end = date(2025, 9, 30)
+    for v in range(vehicles):
+        vehicle_id = f"BENCH-{v:03d}"
+        session.add(models.Vehicle(vehicle_id=vehicle_id, model="Bench", year=2020 + v % 5))
+        for d in range(days):
+            day = end - timedelta(days=d)
+            session.add(models.DailyMetrics(
+                vehicle_id=vehicle_id, analysis_date=day,
+                total_distance=random.uniform(0, 300), average_speed=random.uniform(20, 90),
+                fuel_efficiency=random.uniform(8, 18),
+            ))
+            session.add(models.VehicleScoreDaily(
+                vehicle_id=vehicle_id, analysis_date=day,
+                **{column: random.randint(0, 100) for column in (
+                    "final_score", "engine_powertrain_score", "transmission_drivetrain_score",
+                    "brake_suspension_score", "adas_safety_score", "electrical_battery_score",
+                    "other_score", "engine_rpm_avg", "dtc_count", "gear_change_count",
+                    "abs_activation_count", "suspension_shock_count", "adas_sensor_fault_count",
+                    "aeb_activation_count", "engine_start_count", "suddenacc_count",
+                )},
+                **{column: random.uniform(0, 100) for column in (
+                    "engine_coolant_temp_avg", "transmission_oil_temp_avg", "battery_voltage_avg",
+                    "alternator_output_avg", "temperature_ambient_avg",
+                )},
+            ))
+        for m in range(max(1, days // 30)):
+            month = date(end.year - (m + 12 - end.month) // 12, (end.month - m - 1) % 12 + 1, 1)
+            session.add(models.DrivingHabitMonthly(
+                vehicle_id=vehicle_id, analysis_month=month,
+                acceleration_events=random.randint(0, 50), deceleration_events=random.randint(0, 50),
+                lane_departure_events=random.randint(0, 20), night_drive_ratio=random.random(),
+                avg_drive_duration_minutes=random.uniform(10, 90), avg_speed=random.uniform(20, 90),
+                avg_distance=random.uniform(5, 100),
+            ))
+    session.commit()
+    return end
+
+def measure(client, path, requests):
+    client.get(path)  # 워밍업
+    cpu_times, wall_times = [], []
+    for _ in range(requests):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        response = client.get(path)
+        cpu_times.append(time.process_time() - cpu_start)
+        wall_times.append(time.perf_counter() - wall_start)
+        response.raise_for_status()
+    return statistics.mean(cpu_times) * 1000, statistics.median(wall_times) * 1000, len(response.content)
+
+def main():
+    parser = argparse.ArgumentParser(description="차량 라우트 요청당 CPU 시간 벤치마크")
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--vehicles", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--vehicle-id", default="BENCH-000")
+    args = parser.parse_args()
+
+    engine, SessionFactory = create_session_factory(args.database_url)
+    end = date(2025, 9, 30)
+    if args.database_url.startswith("sqlite"):
+        Base.metadata.create_all(engine)
+        session = SessionFactory()
+        end = populate(session, args.vehicles, args.days)
+        session.close()
+
+    def override_get_db():
+        db = SessionFactory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    print(f"{'route':<50} {'cpu ms/req':>11} {'p50 ms':>8} {'bytes':>9}")
+    for route in ROUTES:
+        path = route.format(vehicle_id=args.vehicle_id, analysis_date=end.isoformat())
+        cpu_ms, wall_ms, size = measure(client, path, args.requests)
+        print(f"{route:<50} {cpu_ms:>11.3f} {wall_ms:>8.3f} {size:>9}")
+
+if __name__ == "__main__":
+    main()
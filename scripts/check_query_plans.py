@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+TimescaleDB 엔드포인트 쿼리 실행 계획(EXPLAIN) 회귀 검사
+- 테이블마다 API가 실제로 실행하는 query_registry 문장(원본 범위 조회, 키셋 페이지, 차량 일괄 이벤트 집계)과
+  동적으로 만드는 집계 문장(원본 time_bucket 집계, 연속 집계 뷰 + 원본 가장자리 집계, 요약 통계)을
+  PREPARE 후 EXPLAIN (FORMAT JSON) EXECUTE로 확인하고 아래 조건을 어기면 실패(종료 코드 1)
+  - 청크/하이퍼테이블 Seq Scan 없음
+  - (vehicle_id, timestamp) 복합 인덱스, 자연 키 유니크 인덱스,
+    연속 집계 뷰의 (vehicle_id, bucket) 인덱스만 사용
+  - 원본 범위 조회는 별도 Sort 없이 인덱스 순서로 반환
+- 테이블마다 가장 최근 행의 vehicle_id와 직전 1시간(연속 집계 문장은 직전 3일)을 조회 범위로 사용
+- 데이터가 없어 하나도 검사하지 못하면 실패(종료 코드 1)
+- 기본은 enable_seqscan = off로 "맞는 인덱스가 존재하고 쓸 수 있는지"를 검사하며,
+  --strict를 주면 플래너 기본 설정 그대로 실제 선택되는 계획을 검사
+
+사용 예:
+  python scripts/check_query_plans.py
+  python scripts/check_query_plans.py --strict --table vehicle_telemetry
+"""
+
+import sys
+import os
+import argparse
+import json
+from datetime import timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.timescaledb import (
+    get_timescaledb_connection,
+    release_timescaledb_connection,
+    CONTINUOUS_AGGREGATES,
+    QUERY_INDEXES,
+    REDUNDANT_INDEXES,
+)
+from app.timescaledb_async import build_bucket_query, build_summary_query
+from app.query_registry import QUERIES, EVENT_TABLES, query_name
+
+SCAN_NODES = ("Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Index Scan")
+# 연속 집계 뷰의 구체화 하이퍼테이블에 TimescaleDB가 만드는 GROUP BY 컬럼 인덱스
+AGGREGATE_INDEX_SUFFIX = "_vehicle_id_bucket_idx"
+# 연속 집계 문장의 조회 구간 (시간 뷰 버킷을 여러 개 온전히 포함하고 가장자리도 남도록 경계에서 어긋나게)
+AGGREGATE_SPAN = timedelta(days=3, minutes=30)
+
+def registered(name, make_params):
+    return lambda vid, start, end: (QUERIES[name], make_params(vid, start, end))
+
+def query_shapes(table):
+    """(표시 이름, (문장, 파라미터) 생성 함수, 인덱스 순서 반환 필요 여부, 읽는 테이블, 조회 구간)"""
+    hour = timedelta(hours=1)
+    shapes = [
+        (query_name("raw", table, "range"),
+         registered(query_name("raw", table, "range"), lambda vid, start, end: (vid, start, end)),
+         True, (table,), hour),
+        (query_name("page", table, "range"),
+         registered(query_name("page", table, "range"), lambda vid, start, end: (vid, start, end, 1001)),
+         False, (table,), hour),
+        (query_name("page_after", table, "range"),
+         registered(query_name("page_after", table, "range"),
+                    lambda vid, start, end: (vid, start, end, start, 0, 1001)),
+         False, (table,), hour),
+    ]
+    if table in EVENT_TABLES:
+        # 네 이벤트 테이블을 UNION ALL로 묶은 문장
+        name = query_name("fleet_counts", "events", "range")
+        shapes.append(
+            (name, registered(name, lambda vid, start, end: ([vid], start, end)), False, EVENT_TABLES, hour)
+        )
+    for source, _, columns in CONTINUOUS_AGGREGATES:
+        if source != table:
+            continue
+        # 원본 time_bucket 집계와 시간/일 뷰 + 원본 가장자리 집계
+        for label, bucket, span in (("1m", timedelta(minutes=1), hour),
+                                    ("1h", timedelta(hours=1), AGGREGATE_SPAN),
+                                    ("1d", timedelta(days=1), AGGREGATE_SPAN)):
+            shapes.append((
+                f"buckets_{table} bucket={label}",
+                lambda vid, start, end, bucket=bucket, columns=columns: build_bucket_query(
+                    table, columns, vid, bucket, start.isoformat(), end.isoformat()),
+                False, (table,), span,
+            ))
+    if table == "vehicle_telemetry":
+        for label, group_by, percentiles, span in (("", None, None, hour),
+                                                   (" group_by=hour", "hour", None, AGGREGATE_SPAN),
+                                                   (" percentiles=50,95", None, [50.0, 95.0], hour)):
+            shapes.append((
+                f"summary_{table}{label}",
+                lambda vid, start, end, group_by=group_by, percentiles=percentiles: build_summary_query(
+                    vid, start.isoformat(), end.isoformat(), group_by, percentiles),
+                False, (table,), span,
+            ))
+    return shapes
+
+def walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+def check_plan(tables, plan, ordered):
+    """계획에서 규칙 위반 목록 반환"""
+    allowed = (tuple(QUERY_INDEXES[t] for t in tables) + tuple(f"uq_{t}_natural_key" for t in tables)
+               + (AGGREGATE_INDEX_SUFFIX,))
+    problems = []
+    scans = 0
+    for node in walk(plan):
+        node_type = node["Node Type"]
+        if node_type == "Seq Scan":
+            problems.append(f"Seq Scan on {node.get('Relation Name')}")
+        elif node_type in SCAN_NODES:
+            scans += 1
+            index = node.get("Index Name", "")
+            if index.endswith(REDUNDANT_INDEXES):
+                problems.append(f"redundant index {index}")
+            elif not index.endswith(allowed):
+                problems.append(f"unexpected index {index}")
+        elif node_type == "Sort" and ordered:
+            problems.append(f"explicit Sort on {node.get('Sort Key')}")
+    if scans == 0 and not problems:
+        problems.append("no chunk scanned (empty range?)")
+    return problems
+
+def explain_prepared(cursor, query, params):
+    """문장($n 파라미터)을 PREPARE한 뒤 EXECUTE의 실행 계획 반환 (API와 같은 일반/사용자 정의 계획 경로)
+
+    PREPARE는 롤백해도 남으므로 트랜잭션을 끝낸 뒤 DEALLOCATE한다.
+    """
+    cursor.execute(f"PREPARE plan_check AS {query}")
+    try:
+        placeholders = ", ".join(["%s"] * len(params))
+        cursor.execute(f"EXPLAIN (FORMAT JSON) EXECUTE plan_check ({placeholders})", params)
+        return cursor.fetchone()[0][0]["Plan"]
+    finally:
+        cursor.connection.rollback()
+        cursor.execute("DEALLOCATE plan_check")
+
+def sample_row(cursor, table):
+    """가장 최근 행의 (vehicle_id, timestamp)"""
+    cursor.execute(f"SELECT vehicle_id, timestamp FROM {table} ORDER BY timestamp DESC LIMIT 1")
+    return cursor.fetchone()
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드포인트 쿼리 실행 계획 회귀 검사")
+    parser.add_argument("--table", action="append", dest="tables", choices=sorted(QUERY_INDEXES))
+    parser.add_argument("--strict", action="store_true", help="enable_seqscan을 끄지 않고 실제 계획 검사")
+    parser.add_argument("--verbose", action="store_true", help="실행 계획 JSON 출력")
+    args = parser.parse_args()
+
+    conn = get_timescaledb_connection()
+    if not conn:
+        print("❌ TimescaleDB 연결 실패")
+        sys.exit(2)
+
+    failures = 0
+    checked = 0
+    try:
+        cursor = conn.cursor()
+        for table in args.tables or QUERY_INDEXES:
+            sample = sample_row(cursor, table)
+            if sample is None:
+                print(f"⏭️  {table}: 데이터 없음, 건너뜀")
+                continue
+            vehicle_id, latest = sample
+            for name, make_query, ordered, tables, span in query_shapes(table):
+                query, params = make_query(vehicle_id, latest - span, latest)
+                if not args.strict:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = explain_prepared(cursor, query, params)
+                conn.rollback()
+                checked += 1
+
+                problems = check_plan(tables, plan, ordered)
+                if problems:
+                    failures += 1
+                    print(f"❌ {table} / {name}: {'; '.join(problems)}")
+                else:
+                    print(f"✅ {table} / {name}")
+                if args.verbose:
+                    print(json.dumps(plan, indent=2, default=str))
+    finally:
+        release_timescaledb_connection(conn)
+
+    if not checked:
+        print("\n❌ 검사한 문장이 없음 (테이블에 데이터가 없음)")
+        sys.exit(1)
+    if failures:
+        print(f"\n실행 계획 검사 실패 {failures}건 / {checked}건")
+        sys.exit(1)
+    print(f"\n모든 실행 계획 검사 통과 ({checked}건)")
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,8 @@ from app.timescaledb import (
     write_engine_off_event, 
     write_collision_event,
     batch_write_telemetry_data,
-    get_timescaledb_connection
+    get_timescaledb_connection,
+    release_timescaledb_connection
 )
 from datetime import datetime, timedelta
 import random
@@ -46,7 +47,7 @@ def clear_existing_data():
         conn.rollback()
         return False
     finally:
-        conn.close()
+        release_timescaledb_connection(conn)
 
 def generate_telemetry_data():
     """1시간치 텔레메트리 데이터 생성 (VHC-001, VHC-002, VHC-003)"""
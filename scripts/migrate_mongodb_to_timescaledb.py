@@ -4,24 +4,40 @@ MongoDB → TimescaleDB 마이그레이션 스크립트
 - MongoDB의 모든 컬렉션 데이터를 TimescaleDB로 변환
 - 데이터 타입 매핑 및 변환
 - 배치 처리로 성능 최적화
+- 기본은 증분 동기화: 컬렉션별 마지막 ObjectId(워터마크) 이후 문서만 적재
+  (자연 키 유니크 인덱스 + ON CONFLICT DO NOTHING으로 재실행해도 중복 없음)
+  - 워터마크보다 --lookback-seconds만큼 이전 생성 시각부터 다시 읽어, 여러 writer/시계 오차/
+    클라이언트 생성 ObjectId 때문에 나중에 들어온 더 작은 _id 문서도 놓치지 않음
+    (겹치는 구간은 ON CONFLICT로 건너뜀. 이 시간보다 더 늦게 들어온 문서는 --full로 재적재 필요)
+- --full: 기존 데이터를 모두 삭제하고 전체 재적재
+- --workers: 컬렉션을 여러 스레드에서 동시에 마이그레이션
+- --shards: 대용량 컬렉션을 ObjectId 생성 시각 구간으로 나눠 병렬 적재
+- 문서는 리더 스레드가 배치 단위로 큐에 넣고 라이터가 꺼내 적재하므로 메모리 사용량은 배치 크기로 제한됨
 """
 
 import sys
 import os
+import argparse
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from bson import ObjectId
 from pymongo import MongoClient
-from timescaledb import (
+from app.timescaledb import (
     init_timescaledb,
-    write_telemetry_data,
-    write_collision_event,
-    write_engine_off_event,
-    write_periodic_data,
-    write_sudden_acceleration_event,
-    write_warning_light_event,
-    batch_write_telemetry_data
+    init_timescaledb_pool,
+    init_sync_state,
+    get_timescaledb_connection,
+    release_timescaledb_connection,
+    get_sync_watermark,
+    set_sync_watermark,
+    reset_sync_watermarks,
+    bulk_write_rows,
+    TIMESCALEDB_BULK_BATCH_SIZE
 )
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
 
 def convert_vehicle_id(vehicle_id):
@@ -40,6 +56,20 @@ MONGO_USER = os.getenv("MONGO_USER", "")
 MONGO_PASSWORD = os.getenv("MONGO_PASSWORD", "")
 MONGO_AUTH_DB = os.getenv("MONGO_AUTH_DB", "admin")
 
+# 벌크 적재 설정 (--batch-size, --bulk-method로 덮어쓸 수 있음)
+BULK_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", str(TIMESCALEDB_BULK_BATCH_SIZE)))
+BULK_METHOD = os.getenv("MIGRATION_BULK_METHOD", "copy")
+
+# 병렬 마이그레이션 설정 (--workers, --shards로 덮어쓸 수 있음)
+MIGRATION_WORKERS = int(os.getenv("MIGRATION_WORKERS", "1"))
+MIGRATION_SHARDS = int(os.getenv("MIGRATION_SHARDS", "1"))
+# 리더 → 라이터 큐에 쌓아 둘 최대 배치 수 (샤드당 메모리 상한 ≈ (QUEUE_DEPTH + 2) × 배치 크기)
+MIGRATION_QUEUE_DEPTH = int(os.getenv("MIGRATION_QUEUE_DEPTH", "4"))
+# 시간 구간 샤드로 나눠 적재할 대용량 컬렉션
+SHARDED_COLLECTIONS = {"realtime_data", "periodic_data"}
+# 증분 동기화 시 워터마크 ObjectId 생성 시각보다 이만큼(초) 이전부터 다시 읽음
+MIGRATION_LOOKBACK_SECONDS = float(os.getenv("MIGRATION_LOOKBACK_SECONDS", "300"))
+
 def connect_mongodb():
     """MongoDB 연결"""
     try:
@@ -58,205 +88,246 @@ def connect_mongodb():
         print(f"❌ MongoDB 연결 실패: {e}")
         return None, None
 
-def migrate_realtime_data(db):
+def find_new_documents(collection, since_id=None, until_id=None):
+    """(since_id, until_id] 범위의 문서를 _id 순서로 조회 (지정하지 않은 쪽은 제한 없음)"""
+    id_range = {}
+    if since_id:
+        id_range["$gt"] = ObjectId(since_id)
+    if until_id:
+        id_range["$lte"] = ObjectId(until_id)
+    query = {"_id": id_range} if id_range else {}
+    return collection.count_documents(query), collection.find(query).sort("_id", 1)
+
+def plan_shards(collection, since_id, until_id, shard_count):
+    """(since_id, until_id] 범위를 ObjectId 생성 시각 기준으로 shard_count개 구간으로 분할"""
+    if shard_count <= 1 or not until_id:
+        return [(since_id, until_id)]
+    
+    if since_id:
+        lower = ObjectId(since_id).generation_time
+    else:
+        first = collection.find_one(sort=[("_id", 1)], projection={"_id": 1})
+        if first is None:
+            return [(since_id, until_id)]
+        lower = first["_id"].generation_time
+    upper = ObjectId(until_id).generation_time
+    if upper <= lower:
+        return [(since_id, until_id)]
+    
+    step = (upper - lower) / shard_count
+    bounds = [since_id]
+    bounds += [str(ObjectId.from_datetime(lower + step * i)) for i in range(1, shard_count)]
+    bounds.append(until_id)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def stream_rows(documents, to_row, batch_size):
+    """Mongo 커서를 리더 스레드에서 읽어 batch_size개씩 제한된 큐로 넘기고 행을 하나씩 내보냄
+
+    큐가 가득 차면 리더가 기다리므로 메모리에 올라가는 행 수는 큐 깊이와 배치 크기로 제한된다.
+    """
+    batches = queue.Queue(maxsize=MIGRATION_QUEUE_DEPTH)
+    stopped = threading.Event()
+    errors = []
+    
+    def put(item):
+        # 라이터가 먼저 멈추면 리더가 가득 찬 큐에서 영원히 기다리지 않도록 주기적으로 확인
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def read():
+        try:
+            batch = []
+            for doc in documents:
+                batch.append(to_row(doc))
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch:
+                put(batch)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            put(None)
+    
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            yield from batch
+    finally:
+        stopped.set()
+        reader.join()
+    if errors:
+        raise errors[0]
+
+def migrate_shard(collection, table, to_row, since_id, until_id):
+    """샤드 하나를 스트리밍으로 적재하고 적재한 행 수 반환 (실패 시 None)"""
+    _, documents = find_new_documents(collection, since_id, until_id)
+    documents = documents.batch_size(BULK_BATCH_SIZE)
+    return bulk_write_rows(table, stream_rows(documents, to_row, BULK_BATCH_SIZE), BULK_BATCH_SIZE, BULK_METHOD)
+
+def migrate_collection(db, collection_name, table, to_row, since_id=None, until_id=None):
+    """컬렉션 문서를 행 튜플로 변환해 TimescaleDB 테이블에 벌크 적재"""
+    collection = db[collection_name]
+    total_count, _ = find_new_documents(collection, since_id, until_id)
+    shard_count = MIGRATION_SHARDS if collection_name in SHARDED_COLLECTIONS else 1
+    shards = plan_shards(collection, since_id, until_id, shard_count)
+    print(f"  - {collection_name}: 총 {total_count}개 레코드 처리 예정 "
+          f"(샤드 {len(shards)}개, 배치 {BULK_BATCH_SIZE}개, {BULK_METHOD})")
+    
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        results = list(executor.map(lambda shard: migrate_shard(collection, table, to_row, *shard), shards))
+    if any(written is None for written in results):
+        return False
+    
+    written = sum(results)
+    elapsed = time.time() - started
+    rate = written / elapsed if elapsed > 0 else 0
+    print(f"  ✅ {collection_name}: {written}개 적재 ({elapsed:.2f}초, {rate:,.0f} rows/s)")
+    return True
+
+def migrate_realtime_data(db, since_id=None, until_id=None):
     """실시간 텔레메트리 데이터 마이그레이션"""
     print("📊 실시간 텔레메트리 데이터 마이그레이션 중...")
     
     try:
-        collection = db["realtime_data"]
-        total_count = collection.count_documents({})
-        print(f"  - 총 {total_count}개 레코드 처리 예정")
-        
-        # 배치 단위로 처리 (1000개씩)
-        batch_size = 1000
-        processed = 0
-        batch_data = []
-        
-        for doc in collection.find().sort("timestamp", 1):
-            # MongoDB 문서를 TimescaleDB 형식으로 변환
-            telemetry_record = {
-                "vehicle_id": convert_vehicle_id(doc["vehicle_id"]),
-                "vehicle_speed": doc["vehicle_speed"],
-                "engine_rpm": doc["engine_rpm"],
-                "throttle_position": doc["throttle_position"],
-                "timestamp": doc["timestamp"]
-            }
-            
-            batch_data.append(telemetry_record)
-            processed += 1
-            
-            # 배치가 가득 찼거나 마지막 레코드인 경우 삽입
-            if len(batch_data) >= batch_size or processed == total_count:
-                if batch_write_telemetry_data(batch_data):
-                    print(f"  ✅ 배치 {processed}/{total_count} 처리 완료")
-                else:
-                    print(f"  ❌ 배치 {processed}/{total_count} 처리 실패")
-                    return False
-                batch_data = []
+        if not migrate_collection(db, "realtime_data", "vehicle_telemetry", lambda doc: (
+            convert_vehicle_id(doc["vehicle_id"]),
+            doc["vehicle_speed"],
+            doc["engine_rpm"],
+            doc["throttle_position"],
+            doc["timestamp"]
+        ), since_id, until_id):
+            return False
         
-        print(f"✅ 실시간 텔레메트리 데이터 마이그레이션 완료 ({processed}개)")
+        print("✅ 실시간 텔레메트리 데이터 마이그레이션 완료")
         return True
         
     except Exception as e:
         print(f"❌ 실시간 텔레메트리 데이터 마이그레이션 실패: {e}")
         return False
 
-def migrate_periodic_data(db):
+def migrate_periodic_data(db, since_id=None, until_id=None):
     """주기적 데이터 마이그레이션"""
     print("📍 주기적 데이터 마이그레이션 중...")
     
     try:
-        collection = db["periodic_data"]
-        total_count = collection.count_documents({})
-        print(f"  - 총 {total_count}개 레코드 처리 예정")
-        
-        processed = 0
-        for doc in collection.find().sort("timestamp", 1):
-            if write_periodic_data(
-                vehicle_id=convert_vehicle_id(doc["vehicle_id"]),
-                location_latitude=doc["location_latitude"],
-                location_longitude=doc["location_longitude"],
-                location_altitude=doc["location_altitude"],
-                temperature_cabin=doc["temperature_cabin"],
-                temperature_ambient=doc["temperature_ambient"],
-                battery_voltage=doc["battery_voltage"],
-                tpms_front_left=doc["tpms_front_left"],
-                tpms_front_right=doc["tpms_front_right"],
-                tpms_rear_left=doc["tpms_rear_left"],
-                tpms_rear_right=doc["tpms_rear_right"],
-                accelerometer_x=doc["accelerometer_x"],
-                accelerometer_y=doc["accelerometer_y"],
-                accelerometer_z=doc["accelerometer_z"],
-                fuel_level=doc["fuel_level"],
-                engine_coolant_temp=doc["engine_coolant_temp"],
-                transmission_oil_temp=doc["transmission_oil_temp"],
-                timestamp=doc["timestamp"]
-            ):
-                processed += 1
-            else:
-                print(f"  ❌ 레코드 {processed + 1} 삽입 실패")
-                return False
+        if not migrate_collection(db, "periodic_data", "periodic_data", lambda doc: (
+            convert_vehicle_id(doc["vehicle_id"]),
+            doc["location_latitude"],
+            doc["location_longitude"],
+            doc["location_altitude"],
+            doc["temperature_cabin"],
+            doc["temperature_ambient"],
+            doc["battery_voltage"],
+            doc["tpms_front_left"],
+            doc["tpms_front_right"],
+            doc["tpms_rear_left"],
+            doc["tpms_rear_right"],
+            doc["accelerometer_x"],
+            doc["accelerometer_y"],
+            doc["accelerometer_z"],
+            doc["fuel_level"],
+            doc["engine_coolant_temp"],
+            doc["transmission_oil_temp"],
+            doc["timestamp"]
+        ), since_id, until_id):
+            return False
         
-        print(f"✅ 주기적 데이터 마이그레이션 완료 ({processed}개)")
+        print("✅ 주기적 데이터 마이그레이션 완료")
         return True
         
     except Exception as e:
         print(f"❌ 주기적 데이터 마이그레이션 실패: {e}")
         return False
 
-def migrate_collision_events(db):
+def migrate_collision_events(db, since_id=None, until_id=None):
     """충돌 이벤트 마이그레이션"""
     print("💥 충돌 이벤트 마이그레이션 중...")
     
     try:
-        collection = db["event_collision"]
-        total_count = collection.count_documents({})
-        print(f"  - 총 {total_count}개 레코드 처리 예정")
-        
-        processed = 0
-        for doc in collection.find().sort("timestamp", 1):
-            if write_collision_event(
-                vehicle_id=convert_vehicle_id(doc["vehicle_id"]),
-                damage=int(doc["damage"]),  # FLOAT을 INTEGER로 변환
-                timestamp=doc["timestamp"]
-            ):
-                processed += 1
-            else:
-                print(f"  ❌ 레코드 {processed + 1} 삽입 실패")
-                return False
+        if not migrate_collection(db, "event_collision", "collision_events", lambda doc: (
+            convert_vehicle_id(doc["vehicle_id"]),
+            int(doc["damage"]),  # FLOAT을 INTEGER로 변환
+            doc["timestamp"]
+        ), since_id, until_id):
+            return False
         
-        print(f"✅ 충돌 이벤트 마이그레이션 완료 ({processed}개)")
+        print("✅ 충돌 이벤트 마이그레이션 완료")
         return True
         
     except Exception as e:
         print(f"❌ 충돌 이벤트 마이그레이션 실패: {e}")
         return False
 
-def migrate_sudden_acceleration_events(db):
+def migrate_sudden_acceleration_events(db, since_id=None, until_id=None):
     """급가속 이벤트 마이그레이션"""
     print("🚀 급가속 이벤트 마이그레이션 중...")
     
     try:
-        collection = db["event_suddenacc"]
-        total_count = collection.count_documents({})
-        print(f"  - 총 {total_count}개 레코드 처리 예정")
-        
-        processed = 0
-        for doc in collection.find().sort("timestamp", 1):
-            if write_sudden_acceleration_event(
-                vehicle_id=convert_vehicle_id(doc["vehicle_id"]),
-                vehicle_speed=doc["vehicle_speed"],
-                throttle_position=doc["throttle_position"],
-                gear_position_mode=doc["gear_position_mode"],
-                timestamp=doc["timestamp"]
-            ):
-                processed += 1
-            else:
-                print(f"  ❌ 레코드 {processed + 1} 삽입 실패")
-                return False
+        if not migrate_collection(db, "event_suddenacc", "sudden_acceleration_events", lambda doc: (
+            convert_vehicle_id(doc["vehicle_id"]),
+            doc["vehicle_speed"],
+            doc["throttle_position"],
+            doc["gear_position_mode"],
+            doc["timestamp"]
+        ), since_id, until_id):
+            return False
         
-        print(f"✅ 급가속 이벤트 마이그레이션 완료 ({processed}개)")
+        print("✅ 급가속 이벤트 마이그레이션 완료")
         return True
         
     except Exception as e:
         print(f"❌ 급가속 이벤트 마이그레이션 실패: {e}")
         return False
 
-def migrate_engine_status_events(db):
+def migrate_engine_status_events(db, since_id=None, until_id=None):
     """엔진 상태 이벤트 마이그레이션"""
     print("🔧 엔진 상태 이벤트 마이그레이션 중...")
     
     try:
-        collection = db["event_engine_status"]
-        total_count = collection.count_documents({})
-        print(f"  - 총 {total_count}개 레코드 처리 예정")
-        
-        processed = 0
-        for doc in collection.find().sort("timestamp", 1):
-            # MongoDB의 event-engine-status를 기존 engine_off_events 형식으로 변환
-            if write_engine_off_event(
-                vehicle_id=convert_vehicle_id(doc["vehicle_id"]),
-                speed=doc["vehicle_speed"],
-                gear_status=doc["gear_position_mode"],
-                gyro=doc["inclination_sensor"],  # inclination_sensor 값 사용
-                side="front",  # 기본값 설정
-                ignition=doc["engine_status_ignition"] == "ON",
-                timestamp=doc["timestamp"]
-            ):
-                processed += 1
-            else:
-                print(f"  ❌ 레코드 {processed + 1} 삽입 실패")
-                return False
+        # MongoDB의 event-engine-status를 기존 engine_off_events 형식으로 변환
+        if not migrate_collection(db, "event_engine_status", "engine_off_events", lambda doc: (
+            convert_vehicle_id(doc["vehicle_id"]),
+            doc["vehicle_speed"],
+            doc["gear_position_mode"],
+            doc["inclination_sensor"],  # inclination_sensor 값 사용
+            "front",  # 기본값 설정
+            doc["engine_status_ignition"] == "ON",
+            doc["timestamp"]
+        ), since_id, until_id):
+            return False
         
-        print(f"✅ 엔진 상태 이벤트 마이그레이션 완료 ({processed}개)")
+        print("✅ 엔진 상태 이벤트 마이그레이션 완료")
         return True
         
     except Exception as e:
         print(f"❌ 엔진 상태 이벤트 마이그레이션 실패: {e}")
         return False
 
-def migrate_warning_light_events(db):
+def migrate_warning_light_events(db, since_id=None, until_id=None):
     """경고등 이벤트 마이그레이션"""
     print("⚠️  경고등 이벤트 마이그레이션 중...")
     
     try:
-        collection = db["event_warning_light"]
-        total_count = collection.count_documents({})
-        print(f"  - 총 {total_count}개 레코드 처리 예정")
-        
-        processed = 0
-        for doc in collection.find().sort("timestamp", 1):
-            if write_warning_light_event(
-                vehicle_id=convert_vehicle_id(doc["vehicle_id"]),
-                warning_type=doc["type"],
-                timestamp=doc["timestamp"]
-            ):
-                processed += 1
-            else:
-                print(f"  ❌ 레코드 {processed + 1} 삽입 실패")
-                return False
+        if not migrate_collection(db, "event_warning_light", "warning_light_events", lambda doc: (
+            convert_vehicle_id(doc["vehicle_id"]),
+            doc["type"],
+            doc["timestamp"]
+        ), since_id, until_id):
+            return False
         
-        print(f"✅ 경고등 이벤트 마이그레이션 완료 ({processed}개)")
+        print("✅ 경고등 이벤트 마이그레이션 완료")
         return True
         
     except Exception as e:
@@ -267,8 +338,8 @@ def clear_timescaledb_data():
     """TimescaleDB 기존 데이터 초기화"""
     print("🗑️  TimescaleDB 기존 데이터 초기화 중...")
     
+    conn = None
     try:
-        from timescaledb import get_timescaledb_connection
         conn = get_timescaledb_connection()
         if not conn:
             print("❌ TimescaleDB 연결 실패")
@@ -298,14 +369,27 @@ def clear_timescaledb_data():
         print(f"❌ TimescaleDB 데이터 초기화 실패: {e}")
         return False
     finally:
-        if conn:
-            conn.close()
+        release_timescaledb_connection(conn)
+
+def lookback_id(since_id, seconds):
+    """워터마크 ObjectId 생성 시각에서 seconds만큼 뺀 시각의 최소 ObjectId (겹쳐 읽을 구간의 시작)"""
+    if not since_id or seconds <= 0:
+        return since_id
+    return str(ObjectId.from_datetime(ObjectId(since_id).generation_time - timedelta(seconds=seconds)))
+
+def latest_document(collection):
+    """현재 시점의 마지막 문서 (_id 기준). 이번 실행의 동기화 상한으로 사용"""
+    return collection.find_one(sort=[("_id", -1)], projection={"_id": 1, "timestamp": 1})
 
-def main():
+def main(full=False):
     """메인 마이그레이션 함수"""
-    print("🚀 MongoDB → TimescaleDB 마이그레이션 시작...")
+    mode = "전체 재적재" if full else "증분 동기화"
+    print(f"🚀 MongoDB → TimescaleDB 마이그레이션 시작... ({mode}, 워커 {MIGRATION_WORKERS}개, 샤드 {MIGRATION_SHARDS}개)")
     start_time = time.time()
     
+    # 워커/샤드마다 커넥션 하나씩 쓸 수 있도록 풀 크기 지정 (+1은 워터마크 조회/갱신용)
+    init_timescaledb_pool(maxconn=MIGRATION_WORKERS * MIGRATION_SHARDS + 1)
+    
     # MongoDB 연결
     client, db = connect_mongodb()
     if client is None or db is None:
@@ -319,34 +403,58 @@ def main():
             return False
         print("✅ TimescaleDB 초기화 완료")
         
-        # 2. 기존 데이터 초기화
-        print("\n🗑️  기존 데이터 초기화 중...")
-        if not clear_timescaledb_data():
-            print("❌ 기존 데이터 초기화 실패")
+        # 2. 전체 재적재 모드에서만 기존 데이터 초기화
+        if full:
+            print("\n🗑️  기존 데이터 초기화 중...")
+            if not clear_timescaledb_data():
+                print("❌ 기존 데이터 초기화 실패")
+                return False
+        
+        # 3. 워터마크 테이블 및 자연 키 유니크 인덱스 준비
+        if not init_sync_state():
+            print("❌ 동기화 상태 초기화 실패 (중복 데이터가 있다면 --full로 한 번 재적재하세요)")
+            return False
+        if full and not reset_sync_watermarks():
+            print("❌ 워터마크 초기화 실패")
             return False
         
-        # 3. 데이터 마이그레이션
+        # 4. 데이터 마이그레이션
         print("\n📊 데이터 마이그레이션 시작...")
         
         migration_functions = [
-            ("실시간 텔레메트리", migrate_realtime_data),
-            ("주기적 데이터", migrate_periodic_data),
-            ("충돌 이벤트", migrate_collision_events),
-            ("급가속 이벤트", migrate_sudden_acceleration_events),
-            ("엔진 상태 이벤트", migrate_engine_status_events),
-            ("경고등 이벤트", migrate_warning_light_events)
+            ("실시간 텔레메트리", "realtime_data", migrate_realtime_data),
+            ("주기적 데이터", "periodic_data", migrate_periodic_data),
+            ("충돌 이벤트", "event_collision", migrate_collision_events),
+            ("급가속 이벤트", "event_suddenacc", migrate_sudden_acceleration_events),
+            ("엔진 상태 이벤트", "event_engine_status", migrate_engine_status_events),
+            ("경고등 이벤트", "event_warning_light", migrate_warning_light_events)
         ]
         
-        success_count = 0
-        for name, func in migration_functions:
+        def sync_collection(migration):
+            name, collection_name, func = migration
             print(f"\n--- {name} 마이그레이션 ---")
-            if func(db):
-                success_count += 1
-                print(f"✅ {name} 마이그레이션 성공")
-            else:
+            since_id = get_sync_watermark(collection_name)
+            latest = latest_document(db[collection_name])
+            if latest is None:
+                print(f"✅ {name} 새 데이터 없음")
+                return True
+            
+            # 마지막 _id가 그대로여도 겹침 구간에 늦게 들어온 더 작은 _id 문서가 있을 수 있으므로 다시 읽음
+            until_id = str(latest["_id"])
+            if not func(db, lookback_id(since_id, MIGRATION_LOOKBACK_SECONDS), until_id):
                 print(f"❌ {name} 마이그레이션 실패")
+                return False
+            if not set_sync_watermark(collection_name, until_id, latest.get("timestamp")):
+                print(f"❌ {name} 워터마크 갱신 실패 (다음 실행에서 이전 워터마크부터 다시 적재)")
+                return False
+            print(f"✅ {name} 마이그레이션 성공")
+            return True
+        
+        # 컬렉션 단위 병렬 실행 (워커 1개면 순차 실행과 동일)
+        with ThreadPoolExecutor(max_workers=MIGRATION_WORKERS) as executor:
+            success_count = sum(executor.map(sync_collection, migration_functions))
         
-        # 4. 완료 메시지
+        # 5. 완료 메시지
         end_time = time.time()
         duration = end_time - start_time
         
@@ -368,4 +476,23 @@ def main():
         client.close()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="MongoDB → TimescaleDB 마이그레이션")
+    parser.add_argument("--full", action="store_true",
+                        help="기존 데이터를 모두 삭제하고 전체 재적재 (기본: 워터마크 기반 증분 동기화)")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help="벌크 적재 배치 크기")
+    parser.add_argument("--bulk-method", choices=["copy", "values"], default=BULK_METHOD,
+                        help="벌크 적재 방식 (copy: COPY FROM STDIN, values: execute_values)")
+    parser.add_argument("--workers", type=int, default=MIGRATION_WORKERS,
+                        help="동시에 마이그레이션할 컬렉션 수")
+    parser.add_argument("--shards", type=int, default=MIGRATION_SHARDS,
+                        help="대용량 컬렉션(realtime_data, periodic_data)을 나눌 시간 구간 수")
+    parser.add_argument("--lookback-seconds", type=float, default=MIGRATION_LOOKBACK_SECONDS,
+                        help="증분 동기화 시 워터마크 이전으로 겹쳐 다시 읽을 시간 (초, 0이면 겹침 없음)")
+    args = parser.parse_args()
+    BULK_BATCH_SIZE = args.batch_size
+    BULK_METHOD = args.bulk_method
+    MIGRATION_WORKERS = max(1, args.workers)
+    MIGRATION_SHARDS = max(1, args.shards)
+    MIGRATION_LOOKBACK_SECONDS = max(0.0, args.lookback_seconds)
+    main(full=args.full)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+기존 하이퍼테이블 데이터를 새 청크 간격/공간 파티션으로 다시 나누는 도구
+- set_chunk_time_interval은 이후 만들어지는 청크에만 적용되므로, 이미 적재된 데이터는
+  새 설정의 하이퍼테이블({table}_rechunk)을 만들어 구간별로 복사한 뒤 이름을 맞바꿈
+- 순서
+  1. {table}_rechunk 생성 (create_hypertable + 필요 시 vehicle_id 공간 파티션)
+  2. --copy-window 구간마다 INSERT ... SELECT 후 커밋 (압축된 청크도 그대로 읽음)
+  3. 행 수 비교 후 해당 테이블의 연속 집계 뷰 삭제, {table} → {table}_old, {table}_rechunk → {table}
+  4. 조회/자연 키 인덱스, 연속 집계, 압축/보존 정책을 다시 만들고 연속 집계 전체 갱신
+- 복사 중 적재된 행은 옮겨지지 않으므로 동기화/적재 작업을 멈춘 상태에서 실행해야 함
+- 기존 테이블은 --drop-old를 주지 않으면 {table}_old로 남김
+- 주의: 4단계에서 연속 집계 뷰를 지우고 남아 있는 원본 행으로만 다시 계산하므로,
+  보존 정책으로 이미 삭제된 원본 구간의 집계 이력(시간/일 단위 뷰)은 사라짐.
+  보존 정책이 있거나 원본보다 오래된 집계 버킷이 있으면 실행을 거부하고,
+  그 이력을 잃어도 되는 경우에만 --allow-aggregate-loss로 진행
+
+사용 예:
+  python scripts/rechunk_hypertable.py --table vehicle_telemetry --chunk-interval "1 day" --space-partitions 4
+  python scripts/rechunk_hypertable.py --table collision_events --drop-old
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.timescaledb import (
+    get_timescaledb_connection,
+    release_timescaledb_connection,
+    add_space_partitioning,
+    init_continuous_aggregates,
+    init_storage_policies,
+    migrate_query_indexes,
+    CHUNK_SETTINGS,
+    CONTINUOUS_AGGREGATES,
+    CONTINUOUS_AGGREGATE_LEVELS,
+    NATURAL_KEYS,
+)
+
+def relation_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+    return cursor.fetchone()[0]
+
+def table_indexes(cursor, table):
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = 'public' AND tablename = %s", (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+def aggregate_history_risks(cursor, table):
+    """연속 집계를 다시 만들 때 사라질 집계 이력이 있는 이유 목록 (없으면 빈 리스트)"""
+    risks = []
+    cursor.execute(
+        "SELECT count(*) FROM timescaledb_information.jobs WHERE proc_name = 'policy_retention' AND hypertable_name = %s",
+        (table,)
+    )
+    if cursor.fetchone()[0]:
+        risks.append(f"{table}에 보존 정책이 있음 (삭제된 원본 구간의 집계는 다시 계산할 수 없음)")
+
+    cursor.execute(f"SELECT min(timestamp) FROM {table}")
+    first = cursor.fetchone()[0]
+    widths = {
+        f"{prefix}_{suffix}": width
+        for source, prefix, _ in CONTINUOUS_AGGREGATES if source == table
+        for suffix, width, *_ in CONTINUOUS_AGGREGATE_LEVELS
+    }
+    for view, width in widths.items():
+        if not relation_exists(cursor, view):
+            continue
+        # 버킷 끝이 원본 첫 행보다 앞이면 그 버킷은 원본 없이 뷰에만 남은 이력
+        if first is None:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {view})")
+        else:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {view} WHERE bucket < %s - %s::interval)", (first, width))
+        if cursor.fetchone()[0]:
+            risks.append(f"{view}에 원본 행보다 오래된 버킷이 있음")
+    return risks
+
+def create_target(cursor, table, target, chunk_interval, partitions):
+    cursor.execute(f"DROP TABLE IF EXISTS {target};")
+    cursor.execute(f"CREATE TABLE {target} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);")
+    cursor.execute(f"ALTER TABLE {target} ADD PRIMARY KEY (id, timestamp);")
+    cursor.execute(
+        "SELECT create_hypertable(%s, 'timestamp', chunk_time_interval => %s::interval);",
+        (target, chunk_interval)
+    )
+    if partitions:
+        add_space_partitioning(cursor, target, partitions)
+
+def copy_rows(conn, table, target, window):
+    """window 간격으로 나눠 복사하고 구간마다 커밋, 복사한 행 수 반환"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT generate_series(time_bucket(%s::interval, min(timestamp)), max(timestamp), %s::interval)
+        FROM {table}
+    """, (window, window))
+    starts = [row[0] for row in cursor.fetchall()]
+    copied = 0
+    started = time.perf_counter()
+    for i, start in enumerate(starts, 1):
+        cursor.execute(f"""
+            INSERT INTO {target}
+            SELECT * FROM {table}
+            WHERE timestamp >= %s AND timestamp < %s + %s::interval
+        """, (start, start, window))
+        copied += cursor.rowcount
+        conn.commit()
+        print(f"  [{i}/{len(starts)}] {start:%Y-%m-%d %H:%M} 누적 {copied:,}행 "
+              f"({copied / max(time.perf_counter() - started, 1e-9):,.0f} rows/s)")
+    return copied
+
+def swap_tables(conn, table, target, old):
+    """연속 집계 뷰를 지우고 이름을 맞바꿈. 지운 뷰 이름 반환
+
+    뷰는 restore_objects에서 새 테이블의 원본 행으로만 다시 계산되므로 원본에 없는 집계 이력은 사라진다.
+    """
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT view_name FROM timescaledb_information.continuous_aggregates WHERE hypertable_name = %s",
+            (table,)
+        )
+        views = [row[0] for row in cursor.fetchall()]
+        for view in views:
+            cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view};")
+        # 기존 테이블의 정책 작업이 _old 테이블에서 계속 돌지 않도록 제거
+        cursor.execute("SELECT remove_compression_policy(%s, if_exists => TRUE);", (table,))
+        cursor.execute("SELECT remove_retention_policy(%s, if_exists => TRUE);", (table,))
+    finally:
+        conn.autocommit = False
+
+    cursor = conn.cursor()
+    # 인덱스 이름은 스키마 안에서 유일해야 하므로 기존 테이블 인덱스에 _old를 붙여 비워 둠
+    for index in table_indexes(cursor, table):
+        cursor.execute(f'ALTER INDEX "{index}" RENAME TO "{index[:59]}_old";')
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {old};")
+    cursor.execute(f"ALTER TABLE {target} RENAME TO {table};")
+    for index in table_indexes(cursor, table):
+        if index.startswith(target):
+            cursor.execute(f'ALTER INDEX "{index}" RENAME TO "{table}{index[len(target):]}";')
+    # SERIAL 시퀀스가 기존 테이블과 함께 삭제되지 않도록 소유권 이전
+    cursor.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id;")
+    conn.commit()
+    return views
+
+def restore_objects(conn, table, natural_key, views):
+    cursor = conn.cursor()
+    if natural_key:
+        cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_natural_key ON {table} ({', '.join(NATURAL_KEYS[table])});"
+        )
+        conn.commit()
+    migrate_query_indexes(conn)
+    init_continuous_aggregates(conn)
+    init_storage_policies(conn)
+
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        for view in views:
+            print(f"  연속 집계 갱신: {view}")
+            cursor.execute("CALL refresh_continuous_aggregate(%s, NULL, NULL);", (view,))
+    finally:
+        conn.autocommit = False
+
+def main():
+    parser = argparse.ArgumentParser(description="하이퍼테이블 재청크")
+    parser.add_argument("--table", required=True, choices=sorted(CHUNK_SETTINGS))
+    parser.add_argument("--chunk-interval", help="새 청크 간격 (기본: CHUNK_SETTINGS 설정값)")
+    parser.add_argument("--space-partitions", type=int, help="vehicle_id 해시 파티션 수 (0이면 없음)")
+    parser.add_argument("--copy-window", default="1 day", help="한 번에 복사할 시간 구간")
+    parser.add_argument("--drop-old", action="store_true", help="완료 후 기존 테이블 삭제")
+    parser.add_argument("--allow-aggregate-loss", action="store_true",
+                        help="보존 정책 등으로 원본이 없는 연속 집계 이력이 사라져도 진행")
+    args = parser.parse_args()
+
+    table = args.table
+    target, old = f"{table}_rechunk", f"{table}_old"
+    chunk_interval, partitions = CHUNK_SETTINGS[table]
+    chunk_interval = args.chunk_interval or chunk_interval
+    partitions = partitions if args.space_partitions is None else args.space_partitions
+
+    conn = get_timescaledb_connection()
+    if not conn:
+        print("❌ TimescaleDB 연결 실패")
+        sys.exit(2)
+
+    try:
+        cursor = conn.cursor()
+        if relation_exists(cursor, old):
+            print(f"❌ {old}가 이미 있음. 이전 실행 결과를 확인하고 삭제한 뒤 다시 실행하세요")
+            sys.exit(1)
+        natural_key = relation_exists(cursor, f"uq_{table}_natural_key")
+        risks = aggregate_history_risks(cursor, table)
+        conn.rollback()
+        if risks and not args.allow_aggregate_loss:
+            for risk in risks:
+                print(f"❌ {risk}")
+            print("   연속 집계를 원본 행으로 다시 계산하면 위 이력이 사라집니다. "
+                  "감수할 경우에만 --allow-aggregate-loss로 다시 실행하세요")
+            sys.exit(1)
+        for risk in risks:
+            print(f"⚠️  {risk} (--allow-aggregate-loss)")
+
+        print(f"🔧 {table}: chunk_time_interval={chunk_interval}, space_partitions={partitions}")
+        create_target(cursor, table, target, chunk_interval, partitions)
+        conn.commit()
+
+        copied = copy_rows(conn, table, target, args.copy_window)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT count(*) FROM {table}")
+        source_count = cursor.fetchone()[0]
+        conn.rollback()
+        if copied != source_count:
+            print(f"❌ 행 수 불일치 (원본 {source_count:,}, 복사 {copied:,}). {target}를 확인하세요")
+            sys.exit(1)
+
+        views = swap_tables(conn, table, target, old)
+        print(f"🔁 {table} 교체 완료 (기존 테이블: {old})")
+        restore_objects(conn, table, natural_key, views)
+
+        if args.drop_old:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP TABLE {old};")
+            conn.commit()
+            print(f"🗑️  {old} 삭제")
+
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT count(*) FROM timescaledb_information.chunks WHERE hypertable_name = %s", (table,)
+        )
+        print(f"✅ {table}: {copied:,}행, 청크 {cursor.fetchone()[0]}개")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_timescaledb_connection(conn)
+
+if __name__ == "__main__":
+    main()
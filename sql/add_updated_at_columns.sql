@@ -0,0 +1,16 @@
+-- 기존 DB에 행 변경 시각(updated_at) 컬럼 추가
+-- 조건부 GET(ETag/Last-Modified)과 응답 캐시 키가 같은 행을 제자리에서 다시 계산한 경우도 감지하도록 사용
+-- vehicles.updated_at은 차량 레지스트리가 model/year 수정을 감지하는 데 사용
+-- 적용 방법은 README의 "기존 DB 마이그레이션" 참고 (한 번만 적용)
+
+ALTER TABLE vehicles
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+ALTER TABLE vehicle_score_daily
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+ALTER TABLE driving_habit_monthly
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+
+-- 기존 행은 생성 시각을 변경 시각으로 사용
+UPDATE vehicles SET updated_at = created_at WHERE created_at IS NOT NULL;
+UPDATE vehicle_score_daily SET updated_at = created_at WHERE created_at IS NOT NULL;
+UPDATE driving_habit_monthly SET updated_at = created_at WHERE created_at IS NOT NULL;
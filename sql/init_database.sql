@@ -14,7 +14,8 @@ CREATE TABLE IF NOT EXISTS vehicles (
     vehicle_id VARCHAR(50) PRIMARY KEY,
     model VARCHAR(100) NOT NULL,
     year INT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- 2. daily_metrics table (daily operational metrics)
@@ -56,6 +57,7 @@ CREATE TABLE IF NOT EXISTS vehicle_score_daily (
     engine_start_count INT,
     suddenacc_count INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     PRIMARY KEY (vehicle_id, analysis_date),
     CONSTRAINT fk_score_vehicle FOREIGN KEY (vehicle_id) REFERENCES vehicles(vehicle_id) ON DELETE CASCADE,
     INDEX idx_vehicle_score_date (analysis_date)
@@ -73,6 +75,7 @@ CREATE TABLE IF NOT EXISTS driving_habit_monthly (
     avg_speed FLOAT,
     avg_distance FLOAT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     PRIMARY KEY (vehicle_id, analysis_month),
     CONSTRAINT fk_habit_vehicle FOREIGN KEY (vehicle_id) REFERENCES vehicles(vehicle_id) ON DELETE CASCADE,
     INDEX idx_habit_month (analysis_month)